@@ -0,0 +1,285 @@
+#! python
+"""
+Module for class Benchmark
+"""
+
+import csv
+import datetime
+import json
+import logging
+import optparse
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                             'devxp'))
+import authorcsv  # noqa: E402 pylint: disable=wrong-import-position
+import developer  # noqa: E402 pylint: disable=wrong-import-position
+import periods  # noqa: E402 pylint: disable=wrong-import-position
+import synthrepo  # noqa: E402 pylint: disable=wrong-import-position
+import xpanalyser  # noqa: E402 pylint: disable=wrong-import-position
+
+
+class Benchmark:
+    """
+    Class timing separately each phase of an analysis of a synthetic repository
+    """
+
+    RESULTS_VERSION = 1
+    PHASES = ('retrieve_author', 'retrieve_commit_date', 'update_data_from_csv',
+              'compute_experience', 'save_analyse')
+    IN_CSV_FILENAME = "in_author.csv"
+
+    def __init__(self, repository, work_dir, repeat=3, backend='git', granularity='monthly'):
+        """
+        Benchmark of a synthetic repository
+
+        :param repository: Repository to analyse, generated if needed
+        :type repository: SyntheticRepository
+        :param work_dir: Directory of the output files of the analysis
+        :type work_dir: str
+        :param repeat: Number of runs of each phase
+        :type repeat: int
+        :param backend: Name of the backend used to read the repository
+        :type backend: str
+        :param granularity: Time step of the analysis
+        :type granularity: str
+        """
+        self.repository = repository
+        self.work_dir = work_dir
+        self.repeat = repeat
+        self.backend = backend
+        self.granularity = periods.Granularity(granularity)
+        self.timings = {x: [] for x in Benchmark.PHASES}
+        self.nb_authors = None
+
+    def time_phase(self, name, function, *args):
+        """
+        Call a function and record its duration
+
+        :param name: Name of the phase
+        :type name: str
+        :param function: Function of the phase
+        :type function: callable
+        :return: Result of the function
+        """
+        start = time.perf_counter()
+        result = function(*args)
+        self.timings[name].append(time.perf_counter() - start)
+        return result
+
+    def write_author_csv(self, xp_analyser):
+        """
+        Write the CSV file of the authors as a user would modify it: the aliases of the
+        synthetic repository are filled and a third of the other developers have left
+
+        :param xp_analyser: Analyser whose authors have been retrieved
+        :type xp_analyser: XPAnalyser
+        """
+        xp_analyser.save_author_information_in_csv()
+        aliases = {}
+        for index in self.repository.get_aliased_authors():
+            name, _ = synthrepo.SyntheticRepository.get_identity(index)
+            alias, _ = synthrepo.SyntheticRepository.get_identity(index, True)
+            aliases[developer.Developer.compute_uuid(name)] = \
+                developer.Developer.compute_uuid(alias)
+        alias_uuids = set(aliases.values())
+        with open(xp_analyser.author_csv.csv_path, mode='r', newline='',
+                  encoding='UTF-8') as csv_file:
+            rows = list(csv.DictReader(csv_file, delimiter=';'))
+        for index, row in enumerate(rows):
+            if row['UUID'] in aliases:
+                row['Aliases'] = aliases[row['UUID']]
+            elif row['UUID'] not in alias_uuids and index % 3 == 0:
+                row['Has Left'] = 'True'
+        with open(os.path.join(self.work_dir, Benchmark.IN_CSV_FILENAME), mode='w', newline='',
+                  encoding='UTF-8') as csv_file:
+            author_writer = csv.DictWriter(csv_file, fieldnames=developer.Developer.FIELDS.keys(),
+                                           delimiter=';', quotechar='"',
+                                           quoting=csv.QUOTE_MINIMAL)
+            author_writer.writeheader()
+            author_writer.writerows(rows)
+
+    def run_once(self):
+        """
+        Run all the phases of an analysis
+        """
+        xp_analyser = xpanalyser.XPAnalyser(self.repository.path, self.work_dir, self.backend)
+        vcs_mgr = xp_analyser.vcs_mgr
+        self.time_phase('retrieve_author', vcs_mgr.retrieve_author)
+        self.time_phase('retrieve_commit_date', vcs_mgr.retrieve_commit_date)
+        xp_analyser.author_csv = authorcsv.AuthorCSV(vcs_mgr.author_dict, self.work_dir,
+                                                     vcs_mgr.merged_uuids)
+        self.write_author_csv(xp_analyser)
+        self.time_phase('update_data_from_csv', xp_analyser.get_author_information_from_csv,
+                        Benchmark.IN_CSV_FILENAME)
+        self.time_phase('compute_experience', xp_analyser.compute_experience,
+                        [self.granularity], False, True)
+        self.time_phase('save_analyse', xp_analyser.save_analyse, self.granularity.name)
+        self.nb_authors = len(vcs_mgr.author_dict)
+
+    def run(self):
+        """
+        Generate the repository if needed and run the analysis several times
+
+        :return: Results of the benchmark
+        :rtype: dict
+        """
+        self.repository.generate()
+        for _ in range(self.repeat):
+            self.run_once()
+        return self.get_results()
+
+    def get_results(self):
+        """
+        Get the results of the benchmark with the environment in which they have been
+        measured
+
+        :return: Results which can be saved in JSON
+        :rtype: dict
+        """
+        phases = {}
+        for name, timings in self.timings.items():
+            if timings:
+                phases[name] = {'min': min(timings), 'median': statistics.median(timings),
+                                'max': max(timings), 'runs': timings}
+        return {'version': Benchmark.RESULTS_VERSION,
+                'date': datetime.datetime.now().isoformat(timespec='seconds'),
+                'devxp_commit': Benchmark.get_command_output(
+                    ['git', '-C', os.path.dirname(os.path.abspath(__file__)), 'rev-parse',
+                     'HEAD']),
+                'python': platform.python_version(),
+                'git': Benchmark.get_command_output(['git', '--version']),
+                'platform': platform.platform(),
+                'backend': self.backend,
+                'granularity': self.granularity.name,
+                'repeat': self.repeat,
+                'repository': self.repository.params,
+                'nb_authors_after_csv': self.nb_authors,
+                'phases': phases}
+
+    @staticmethod
+    def get_command_output(cmd):
+        """
+        Get the output of a command of the environment
+
+        :param cmd: Command and its arguments
+        :type cmd: list(str)
+        :return: Output of the command or None if it failed
+        :rtype: str
+        """
+        try:
+            return subprocess.check_output(cmd, stderr=subprocess.DEVNULL).decode('utf-8').strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    @staticmethod
+    def compare(results, baseline, tolerance):
+        """
+        Compare the median duration of each phase with the one of a baseline
+
+        :param results: Results of the benchmark
+        :type results: dict
+        :param baseline: Results of a previous benchmark
+        :type baseline: dict
+        :param tolerance: Relative slowdown accepted, 0.1 for 10%
+        :type tolerance: float
+        :return: Report lines and names of the phases which are slower than the tolerance
+        :rtype: list(str), list(str)
+        """
+        if results['repository'] != baseline.get('repository'):
+            logging.warning('The baseline has been measured on another repository: %s',
+                            baseline.get('repository'))
+        lines = []
+        regressions = []
+        for name in Benchmark.PHASES:
+            if name not in results['phases'] or name not in baseline.get('phases', {}):
+                continue
+            new = results['phases'][name]['median']
+            old = baseline['phases'][name]['median']
+            ratio = new / old if old > 0 else float('inf')
+            status = 'OK'
+            if ratio > 1 + tolerance:
+                status = 'REGRESSION'
+                regressions.append(name)
+            lines.append('{0:<22} {1:>10.3f}s {2:>10.3f}s {3:>7.2f}x  {4}'
+                         .format(name, old, new, ratio, status))
+        return lines, regressions
+
+
+def main():
+    """
+    Main method of the benchmark
+
+    Examples of commands :
+        python benchmark.py -w ../bench_output -c 100000 -a 500 -o results.json
+        python benchmark.py -w ../bench_output -c 1000000 -a 5000 -r 0.2 -y 15 -n 1
+        python benchmark.py -w ../bench_output -c 100000 -a 500 -C results.json -t 0.15
+
+    :return: Exit code, 1 if a phase is slower than the baseline
+    :rtype: int
+    """
+    parser = optparse.OptionParser(usage="usage: %prog [options]")
+    parser.add_option("-w", "--workdir", action="store", dest="workdir",
+                      default="bench_output",
+                      help="Directory of the synthetic repositories and of the analyses")
+    parser.add_option("-c", "--commits", action="store", dest="commits", type="int",
+                      default=10000, help="Number of commits of the synthetic repository")
+    parser.add_option("-a", "--authors", action="store", dest="authors", type="int",
+                      default=100, help="Number of developers of the synthetic repository")
+    parser.add_option("-r", "--alias_rate", action="store", dest="alias_rate", type="float",
+                      default=0.1, help="Ratio of the developers who also commit under an alias")
+    parser.add_option("-y", "--years", action="store", dest="years", type="int", default=5,
+                      help="Number of years of the history")
+    parser.add_option("-s", "--seed", action="store", dest="seed", type="int", default=0,
+                      help="Seed of the generator")
+    parser.add_option("-f", "--force", action="store_true", dest="force", default=False,
+                      help="Generate the repository even if it already exists")
+    parser.add_option("-n", "--repeat", action="store", dest="repeat", type="int", default=3,
+                      help="Number of runs of each phase")
+    parser.add_option("-b", "--backend", action="store", dest="backend", type="choice",
+                      default="git", choices=["git", "native"],
+                      help="Backend used to read the repository (git or native)")
+    parser.add_option("-g", "--granularity", action="store", dest="granularity",
+                      default="monthly", help="Time step of the analysis")
+    parser.add_option("-o", "--output", action="store", dest="output", default=None,
+                      help="JSON file of the results, printed by default")
+    parser.add_option("-C", "--compare", action="store", dest="compare", default=None,
+                      help="JSON file of the results of a previous version")
+    parser.add_option("-t", "--tolerance", action="store", dest="tolerance", type="float",
+                      default=0.1, help="Relative slowdown accepted when comparing")
+    (options, _) = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    os.makedirs(options.workdir, exist_ok=True)
+    repo_path = os.path.join(options.workdir, 'repo_{0}_{1}_{2}_{3}_{4}'.format(
+        options.commits, options.authors, options.alias_rate, options.years, options.seed))
+    repository = synthrepo.SyntheticRepository(repo_path, options.commits, options.authors,
+                                               options.alias_rate, options.years, options.seed)
+    if options.force:
+        repository.generate(True)
+    analysis_dir = os.path.join(options.workdir, 'analysis')
+    os.makedirs(analysis_dir, exist_ok=True)
+    results = Benchmark(repository, analysis_dir, options.repeat, options.backend,
+                        options.granularity).run()
+    if options.output is not None:
+        with open(options.output, mode='w', encoding='UTF-8') as output_file:
+            json.dump(results, output_file, indent=2)
+    else:
+        print(json.dumps(results, indent=2))
+    if options.compare is None:
+        return 0
+    with open(options.compare, mode='r', encoding='UTF-8') as baseline_file:
+        baseline = json.load(baseline_file)
+    lines, regressions = Benchmark.compare(results, baseline, options.tolerance)
+    print('{0:<22} {1:>11} {2:>11} {3:>8}'.format('Phase', 'Baseline', 'Current', 'Ratio'))
+    print('\n'.join(lines))
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,159 @@
+"""
+Module for class SyntheticRepository
+"""
+
+import datetime
+import json
+import logging
+import os
+import random
+import subprocess
+
+
+class SyntheticRepository:
+    """
+    Class generating a reproducible git repository with git fast-import
+    """
+
+    PARAMS_FILENAME = "devxp_bench.json"
+    # The history ends on a fixed date so that the generated repositories are reproducible
+    END_DATE = datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc)
+    NB_FILES = 256
+    BUFFER_SIZE = 1 << 20
+
+    def __init__(self, path, nb_commits=10000, nb_authors=100, alias_rate=0.1, nb_years=5,
+                 seed=0):
+        """
+        Description of a synthetic repository
+
+        :param path: Path of the repository
+        :type path: str
+        :param nb_commits: Number of commits
+        :type nb_commits: int
+        :param nb_authors: Number of developers
+        :type nb_authors: int
+        :param alias_rate: Ratio of the developers who also commit under an alias
+                           (another name with the same email in another case)
+        :type alias_rate: float
+        :param nb_years: Number of years between the first and the last commit
+        :type nb_years: int
+        :param seed: Seed of the random generator
+        :type seed: int
+        """
+        if nb_commits <= 0 or nb_authors <= 0 or nb_years <= 0:
+            raise ValueError('Invalid synthetic repository {0} commits, {1} authors, {2} years'
+                             .format(nb_commits, nb_authors, nb_years))
+        self.path = path
+        self.params = {'nb_commits': nb_commits, 'nb_authors': nb_authors,
+                       'alias_rate': alias_rate, 'nb_years': nb_years, 'seed': seed}
+
+    @staticmethod
+    def get_identity(index, alias=False):
+        """
+        Get the name and the email of a developer
+
+        :param index: Index of the developer
+        :type index: int
+        :param alias: Give the alias of the developer
+        :type alias: bool
+        :return: Name and email
+        :rtype: str, str
+        """
+        if alias:
+            return 'dev{0}'.format(index), 'Dev{0}@Bench.org'.format(index)
+        return 'Developer {0}'.format(index), 'dev{0}@bench.org'.format(index)
+
+    def get_aliased_authors(self):
+        """
+        Get the developers who also commit under an alias
+
+        :return: Indexes of the developers
+        :rtype: list(int)
+        """
+        rand = random.Random(self.params['seed'])
+        nb_aliased = int(self.params['nb_authors'] * self.params['alias_rate'])
+        return sorted(rand.sample(range(self.params['nb_authors']), nb_aliased))
+
+    def is_up_to_date(self):
+        """
+        Tell if the repository has already been generated with the same parameters
+
+        :return: Boolean telling if the repository can be reused
+        :rtype: bool
+        """
+        params_path = os.path.join(self.path, '.git', SyntheticRepository.PARAMS_FILENAME)
+        if not os.path.isfile(params_path):
+            return False
+        with open(params_path, mode='r', encoding='UTF-8') as params_file:
+            return json.load(params_file) == self.params
+
+    def generate(self, force=False):
+        """
+        Generate the repository, unless it has already been generated with the same
+        parameters. Each developer commits during a random period of the history.
+
+        :param force: Generate the repository even if it is up to date
+        :type force: bool
+        """
+        if not force and self.is_up_to_date():
+            logging.info('Reusing synthetic repository %s', self.path)
+            return
+        logging.info('Generating synthetic repository %s: %s', self.path, self.params)
+        os.makedirs(self.path, exist_ok=True)
+        subprocess.check_call(['git', 'init', '-q', self.path])
+        process = subprocess.Popen(['git', '-C', self.path, 'fast-import', '--quiet', '--force'],
+                                   stdin=subprocess.PIPE, bufsize=SyntheticRepository.BUFFER_SIZE)
+        try:
+            self.write_stream(process.stdin)
+        finally:
+            process.stdin.close()
+        if process.wait() != 0:
+            raise RuntimeError('git fast-import failed on {0}'.format(self.path))
+        subprocess.check_call(['git', '-C', self.path, 'symbolic-ref', 'HEAD', 'refs/heads/master'])
+        subprocess.check_call(['git', '-C', self.path, 'reset', '-q', '--hard'])
+        params_path = os.path.join(self.path, '.git', SyntheticRepository.PARAMS_FILENAME)
+        with open(params_path, mode='w', encoding='UTF-8') as params_file:
+            json.dump(self.params, params_file)
+
+    def write_stream(self, stream):
+        """
+        Write the fast-import commands of the history
+
+        :param stream: Input of git fast-import
+        :type stream: file
+        """
+        rand = random.Random(self.params['seed'])
+        nb_commits = self.params['nb_commits']
+        nb_authors = self.params['nb_authors']
+        aliased = set(self.get_aliased_authors())
+        span = self.params['nb_years'] * 365 * 86400
+        start = int(SyntheticRepository.END_DATE.timestamp()) - span
+        # Period of activity of each developer, the first one is there from the beginning
+        periods = [(0, span)]
+        for _ in range(1, nb_authors):
+            arrival = rand.randrange(span)
+            periods.append((arrival, rand.randrange(arrival, span + 1)))
+        # Start from scratch when the repository is generated again
+        stream.write(b'reset refs/heads/master\n\n')
+        for idx in range(nb_commits):
+            offset = idx * span // nb_commits
+            author = rand.randrange(nb_authors)
+            if not periods[author][0] <= offset <= periods[author][1]:
+                # Fall back on a developer present at this time
+                author = next((x for x in range(idx % nb_authors, nb_authors)
+                               if periods[x][0] <= offset <= periods[x][1]), 0)
+            name, email = SyntheticRepository.get_identity(
+                author, author in aliased and rand.random() < 0.5)
+            content = 'line {0}\n'.format(idx).encode('utf-8')
+            message = 'commit {0}\n'.format(idx).encode('utf-8')
+            stream.write('commit refs/heads/master\n'
+                         'author {0} <{1}> {2} +0000\n'
+                         'committer {0} <{1}> {2} +0000\n'
+                         'data {3}\n'.format(name, email, start + offset, len(message))
+                         .encode('utf-8'))
+            stream.write(message)
+            stream.write('M 100644 inline file{0}.txt\ndata {1}\n'
+                         .format(idx % SyntheticRepository.NB_FILES, len(content))
+                         .encode('utf-8'))
+            stream.write(content)
+            stream.write(b'\n')
@@ -0,0 +1,130 @@
+"""
+Module for class ActivityEngine
+"""
+
+import datetime
+import logging
+
+
+class ActivityEngine:
+    """
+    Class computing the activity of a project on a series of dates with a single sweep:
+    number of developers who have committed in trailing windows of days, developers who
+    have joined and left the project during each period, and turnover
+    """
+
+    WINDOWS = (30, 90, 365)
+
+    def __init__(self, developers, commit_days, resolve_uuid=None, windows=WINDOWS):
+        """
+        Build and sort once the commit days and the presence events of the developers
+
+        :param developers: Developers of the project
+        :type developers: iterable(Developer)
+        :param commit_days: Days (%Y-%m-%d) of the commits of each author
+        :type commit_days: dict(str->set(str))
+        :param resolve_uuid: Function giving the developer representing an author (see
+                             VCSManager.resolve_uuid), so that the commits of the aliases
+                             are counted for their developer
+        :type resolve_uuid: function
+        :param windows: Number of days of the trailing windows
+        :type windows: tuple(int)
+        """
+        if any(x < 1 for x in windows):
+            raise ValueError('Invalid activity windows {0}'.format(windows))
+        self.windows = tuple(windows)
+        indexes = {}
+        self.joins = []
+        self.leaves = []
+        for dev in developers:
+            if dev.exclude or dev.first_commit_ordinal is None:
+                continue
+            indexes[dev.uuid] = len(indexes)
+            leave = dev.last_commit_ordinal + 1 if dev.has_left else None
+            if leave is not None and leave <= dev.first_commit_ordinal:
+                continue
+            self.joins.append(dev.first_commit_ordinal)
+            if leave is not None:
+                self.leaves.append(leave)
+        self.joins.sort()
+        self.leaves.sort()
+        self.nb_developers = len(indexes)
+        # A developer committing several times on a day is active once
+        days = set()
+        for uuid, dev_days in commit_days.items():
+            if resolve_uuid is not None:
+                uuid = resolve_uuid(uuid)
+            index = indexes.get(uuid)
+            if index is not None:
+                days.update((datetime.date.fromisoformat(x).toordinal(), index)
+                            for x in dev_days)
+        self.commits = sorted(days)
+        logging.info('Activity engine - Nb Developer Days: %d', len(self.commits))
+
+    def get_fields(self):
+        """
+        Get the names of the columns of the activity
+
+        :return: Names of the columns
+        :rtype: list(str)
+        """
+        return ['Date'] + ['Active {0}d'.format(x) for x in self.windows] + \
+            ['Headcount', 'Joined', 'Left', 'Turnover %']
+
+    def iter_values(self, dates):
+        """
+        Compute the activity of the project at each date. A commit of a day is in the
+        window of the dates from this day to this day plus the window excluded, so each
+        window only has to add the commits of the dates reached and to remove the ones
+        which are too old.
+
+        :param dates: Dates in ascending order
+        :type dates: iterable(datetime.date)
+        :return: Generator of the date ordinal, number of active developers of each window,
+                 number of developers present, joins and leaves since the previous date and
+                 percentage of leaves relatively to the average number of developers present
+        :rtype: generator(tuple)
+        """
+        commits = self.commits
+        nb_commits = len(commits)
+        nb_windows = len(self.windows)
+        counts = [[0] * self.nb_developers for _ in range(nb_windows)]
+        active = [0] * nb_windows
+        tails = [0] * nb_windows
+        head = 0
+        nb_joins = 0
+        nb_leaves = 0
+        headcount = 0
+        for curr_date in dates:
+            ordinal = curr_date.toordinal()
+            while head < nb_commits and commits[head][0] <= ordinal:
+                index = commits[head][1]
+                for window in range(nb_windows):
+                    counts[window][index] += 1
+                    if counts[window][index] == 1:
+                        active[window] += 1
+                head += 1
+            for window, nb_days in enumerate(self.windows):
+                limit = ordinal - nb_days
+                window_counts = counts[window]
+                tail = tails[window]
+                while tail < head and commits[tail][0] <= limit:
+                    index = commits[tail][1]
+                    window_counts[index] -= 1
+                    if window_counts[index] == 0:
+                        active[window] -= 1
+                    tail += 1
+                tails[window] = tail
+            joined = 0
+            while nb_joins < len(self.joins) and self.joins[nb_joins] <= ordinal:
+                nb_joins += 1
+                joined += 1
+            left = 0
+            while nb_leaves < len(self.leaves) and self.leaves[nb_leaves] <= ordinal:
+                nb_leaves += 1
+                left += 1
+            previous_headcount = headcount
+            headcount = nb_joins - nb_leaves
+            average = (previous_headcount + headcount) / 2
+            turnover = round(100 * left / average, 2) if average else 0.0
+            yield (ordinal,) + tuple(active) + (headcount, joined, left, turnover)
@@ -5,8 +5,11 @@ Module for class AuthorCSV
 import csv
 import logging
 import os
+import re
 
 import developer
+import identity
+import profiler
 
 
 class AuthorCSV:
@@ -15,17 +18,20 @@ class AuthorCSV:
     """
 
     OUTPUT_FILENAME = "out_author.csv"
+    UUID_PATTERN = re.compile(r'[0-9a-f]{32}')
 
-    def __init__(self, dev_dict, work_dir):
+    def __init__(self, vcs_mgr, work_dir):
         """
         Allow to do conversion between a developer dictionary and a CSV file.
 
-        :param dev_dict: Developer dictionary
-        :type dev_dict: dict(str->Developer)
+        :param vcs_mgr: Manager of the VCS giving the developer dictionary and recording the
+                        developers merged
+        :type vcs_mgr: VCSManager
         :param work_dir: Directory where are located CSV
         :type work_dir: str
         """
-        self.dev_dict = dev_dict
+        self.vcs_mgr = vcs_mgr
+        self.dev_dict = vcs_mgr.author_dict
         self.work_dir = work_dir
         self.csv_path = os.path.join(self.work_dir, AuthorCSV.OUTPUT_FILENAME)
 
@@ -42,9 +48,10 @@ class AuthorCSV:
                                            quoting=csv.QUOTE_MINIMAL)
             author_writer.writeheader()
             try:
-                [author_writer.writerow(x.get_dict_values()) for x in self.dev_dict.values()]
+                author_writer.writerows(x.get_dict_values() for x in self.dev_dict.values())
             except UnicodeEncodeError as exc:
                 logging.error('Catch exception: %s', exc.reason)
+        profiler.PROFILER.add('records', len(self.dev_dict))
 
     def update_data_from_csv(self, path):
         """
@@ -58,13 +65,24 @@ class AuthorCSV:
         with open(path, mode='r', newline='', encoding='UTF-8') as csv_file:
             author_reader = csv.DictReader(csv_file, delimiter=';',
                                            quotechar='"', quoting=csv.QUOTE_MINIMAL)
+            links = []
             for row in author_reader:
                 # Check if hte uuid is present
-                uuid = row['UUID']
+                uuid = self.vcs_mgr.resolve_uuid(row['UUID'])
                 if uuid not in self.dev_dict.keys():
                     raise ValueError('Unknown developer {0}'.format(row))
+                # Aliases are kept as links, the groups of aliases are known at the end
+                links.extend((uuid, x) for x in AuthorCSV.UUID_PATTERN.findall(row['Aliases']))
+                if uuid != row['UUID']:
+                    logging.info('%s %s has already been merged in %s %s', row['UUID'],
+                                 row['Name'], uuid, self.dev_dict[uuid].name)
+                    continue
                 # Update the has_left attribute
                 self.dev_dict[uuid].has_left = row['Has Left'].lower() == "true"
+                # The developers already merged in it are the same person
+                for alias in self.dev_dict[uuid].aliases:
+                    if isinstance(alias, developer.Developer):
+                        alias.has_left = self.dev_dict[uuid].has_left
                 # Update the exclude attribute
                 self.dev_dict[uuid].exclude = row['Exclude'].lower() == "true"
                 # Update First Commit Date
@@ -83,19 +101,32 @@ class AuthorCSV:
                                  self.dev_dict[uuid].get_last_commit_date(),
                                  last_commit_from_csv)
                     self.dev_dict[uuid].set_last_commit_date(last_commit_from_csv)
-                # Update Aliases
-                if row['Aliases'] != '[]':
-                    self.dev_dict[uuid].aliases = row['Aliases'].split('_')
+            # The header is not a record
+            profiler.PROFILER.add('records', author_reader.line_num - 1)
         logging.info('Update of Author dictionary')
-        uuid_to_delete = []
-        for key, dev in self.dev_dict.items():
-            uuid_aliases = dev.aliases.copy()
-            dev.aliases.clear()
-            for alias in uuid_aliases:
-                logging.info('Linking UUID %s to %s %s', alias, key, dev.name)
-                dev.aliases.append(self.dev_dict[alias])
-                uuid_to_delete.append(alias)
-            dev.update_based_on_aliases()
-        for alias in uuid_to_delete:
-            logging.debug('Deleting UUID %s', alias)
-            del self.dev_dict[alias]
+        self.link_aliases(links)
+
+    def link_aliases(self, links):
+        """
+        Merge the developers linked as aliases. Chains of aliases are merged in a single
+        developer: the one which is not the alias of another one.
+
+        :param links: Pairs of UUIDs (developer, alias)
+        :type links: list(tuple(str))
+        """
+        union_find = identity.UnionFind()
+        alias_uuids = set()
+        for uuid, alias in links:
+            alias = self.vcs_mgr.resolve_uuid(alias)
+            if alias not in self.dev_dict:
+                raise ValueError('Unknown alias {0} of {1}'.format(alias, uuid))
+            if alias != uuid:
+                alias_uuids.add(alias)
+                union_find.union(uuid, alias)
+        clusters = {}
+        for members in union_find.groups().values():
+            canonical = min(members, key=lambda x: (x in alias_uuids,
+                                                    self.dev_dict[x].first_commit_ordinal))
+            clusters[canonical] = members
+        self.vcs_mgr.merged_uuids.update(
+            identity.IdentityResolver.merge(self.dev_dict, clusters))
@@ -0,0 +1,113 @@
+"""
+Module for class BatchAnalyser
+"""
+
+import concurrent.futures
+import logging
+import os
+
+import vcsmanager
+import xpanalyser
+
+
+def scan_repository(path, backend, keep_days=False):
+    """
+    Retrieve the authors of a repository and their commit dates.
+    Function executed in the worker processes.
+
+    :param path: Path to the VCS repository
+    :type path: str
+    :param backend: Name of the backend used to read the repository
+    :type backend: str
+    :param keep_days: Keep also the days of the commits of each author
+    :type keep_days: bool
+    :return: Developer dictionary, all the emails used by each developer and the days of
+             their commits (None if they are not kept)
+    :rtype: dict(str->Developer), dict(str->set(str)), dict(str->set(str))
+    """
+    vcs_mgr = vcsmanager.VCSManager(path, backend)
+    if keep_days:
+        vcs_mgr.keep_commit_days()
+    vcs_mgr.build_author_dict()
+    return vcs_mgr.author_dict, vcs_mgr.author_emails, vcs_mgr.commit_days
+
+
+class BatchAnalyser:
+    """
+    Class which analyses several repositories as a single project
+    """
+
+    def __init__(self, source, work_dir="", backend='git', max_workers=None):
+        """
+        Analyse in parallel several repositories and merge their developers
+
+        :param source: Directory containing the repositories or file listing their paths
+                       (one per line)
+        :type source: str
+        :param work_dir: Path to the working directory (for output and output file)
+        :type work_dir: str
+        :param backend: Name of the backend used to read the repositories
+        :type backend: str
+        :param max_workers: Number of worker processes, number of CPUs by default
+        :type max_workers: int
+        """
+        self.source = source
+        self.backend = backend
+        self.max_workers = max_workers
+        self.repositories = BatchAnalyser.list_repositories(source)
+        self.xp_analyser = xpanalyser.XPAnalyser(source, work_dir, backend)
+        self.failures = {}
+
+    def keep_commit_days(self):
+        """
+        Keep the days of the commits of all the repositories, so that the activity and the
+        departures from the cadence can be computed
+        """
+        self.xp_analyser.keep_commit_days()
+
+    @staticmethod
+    def list_repositories(source):
+        """
+        Get the repositories to analyse
+
+        :param source: Directory containing the repositories or file listing their paths
+        :type source: str
+        :return: Paths of the repositories
+        :rtype: list(str)
+        """
+        if os.path.isdir(source):
+            return sorted(os.path.join(source, x) for x in os.listdir(source)
+                          if os.path.exists(os.path.join(source, x, '.git')))
+        with open(source, mode='r', encoding='UTF-8') as list_file:
+            return [x.strip() for x in list_file if x.strip() and not x.startswith('#')]
+
+    def retrieve_author_information(self):
+        """
+        Scan all the repositories in a process pool and merge their developers by identity,
+        so that the first commit of a developer is the earliest one in all the repositories.
+        A repository which cannot be scanned is reported without stopping the others.
+
+        :return: Analyser of the merged developers
+        :rtype: XPAnalyser
+        """
+        logging.info('Scanning %d repositories from %s', len(self.repositories), self.source)
+        self.xp_analyser.merge_author_information({})
+        keep_days = self.xp_analyser.vcs_mgr.commit_days is not None
+        with concurrent.futures.ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [(executor.submit(scan_repository, x, self.backend, keep_days), x)
+                       for x in self.repositories]
+            # Merge in the order of the repositories so that the result is deterministic
+            for future, path in futures:
+                try:
+                    author_dict, author_emails, commit_days = future.result()
+                except Exception as exc:  # pylint: disable=broad-except
+                    logging.error('Failure of the scan of %s: %s', path, exc)
+                    self.failures[path] = str(exc)
+                    continue
+                logging.info('Repository %s scanned - Nb Authors: %d', path, len(author_dict))
+                self.xp_analyser.merge_author_information(author_dict, author_emails,
+                                                          commit_days)
+        logging.info('Batch scanned - Nb Repositories: %d - Nb Failures: %d - Nb Authors: %d',
+                     len(self.repositories), len(self.failures),
+                     len(self.xp_analyser.vcs_mgr.author_dict))
+        return self.xp_analyser
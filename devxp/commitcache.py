@@ -0,0 +1,236 @@
+"""
+Module for classes CommitCache and CommitCacheWriter
+"""
+
+import datetime
+import hashlib
+import logging
+import mmap
+import os
+import struct
+
+import developer
+
+
+class CommitCacheWriter:
+    """
+    Class gathering the commits read by a full scan of the history and saving them in the
+    cache at the end of the scan
+    """
+
+    def __init__(self, cache):
+        """
+        Writer of the cache of a repository
+
+        :param cache: Cache of the commits
+        :type cache: CommitCache
+        """
+        self.cache = cache
+        self.names = {}
+        self.emails = {}
+        self.records = bytearray()
+
+    def begin(self, rev_range):
+        """
+        Start the scan, only a scan of all the history can be cached
+
+        :param rev_range: Range of commits scanned, all the history if empty
+        :type rev_range: str
+        """
+        if rev_range:
+            raise ValueError('Only a full scan can be cached, not {0}'.format(rev_range))
+        self.names.clear()
+        self.emails.clear()
+        self.records = bytearray()
+
+    def add_commit(self, name, email, iso_date):
+        """
+        Add a commit
+
+        :param name: Name of the author of the commit
+        :type name: str
+        :param email: Email of the author of the commit
+        :type email: str
+        :param iso_date: Author date of the commit with the ISO 8601 format
+        :type iso_date: str
+        """
+        author_date = datetime.datetime.fromisoformat(iso_date)
+        self.records += CommitCache.RECORD.pack(
+            self.names.setdefault(name, len(self.names)),
+            self.emails.setdefault(email, len(self.emails)),
+            int(author_date.timestamp()), int(author_date.utcoffset().total_seconds()))
+
+    def end(self):
+        """
+        Save the commits in the cache
+        """
+        self.cache.save(list(self.names), list(self.emails), self.records)
+
+
+class CommitCache:
+    """
+    Class caching in the working directory the commits of the history of a repository as
+    fixed-width binary records (index of the author name, index of the email, timestamp
+    and timezone offset of the author date), read back with mmap.
+    The file is named after the path of the repository and the references scanned, so it
+    is not used anymore as soon as a reference moves.
+    """
+
+    MAGIC = b'DXPC'
+    VERSION = 1
+    # Magic, version, number of records, sizes of the tables of names and emails
+    HEADER = struct.Struct('<4sIQQQ')
+    RECORD = struct.Struct('<IIqi')
+    SEPARATOR = b'\0'
+    SECONDS_PER_DAY = 86400
+    EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+
+    def __init__(self, cache_dir, vcs_path, refs):
+        """
+        Cache of the commits reachable from references of a repository
+
+        :param cache_dir: Directory of the cache files
+        :type cache_dir: str
+        :param vcs_path: Path to the VCS repository
+        :type vcs_path: str
+        :param refs: SHA of the references scanned
+        :type refs: list(str)
+        """
+        self.cache_dir = cache_dir
+        self.repo_key = hashlib.sha1(os.path.abspath(vcs_path).encode('utf-8')).hexdigest()[:16]
+        refs_key = hashlib.sha1('{0}\n{1}'.format(CommitCache.VERSION, '\n'.join(sorted(refs)))
+                                .encode('utf-8')).hexdigest()[:16]
+        self.path = os.path.join(cache_dir, '{0}_{1}.bin'.format(self.repo_key, refs_key))
+
+    def exists(self):
+        """
+        Tell if the commits of the references are cached
+
+        :return: Boolean telling if the cache file exists
+        :rtype: bool
+        """
+        return os.path.isfile(self.path)
+
+    def save(self, names, emails, records):
+        """
+        Write the cache file and delete the previous files of the repository
+
+        :param names: Names of the authors, indexed by the records
+        :type names: list(str)
+        :param emails: Emails of the authors, indexed by the records
+        :type emails: list(str)
+        :param records: Packed records of the commits
+        :type records: bytes
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        names_data = CommitCache.SEPARATOR.join(x.encode('utf-8') for x in names)
+        emails_data = CommitCache.SEPARATOR.join(x.encode('utf-8') for x in emails)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, mode='wb') as cache_file:
+            cache_file.write(CommitCache.HEADER.pack(
+                CommitCache.MAGIC, CommitCache.VERSION, len(records) // CommitCache.RECORD.size,
+                len(names_data), len(emails_data)))
+            cache_file.write(records)
+            cache_file.write(names_data)
+            cache_file.write(emails_data)
+        # A reader never sees a partial file
+        os.replace(tmp_path, self.path)
+        for filename in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, filename)
+            if filename.startswith(self.repo_key + '_') and path != self.path:
+                logging.info('Deleting outdated commit cache %s', path)
+                os.remove(path)
+        logging.info('Commit cache saved in %s - Nb Commits: %d', self.path,
+                     len(records) // CommitCache.RECORD.size)
+
+    def get_author_table(self, commit_days=None):
+        """
+        Fold the cached commits in an author table as a scan of the history would do
+
+        :param commit_days: Dictionary filled with the days (%Y-%m-%d) of the commits of each
+                            author, not filled by default
+        :type commit_days: dict(str->set(str))
+        :return: Author table (see shardscan.ShardedScan.merge) or None if the cache file
+                 is not valid
+        :rtype: dict(str->list)
+        """
+        with open(self.path, mode='rb') as cache_file:
+            with mmap.mmap(cache_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                if len(mapped) < CommitCache.HEADER.size:
+                    logging.warning('Invalid commit cache %s', self.path)
+                    return None
+                magic, version, nb_records, names_size, emails_size = \
+                    CommitCache.HEADER.unpack_from(mapped)
+                records_end = CommitCache.HEADER.size + nb_records * CommitCache.RECORD.size
+                if magic != CommitCache.MAGIC or version != CommitCache.VERSION or \
+                        len(mapped) != records_end + names_size + emails_size:
+                    logging.warning('Invalid commit cache %s', self.path)
+                    return None
+                names = mapped[records_end:records_end + names_size].decode('utf-8') \
+                    .split(CommitCache.SEPARATOR.decode())
+                emails = mapped[records_end + names_size:].decode('utf-8') \
+                    .split(CommitCache.SEPARATOR.decode())
+                with memoryview(mapped) as view:
+                    records = view[CommitCache.HEADER.size:records_end]
+                    table = CommitCache.fold(records, len(names), commit_days is not None)
+                    records.release()
+        logging.info('Commit cache read from %s - Nb Commits: %d', self.path, nb_records)
+        author_table = {}
+        for index, (first, last, last_email, email_indexes, days) in enumerate(table):
+            if first is None:
+                continue
+            name = names[index]
+            uuid = developer.Developer.compute_uuid(name)
+            author_table[uuid] = [name, emails[last_email], CommitCache.get_day(first),
+                                  CommitCache.get_day(last),
+                                  sorted(emails[x] for x in email_indexes)]
+            if commit_days is not None:
+                commit_days[uuid] = {CommitCache.get_day(x) for x in days}
+        return author_table
+
+    @staticmethod
+    def fold(records, nb_authors, keep_days=False):
+        """
+        Fold the records in the first and last commit days of each author
+
+        :param records: Packed records of the commits in the order of the scan
+        :type records: memoryview
+        :param nb_authors: Number of author names
+        :type nb_authors: int
+        :param keep_days: Keep all the commit days of each author
+        :type keep_days: bool
+        :return: First and last commit days (since epoch), index of the email of the last
+                 commit, indexes of all the emails and commit days of each author
+        :rtype: list(list)
+        """
+        table = [[None, None, None, set(), set()] for _ in range(nb_authors)]
+        seconds_per_day = CommitCache.SECONDS_PER_DAY
+        for author, email, timestamp, offset in CommitCache.RECORD.iter_unpack(records):
+            # Day in the timezone of the author, as the ISO 8601 date of the scan
+            day = (timestamp + offset) // seconds_per_day
+            values = table[author]
+            values[3].add(email)
+            if keep_days:
+                values[4].add(day)
+            if values[0] is None:
+                values[0] = values[1] = day
+                values[2] = email
+            elif day < values[0]:
+                values[0] = day
+            elif day > values[1]:
+                # Keep the email of the most recent commit
+                values[1] = day
+                values[2] = email
+        return table
+
+    @staticmethod
+    def get_day(day):
+        """
+        Get a number of days since epoch with the format %Y-%m-%d
+
+        :param day: Number of days since epoch
+        :type day: int
+        :return: Date
+        :rtype: str
+        """
+        return datetime.date.fromordinal(day + CommitCache.EPOCH_ORDINAL).isoformat()
@@ -0,0 +1,107 @@
+"""
+Module for class DepartureDetector
+"""
+
+import datetime
+import logging
+import math
+
+import developer
+
+
+class DepartureDetector:
+    """
+    Class marking as departed the developers who have not committed for a long time: longer
+    than a fixed gap or than a percentile of the gaps between their own commit days
+    """
+
+    GAP_DAYS = 180
+
+    def __init__(self, gap_days=GAP_DAYS, percentile=None, reference_date=None):
+        """
+        Detector of the departures
+
+        :param gap_days: Number of days without commit after which a developer has left.
+                         With a percentile, it is the minimal number of days.
+        :type gap_days: int
+        :param percentile: Percentile (0 to 100) of the gaps between the commit days of a
+                           developer after which the developer has left, the fixed gap by
+                           default
+        :type percentile: float
+        :param reference_date: Date at which the inactivity is measured, the last commit of
+                               the project by default
+        :type reference_date: datetime.date
+        """
+        if gap_days < 0:
+            raise ValueError('Invalid gap {0}'.format(gap_days))
+        if percentile is not None and not 0 < percentile <= 100:
+            raise ValueError('Invalid percentile {0}'.format(percentile))
+        self.gap_days = gap_days
+        self.percentile = percentile
+        self.reference_date = reference_date
+
+    def get_gap_threshold(self, days):
+        """
+        Get the number of days without commit after which a developer has left
+
+        :param days: Ordinals of the commit days of the developer in ascending order
+        :type days: list(int)
+        :return: Number of days
+        :rtype: int
+        """
+        if self.percentile is None or len(days) < 2:
+            return self.gap_days
+        gaps = sorted(y - x for x, y in zip(days, days[1:]))
+        # Nearest-rank percentile
+        rank = max(1, math.ceil(self.percentile / 100 * len(gaps)))
+        return max(self.gap_days, gaps[rank - 1])
+
+    def detect(self, author_dict, commit_days=None, resolve_uuid=None):
+        """
+        Set has_left for the developers inactive since their last commit for longer than
+        their threshold. The developers already marked as departed are kept so.
+
+        :param author_dict: Developer dictionary with commit dates
+        :type author_dict: dict(str->Developer)
+        :param commit_days: Days (%Y-%m-%d) of the commits of each author, required with
+                            a percentile
+        :type commit_days: dict(str->set(str))
+        :param resolve_uuid: Function giving the developer representing an author (see
+                             VCSManager.resolve_uuid), the cadence of a developer
+                             includes the commit days of its aliases
+        :type resolve_uuid: function
+        :return: UUIDs of the developers detected as departed
+        :rtype: list(str)
+        """
+        if self.percentile is not None and commit_days is None:
+            raise ValueError('Commit days are required to detect departures from the cadence')
+        dated = [x for x in author_dict.values() if x.last_commit_ordinal is not None]
+        if not dated:
+            return []
+        if self.reference_date is not None:
+            reference = self.reference_date.toordinal()
+        else:
+            reference = max(x.last_commit_ordinal for x in dated)
+        dev_days = {}
+        if self.percentile is not None:
+            for uuid, days in commit_days.items():
+                if resolve_uuid is not None:
+                    uuid = resolve_uuid(uuid)
+                dev_days.setdefault(uuid, set()).update(days)
+        departed = []
+        for dev in dated:
+            if dev.has_left or dev.exclude:
+                continue
+            days = sorted(datetime.date.fromisoformat(x).toordinal()
+                          for x in dev_days.get(dev.uuid, ()))
+            if reference - dev.last_commit_ordinal <= self.get_gap_threshold(days):
+                continue
+            logging.debug('%s has left after %s', dev.name, dev.get_last_commit_date())
+            dev.has_left = True
+            for alias in dev.aliases:
+                if isinstance(alias, developer.Developer):
+                    alias.has_left = True
+            departed.append(dev.uuid)
+        logging.info('Departures detected on %s - Nb Departed: %d',
+                     datetime.date.fromordinal(reference), len(departed))
+        return departed
@@ -19,6 +19,10 @@ class Developer:
 
     DATE_FORMAT = "%Y-%m-%d"
 
+    # Dates are stored as ordinals and aliases as a tuple to reduce the memory footprint
+    __slots__ = ('name', 'email', 'uuid', 'first_commit_ordinal', 'last_commit_ordinal',
+                 '_aliases', 'has_left', 'exclude')
+
     def __init__(self, name, email):
         """
         Create a structure to represent a developer
@@ -31,13 +35,80 @@ class Developer:
         logging.debug('Creating Developer %s: %s', name, email)
         self.name = name
         self.email = email
-        self.uuid = hashlib.md5(self.name.encode('utf8')).hexdigest()
-        self.first_commit_date = None
-        self.last_commit_date = None
-        self.aliases = []
+        self.uuid = Developer.compute_uuid(self.name)
+        self.first_commit_ordinal = None
+        self.last_commit_ordinal = None
+        self._aliases = ()
         self.has_left = False
         self.exclude = False
 
+    @property
+    def first_commit_date(self):
+        """
+        First commit date of the developer
+
+        :return: First commit date or None if it is unknown
+        :rtype: datetime.date
+        """
+        if self.first_commit_ordinal is None:
+            return None
+        return datetime.date.fromordinal(self.first_commit_ordinal)
+
+    @first_commit_date.setter
+    def first_commit_date(self, date):
+        self.first_commit_ordinal = None if date is None else date.toordinal()
+
+    @property
+    def last_commit_date(self):
+        """
+        Last commit date of the developer
+
+        :return: Last commit date or None if it is unknown
+        :rtype: datetime.date
+        """
+        if self.last_commit_ordinal is None:
+            return None
+        return datetime.date.fromordinal(self.last_commit_ordinal)
+
+    @last_commit_date.setter
+    def last_commit_date(self, date):
+        self.last_commit_ordinal = None if date is None else date.toordinal()
+
+    @property
+    def aliases(self):
+        """
+        Aliases of the developer: UUIDs read from a CSV file or Developers once linked
+
+        :return: Aliases
+        :rtype: tuple
+        """
+        return self._aliases
+
+    @aliases.setter
+    def aliases(self, aliases):
+        self._aliases = tuple(aliases)
+
+    def add_alias(self, alias):
+        """
+        Add an alias to the developer
+
+        :param alias: Alias (UUID or Developer)
+        :type alias: str or Developer
+        """
+        self._aliases += (alias,)
+
+    @staticmethod
+    def compute_uuid(name):
+        """
+        Compute the UUID of a developer from its name
+
+        :param name: Name of the developer
+        :type name: str
+        :return: UUID of the developer
+        :rtype: str
+        """
+        return hashlib.md5(name.encode('utf8')).hexdigest()
+
     def get_values(self):
         """
         Return a subset of the attributes as a list
@@ -46,7 +117,7 @@ class Developer:
         :rtype: list
         """
         return [self.name, self.email, self.get_first_commit_date(),
-                self.get_last_commit_date(), self.has_left, self.exclude, self.aliases]
+                self.get_last_commit_date(), self.has_left, self.exclude, self.get_alias_uuids()]
 
     def get_dict_values(self):
         """
@@ -58,8 +129,19 @@ class Developer:
         res = {}
         for key, value in Developer.FIELDS.items():
             res[key] = self.__getattribute__(value)
+        # Aliases are written as a list of UUIDs in the CSV files
+        res['Aliases'] = self.get_alias_uuids()
         return res
 
+    def get_alias_uuids(self):
+        """
+        Get the UUIDs of the aliases, whether they are already linked or not
+
+        :return: List of UUIDs
+        :rtype: list(str)
+        """
+        return [x.uuid if isinstance(x, Developer) else x for x in self.aliases]
+
     def get_first_commit_date(self):
         """
         Get the first commit date as a string with the format %Y-%m-%d
@@ -67,7 +149,7 @@ class Developer:
         :return: First commit date
         :rtype: str
         """
-        if self.first_commit_date is None:
+        if self.first_commit_ordinal is None:
             return ""
         return datetime.date.strftime(self.first_commit_date, Developer.DATE_FORMAT)
 
@@ -78,7 +160,7 @@ class Developer:
         :return: Last commit date
         :rtype: str
         """
-        if self.last_commit_date is None:
+        if self.last_commit_ordinal is None:
             return ""
         return datetime.date.strftime(self.last_commit_date, Developer.DATE_FORMAT)
 
@@ -111,11 +193,12 @@ class Developer:
         :return: Boolean telling if the developer was present at this date
         :rtype: bool
         """
-        if curr_date < self.first_commit_date:
+        curr_ordinal = curr_date.toordinal()
+        if curr_ordinal < self.first_commit_ordinal:
             return False
         if not self.has_left:
             return True
-        return curr_date <= self.last_commit_date
+        return curr_ordinal <= self.last_commit_ordinal
 
     def get_experience(self, curr_date):
         """
@@ -132,12 +215,14 @@ class Developer:
         """
         real_xp = datetime.timedelta(0)
         cumulative_xp = datetime.timedelta(0)
-        if curr_date >= self.first_commit_date:
-            if not self.has_left or (self.has_left and curr_date <= self.last_commit_date):
-                real_xp = curr_date - self.first_commit_date
+        curr_ordinal = curr_date.toordinal()
+        if curr_ordinal >= self.first_commit_ordinal:
+            if not self.has_left or (self.has_left and curr_ordinal <= self.last_commit_ordinal):
+                real_xp = datetime.timedelta(curr_ordinal - self.first_commit_ordinal)
                 cumulative_xp = real_xp
             else:
-                cumulative_xp = self.last_commit_date - self.first_commit_date
+                cumulative_xp = datetime.timedelta(self.last_commit_ordinal -
+                                                   self.first_commit_ordinal)
         logging.debug('%s %s at %s - Real XP: %d days - Cumulative XP: %d days', self.uuid,
                       self.name, curr_date, real_xp.days, cumulative_xp.days)
         return real_xp, cumulative_xp
@@ -155,7 +240,7 @@ class Developer:
             if alias.exclude:
                 logging.info('Alias %s is excluded, so %s is also excluded', alias.name, self.name)
                 self.exclude = True
-            if alias.first_commit_date < self.first_commit_date:
-                self.first_commit_date = alias.first_commit_date
-            if alias.last_commit_date > self.last_commit_date:
-                self.last_commit_date = alias.last_commit_date
+            if alias.first_commit_ordinal < self.first_commit_ordinal:
+                self.first_commit_ordinal = alias.first_commit_ordinal
+            if alias.last_commit_ordinal > self.last_commit_ordinal:
+                self.last_commit_ordinal = alias.last_commit_ordinal
@@ -4,37 +4,120 @@ Module for class Experience
 
 import datetime
 
+import tiers
+
 
 class Experience:
     """
     Class allowing to process experience of a project at a specific date
     """
 
-    FIELDS = {'Date': 'curr_date', 'Real XP': 'real_xp', 'Cumulative XP': 'cumulative_xp',
-              'Nb Junior': 'nb_junior', 'Nb Advanced': 'nb_advanced',
-              'Nb Senior': 'nb_senior'}
-
-    JUNIOR_XP = datetime.timedelta(182)
-    ADVANCED_XP = datetime.timedelta(365)
-    SENIOR_XP = datetime.timedelta(730)
+    BASE_FIELDS = ('Date', 'Real XP', 'Cumulative XP')
 
-    JUNIOR = 1
-    ADVANCED = 2
-    SENIOR = 3
+    # The date is stored as an ordinal, the XP as a number of days and the number of
+    # developers of each tier in a list to reduce the memory footprint
+    __slots__ = ('curr_ordinal', 'real_days', 'cumulative_days', 'counts', 'tier_model')
 
-    def __init__(self, curr_date):
+    def __init__(self, curr_date, tier_model=None):
         """
         Represent the experience of a project a specific date
 
         :param curr_date: Date of the project to analyse
         :type curr_date: str
+        :param tier_model: Tiers of experience, junior, advanced and senior by default
+        :type tier_model: TierModel
+        """
+        self.curr_ordinal = curr_date.toordinal()
+        self.tier_model = tier_model if tier_model is not None else tiers.DEFAULT_MODEL
+        self.counts = [0] * len(self.tier_model)
+        self.real_days = 0
+        self.cumulative_days = 0
+
+    @staticmethod
+    def from_values(values, tier_model=None):
+        """
+        Build the experience of a period from its values
+
+        :param values: Date ordinal, real XP days, cumulative XP days and number of
+                       developers of each tier
+        :type values: tuple(int)
+        :param tier_model: Tiers of experience, junior, advanced and senior by default
+        :type tier_model: TierModel
+        :return: Experience of the period
+        :rtype: Experience
+        """
+        curr_xp = Experience(datetime.date.fromordinal(values[0]), tier_model)
+        curr_xp.real_days = values[1]
+        curr_xp.cumulative_days = values[2]
+        curr_xp.counts = list(values[3:])
+        return curr_xp
+
+    @staticmethod
+    def get_field_names(tier_model=None):
+        """
+        Get the names of the CSV columns of the experience
+
+        :param tier_model: Tiers of experience, junior, advanced and senior by default
+        :type tier_model: TierModel
+        :return: Names of the columns
+        :rtype: list(str)
+        """
+        if tier_model is None:
+            tier_model = tiers.DEFAULT_MODEL
+        return list(Experience.BASE_FIELDS) + tier_model.get_fields()
+
+    def get_count(self, name):
+        """
+        Get the number of developers of a tier
+
+        :param name: Name of the tier
+        :type name: str
+        :return: Number of developers
+        :rtype: int
         """
-        self.curr_date = curr_date
-        self.nb_junior = 0
-        self.nb_advanced = 0
-        self.nb_senior = 0
-        self.real_xp = datetime.timedelta(0)
-        self.cumulative_xp = datetime.timedelta(0)
+        return self.counts[self.tier_model.names.index(name)]
+
+    @property
+    def curr_date(self):
+        """
+        Date of the project analysed
+
+        :return: Date
+        :rtype: datetime.date
+        """
+        return datetime.date.fromordinal(self.curr_ordinal)
+
+    @curr_date.setter
+    def curr_date(self, date):
+        self.curr_ordinal = date.toordinal()
+
+    @property
+    def real_xp(self):
+        """
+        Real XP of the project
+
+        :return: Real XP
+        :rtype: datetime.timedelta
+        """
+        return datetime.timedelta(self.real_days)
+
+    @real_xp.setter
+    def real_xp(self, xp_value):
+        self.real_days = xp_value.days
+
+    @property
+    def cumulative_xp(self):
+        """
+        Cumulative XP of the project
+
+        :return: Cumulative XP
+        :rtype: datetime.timedelta
+        """
+        return datetime.timedelta(self.cumulative_days)
+
+    @cumulative_xp.setter
+    def cumulative_xp(self, xp_value):
+        self.cumulative_days = xp_value.days
 
     def add_xp(self, real_xp, all_xp):
         """
@@ -46,41 +129,31 @@ class Experience:
         :type all_xp: datetime.timedelta
         """
         if real_xp > datetime.timedelta(0):
-            self.add_xp_category(Experience.get_xp_category(real_xp))
-        self.real_xp += real_xp
-        self.cumulative_xp += all_xp
+            self.add_xp_category(self.get_xp_category(real_xp))
+        self.real_days += real_xp.days
+        self.cumulative_days += all_xp.days
 
-    @staticmethod
-    def get_xp_category(xp_value):
+    def get_xp_category(self, xp_value):
         """
         Get the category of a developer based on his/her/its experience
 
         :param xp_value: Experience of the developer
         :type xp_value: datetime.timedelta
-        :return: The category of experience of the developer
+        :return: The category of experience of the developer (index of its tier)
         :rtype: int
         """
-        if xp_value < Experience.ADVANCED_XP:
-            return Experience.JUNIOR
-        if xp_value < Experience.SENIOR_XP:
-            return Experience.ADVANCED
-        return Experience.SENIOR
+        return self.tier_model.classify(xp_value.days)
 
     def add_xp_category(self, category):
         """
         Add a profile to the current experience count
 
-        :param category: Profile of experience
+        :param category: Profile of experience (index of its tier)
         :type category: int
         """
-        if category == Experience.JUNIOR:
-            self.nb_junior += 1
-        elif category == Experience.ADVANCED:
-            self.nb_advanced += 1
-        elif category == Experience.SENIOR:
-            self.nb_senior += 1
-        else:
+        if not 0 <= category < len(self.counts):
             raise ValueError('Unknown category {0}'.format(category))
+        self.counts[category] += 1
 
     def process_dev(self, developer):
         """
@@ -108,8 +181,7 @@ class Experience:
         :return: List of a subset of the attributes
         :rtype: list
         """
-        return [self.get_curr_date(), self.real_xp.days, self.cumulative_xp.days, self.nb_junior,
-                self.nb_advanced, self.nb_senior]
+        return [self.get_curr_date(), self.real_days, self.cumulative_days] + self.counts
 
     def get_dict_values(self):
         """
@@ -118,10 +190,5 @@ class Experience:
         :return: Dict of a subset of the attributes
         :rtype: dict
         """
-        res = {}
-        for key, value in Experience.FIELDS.items():
-            if datetime.timedelta.__instancecheck__(self.__getattribute__(value)):
-                res[key] = self.__getattribute__(value).days
-            else:
-                res[key] = self.__getattribute__(value)
-        return res
+        return dict(zip(Experience.get_field_names(self.tier_model),
+                        [self.curr_date, self.real_days, self.cumulative_days] + self.counts))
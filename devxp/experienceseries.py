@@ -0,0 +1,154 @@
+"""
+Module for class ExperienceSeries
+"""
+
+import array
+import bisect
+import datetime
+
+import experience
+import tiers
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class ExperienceSeries:
+    """
+    Class storing the experience of a project over time in columns of integers
+    """
+
+    BASE_COLUMNS = ('date', 'real_xp', 'cumulative_xp')
+    TYPECODE = 'q'
+
+    def __init__(self, columns=None, tier_model=None):
+        """
+        Create a series, empty by default
+
+        :param columns: Content of the columns (date ordinals, real XP days, cumulative
+                        XP days and number of developers of each tier)
+        :type columns: dict(str->array.array)
+        :param tier_model: Tiers of experience, junior, advanced and senior by default
+        :type tier_model: TierModel
+        """
+        self.tier_model = tier_model if tier_model is not None else tiers.DEFAULT_MODEL
+        # The columns of the tiers such as nb_junior follow the base columns
+        self.column_names = ExperienceSeries.BASE_COLUMNS + tuple(self.tier_model.get_columns())
+        if columns is None:
+            columns = {x: array.array(ExperienceSeries.TYPECODE) for x in self.column_names}
+        self.columns = columns
+
+    def __len__(self):
+        return len(self.columns['date'])
+
+    def __getitem__(self, index):
+        """
+        Get a period of the series or a sub-series
+
+        :param index: Index or slice of periods
+        :type index: int or slice
+        :return: Experience of the period or sub-series
+        :rtype: Experience or ExperienceSeries
+        """
+        if isinstance(index, slice):
+            return ExperienceSeries({x: self.columns[x][index] for x in self.column_names},
+                                    self.tier_model)
+        return experience.Experience.from_values([self.columns[x][index]
+                                                  for x in self.column_names], self.tier_model)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def append(self, values):
+        """
+        Add a period at the end of the series
+
+        :param values: Date ordinal, real XP days, cumulative XP days and number of
+                       developers of each tier
+        :type values: tuple(int)
+        """
+        for name, value in zip(self.column_names, values):
+            self.columns[name].append(value)
+
+    def append_experience(self, curr_xp):
+        """
+        Add the experience of a period at the end of the series
+
+        :param curr_xp: Experience of the period
+        :type curr_xp: Experience
+        """
+        self.append((curr_xp.curr_ordinal, curr_xp.real_days, curr_xp.cumulative_days)
+                    + tuple(curr_xp.counts))
+
+    def iter_values(self):
+        """
+        Give the periods as tuples of integers without building Experience objects
+
+        :return: Generator of the date ordinal, real XP days, cumulative XP days and number
+                 of developers of each tier of each period
+        :rtype: generator(tuple(int))
+        """
+        return zip(*[self.columns[x] for x in self.column_names])
+
+    def iter_dict_values(self):
+        """
+        Give the periods as dictionaries compatible with Experience.get_dict_values
+        without building Experience objects
+
+        :return: Generator of dictionaries
+        :rtype: generator(dict)
+        """
+        keys = experience.Experience.get_field_names(self.tier_model)
+        for values in zip(*[self.columns[x] for x in self.column_names]):
+            row = dict(zip(keys, values))
+            row[keys[0]] = datetime.date.fromordinal(values[0])
+            yield row
+
+    def resample(self, granularity):
+        """
+        Get the series at another granularity: each date takes the values of the last
+        period of the series which is not after it
+
+        :param granularity: Time step of the new series
+        :type granularity: Granularity
+        :return: Resampled series
+        :rtype: ExperienceSeries
+        """
+        result = ExperienceSeries(tier_model=self.tier_model)
+        if not len(self):
+            return result
+        dates = self.columns['date']
+        for curr_date in granularity.iter_dates(datetime.date.fromordinal(dates[0]),
+                                                datetime.date.fromordinal(dates[-1])):
+            ordinal = curr_date.toordinal()
+            index = bisect.bisect_right(dates, ordinal) - 1
+            values = [self.columns[x][index] for x in self.column_names]
+            values[0] = ordinal
+            result.append(values)
+        return result
+
+    def get_buffer(self, name):
+        """
+        Get a column without copy through the buffer protocol
+
+        :param name: Name of the column (see column_names)
+        :type name: str
+        :return: View on the column
+        :rtype: memoryview
+        """
+        return memoryview(self.columns[name])
+
+    def to_numpy(self):
+        """
+        Get the columns as NumPy arrays sharing the memory of the series
+
+        :return: Arrays by column name
+        :rtype: dict(str->numpy.ndarray)
+        """
+        if numpy is None:
+            raise RuntimeError('NumPy is not available')
+        return {x: numpy.frombuffer(self.columns[x], dtype=numpy.int64)
+                for x in self.column_names}
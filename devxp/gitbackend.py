@@ -0,0 +1,132 @@
+"""
+Module for class GitCommandBackend
+"""
+
+import logging
+import os
+import subprocess
+
+import logreader
+import profiler
+
+
+class GitCommandBackend:
+    """
+    Class which queries a Git repository by launching the git command
+    """
+
+    GIT_CMD = 'git --git-dir={0}' + os.path.sep + '.git  --work-tree={0} {1}'
+    GIT_LOG_CMD = 'git --git-dir={0}' + os.path.sep + '.git  --work-tree={0} log {1}'
+    AUTHOR_DATE_FORMAT = '-z "--pretty=format:%an%x1f%ae%x1f%aI"'
+    HEAD_CMD = 'rev-parse --verify -q HEAD'
+    IS_ANCESTOR_CMD = 'merge-base --is-ancestor {0} {1}'
+    FIRST_PARENTS_CMD = 'rev-list --first-parent --reverse {0}'
+    LIST_REFS_CMD = 'for-each-ref "--format=%(refname)%09%(objectname)%09%(*objectname)" {0}'
+    GRAPH_FORMAT = '-z --topo-order "--pretty=format:%H%x1f%P%x1f%an%x1f%ae%x1f%aI"'
+
+    def __init__(self, vcs_path):
+        """
+        Give access to the history of a Git repository through the git command
+
+        :param vcs_path: Path to the Git repository
+        :type vcs_path: str
+        """
+        self.vcs_path = vcs_path
+
+    def retrieve_head(self):
+        """
+        Get the identifier of the commit currently checked out
+
+        :return: SHA of HEAD or None if the repository does not have any commit
+        :rtype: str
+        """
+        vcs_cmd = GitCommandBackend.GIT_CMD.format(self.vcs_path, GitCommandBackend.HEAD_CMD)
+        logging.info(vcs_cmd)
+        profiler.PROFILER.add('subprocesses')
+        try:
+            return subprocess.check_output(vcs_cmd, shell=True).decode("utf-8").strip()
+        except subprocess.CalledProcessError:
+            logging.warning('No HEAD found in %s', self.vcs_path)
+            return None
+
+    def is_ancestor(self, ancestor, commit):
+        """
+        Tell if a commit is an ancestor of another one
+
+        :param ancestor: SHA of the possible ancestor
+        :type ancestor: str
+        :param commit: SHA of the descendant
+        :type commit: str
+        :return: Boolean telling if ancestor is reachable from commit
+        :rtype: bool
+        """
+        vcs_cmd = GitCommandBackend.GIT_CMD.format(
+            self.vcs_path, GitCommandBackend.IS_ANCESTOR_CMD.format(ancestor, commit))
+        logging.info(vcs_cmd)
+        profiler.PROFILER.add('subprocesses')
+        return subprocess.call(vcs_cmd, shell=True, stderr=subprocess.DEVNULL) == 0
+
+    def list_first_parents(self, rev='HEAD'):
+        """
+        Get the commits of the first-parent chain of a revision
+
+        :param rev: Revision whose chain is listed
+        :type rev: str
+        :return: SHA of the commits from the root to the revision
+        :rtype: list(str)
+        """
+        vcs_cmd = GitCommandBackend.GIT_CMD.format(
+            self.vcs_path, GitCommandBackend.FIRST_PARENTS_CMD.format(rev))
+        logging.info(vcs_cmd)
+        profiler.PROFILER.add('subprocesses')
+        return subprocess.check_output(vcs_cmd, shell=True).decode("utf-8").split()
+
+    def list_refs(self, patterns):
+        """
+        Get the references matching patterns, such as refs/heads/release/*
+
+        :param patterns: Patterns of the references (see git for-each-ref)
+        :type patterns: list(str)
+        :return: Name and SHA of the commit of each reference, sorted by name
+        :rtype: list(tuple(str, str))
+        """
+        vcs_cmd = GitCommandBackend.GIT_CMD.format(
+            self.vcs_path, GitCommandBackend.LIST_REFS_CMD.format(
+                ' '.join('"{0}"'.format(x) for x in patterns)))
+        logging.info(vcs_cmd)
+        profiler.PROFILER.add('subprocesses')
+        refs = []
+        for line in subprocess.check_output(vcs_cmd, shell=True).decode("utf-8").splitlines():
+            name, sha, peeled = line.split('\t')
+            # Annotated tags are peeled to their commit
+            refs.append((name, peeled or sha))
+        return refs
+
+    def iter_graph(self, revs):
+        """
+        Walk once the commits reachable from several revisions, each commit being given
+        before its parents
+
+        :param revs: SHA of the revisions
+        :type revs: list(str)
+        :return: Generator of the SHA, SHA of the parents, name, email and author date
+                 (ISO 8601) of each commit
+        :rtype: generator(tuple(str, list(str), str, str, str))
+        """
+        vcs_cmd = GitCommandBackend.GIT_LOG_CMD.format(
+            self.vcs_path, '{0} {1}'.format(GitCommandBackend.GRAPH_FORMAT, ' '.join(revs)))
+        for sha, parents, name, email, iso_date in logreader.LogReader(vcs_cmd, 5):
+            yield sha, parents.split(), name, email, iso_date
+
+    def iter_commits(self, rev_range=''):
+        """
+        Walk the commits of the history
+
+        :param rev_range: Range of commits to walk, all the history of HEAD by default
+        :type rev_range: str
+        :return: Generator of the name, email and author date (ISO 8601) of each commit
+        :rtype: generator(list(str))
+        """
+        vcs_cmd = GitCommandBackend.GIT_LOG_CMD.format(
+            self.vcs_path, '{0} {1}'.format(GitCommandBackend.AUTHOR_DATE_FORMAT, rev_range))
+        return iter(logreader.LogReader(vcs_cmd, 3))
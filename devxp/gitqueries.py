@@ -0,0 +1,142 @@
+"""
+Module for class GitQueryExecutor
+"""
+
+import asyncio
+import logging
+import os
+import subprocess
+
+import profiler
+
+
+class GitQueryExecutor:
+    """
+    Class running git queries concurrently in an asyncio event loop, with a limit on the
+    number of git processes running at the same time
+    """
+
+    AUTHOR_DATE_FORMAT = '--format=%aI'
+
+    def __init__(self, vcs_path, max_concurrency=None):
+        """
+        Executor of the queries of a repository
+
+        :param vcs_path: Path to the VCS repository
+        :type vcs_path: str
+        :param max_concurrency: Maximal number of git processes running at the same time,
+                                number of CPUs by default
+        :type max_concurrency: int
+        """
+        if max_concurrency is None:
+            max_concurrency = os.cpu_count() or 1
+        if max_concurrency <= 0:
+            raise ValueError('Invalid concurrency {0}'.format(max_concurrency))
+        self.vcs_path = vcs_path
+        self.max_concurrency = max_concurrency
+
+    def get_command(self, args):
+        """
+        Get the command of a query. The arguments are given to git as a list, so that they
+        do not need to be quoted for a shell.
+
+        :param args: Arguments of git
+        :type args: list(str)
+        :return: Command and its arguments
+        :rtype: list(str)
+        """
+        return ['git', '--git-dir', os.path.join(self.vcs_path, '.git'),
+                '--work-tree', self.vcs_path] + list(args)
+
+    async def run_query(self, semaphore, args):
+        """
+        Run a query once a slot is available
+
+        :param semaphore: Slots of the running queries
+        :type semaphore: asyncio.Semaphore
+        :param args: Arguments of git
+        :type args: list(str)
+        :return: Output of the query
+        :rtype: bytes
+        """
+        cmd = self.get_command(args)
+        async with semaphore:
+            logging.debug(cmd)
+            process = await asyncio.create_subprocess_exec(*cmd, stdout=subprocess.PIPE,
+                                                           stderr=subprocess.PIPE)
+            profiler.PROFILER.add('subprocesses')
+            output, error = await process.communicate()
+        profiler.PROFILER.add('bytes_read', len(output))
+        if process.returncode != 0:
+            raise subprocess.CalledProcessError(process.returncode, cmd, output, error)
+        return output
+
+    async def run_queries(self, queries):
+        """
+        Run the queries concurrently
+
+        :param queries: Arguments of git of each query
+        :type queries: list(list(str))
+        :return: Outputs in the order of the queries
+        :rtype: list(bytes)
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        return await asyncio.gather(*[self.run_query(semaphore, x) for x in queries])
+
+    def run(self, queries):
+        """
+        Run the queries concurrently and wait for all of them
+
+        :param queries: Arguments of git of each query
+        :type queries: list(list(str))
+        :return: Outputs in the order of the queries
+        :rtype: list(bytes)
+        """
+        logging.info('Running %d git queries - Concurrency: %d', len(queries),
+                     self.max_concurrency)
+        return asyncio.run(self.run_queries(queries))
+
+    @staticmethod
+    def get_author_query(pattern, since=None, until=None):
+        """
+        Get the arguments of the query of the author dates of the commits whose author
+        (name <email>) contains a pattern
+
+        :param pattern: Pattern of the author, not interpreted as a regular expression
+        :type pattern: str
+        :param since: Only the commits more recent than this date
+        :type since: str
+        :param until: Only the commits older than this date
+        :type until: str
+        :return: Arguments of git
+        :rtype: list(str)
+        """
+        args = ['log', '--fixed-strings', '--author=' + pattern,
+                GitQueryExecutor.AUTHOR_DATE_FORMAT]
+        if since:
+            args.append('--since=' + since)
+        if until:
+            args.append('--until=' + until)
+        return args
+
+    def query_authors(self, filters):
+        """
+        Get the number of commits and the first and last commit dates of each author filter
+
+        :param filters: Pattern of the author, start and end dates (None if not limited)
+                        of each filter
+        :type filters: list(tuple(str))
+        :return: Number of commits, first and last commit days (None without commit)
+                 in the order of the filters
+        :rtype: list(tuple)
+        """
+        outputs = self.run([GitQueryExecutor.get_author_query(*x) for x in filters])
+        results = []
+        for output in outputs:
+            # ISO 8601 dates can be compared as strings
+            days = [x[:10] for x in output.decode('utf-8').split()]
+            if days:
+                results.append((len(days), min(days), max(days)))
+            else:
+                results.append((0, None, None))
+        return results
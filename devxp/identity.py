@@ -0,0 +1,269 @@
+"""
+Module for classes UnionFind and IdentityResolver
+"""
+
+import logging
+import os
+import re
+import unicodedata
+
+
+class UnionFind:
+    """
+    Class grouping items into disjoint sets (union by size with path halving)
+    """
+
+    def __init__(self):
+        """
+        Structure without any item
+        """
+        self.parents = {}
+        self.sizes = {}
+
+    def find(self, item):
+        """
+        Get the representative of the set of an item, the item is added if it is unknown
+
+        :param item: Item to look for
+        :type item: hashable
+        :return: Representative of the set
+        :rtype: hashable
+        """
+        parent = self.parents.setdefault(item, item)
+        while parent != item:
+            grand_parent = self.parents[parent]
+            self.parents[item] = grand_parent
+            item, parent = parent, grand_parent
+        return item
+
+    def union(self, item_a, item_b):
+        """
+        Merge the sets of two items
+
+        :param item_a: First item
+        :type item_a: hashable
+        :param item_b: Second item
+        :type item_b: hashable
+        :return: Representative of the merged set
+        :rtype: hashable
+        """
+        root_a = self.find(item_a)
+        root_b = self.find(item_b)
+        if root_a == root_b:
+            return root_a
+        size_a = self.sizes.get(root_a, 1)
+        size_b = self.sizes.get(root_b, 1)
+        if size_a < size_b:
+            root_a, root_b = root_b, root_a
+        self.parents[root_b] = root_a
+        self.sizes[root_a] = size_a + size_b
+        return root_a
+
+    def groups(self, items=None):
+        """
+        Get the sets of the items
+
+        :param items: Items to group, all the known items by default
+        :type items: iterable
+        :return: Items of each set by representative
+        :rtype: dict(hashable->list)
+        """
+        groups = {}
+        for item in self.parents if items is None else items:
+            groups.setdefault(self.find(item), []).append(item)
+        return groups
+
+
+class IdentityResolver:
+    """
+    Class clustering the developers who are the same person under several names:
+    same normalised email, same normalised name or same identity in the .mailmap file
+    """
+
+    MAILMAP_FILENAME = ".mailmap"
+    MAILMAP_PATTERN = re.compile(r'([^<>]*)<([^<>]*)>')
+    # Shared or meaningless identities which must not link developers
+    GENERIC_NAMES = {'root', 'admin', 'administrator', 'unknown', 'user', 'nobody', 'none'}
+    GENERIC_MAILBOXES = {'root', 'admin', 'noreply', 'no-reply', 'none', 'nobody', 'unknown'}
+    GITHUB_NOREPLY = 'users.noreply.github.com'
+
+    def __init__(self, mailmap_path=None):
+        """
+        Resolver of identities
+
+        :param mailmap_path: Path of a .mailmap file, not used if it does not exist
+        :type mailmap_path: str
+        """
+        self.mailmap = {}
+        self.proper_names = set()
+        if mailmap_path is not None and os.path.isfile(mailmap_path):
+            self.read_mailmap(mailmap_path)
+
+    def read_mailmap(self, path):
+        """
+        Read the entries of a .mailmap file: each commit identity (email, optionally with a
+        name) is mapped to the proper name and/or email of the developer
+
+        :param path: Path of the .mailmap file
+        :type path: str
+        """
+        logging.info('Reading mailmap %s', path)
+        with open(path, mode='r', encoding='UTF-8', errors='replace') as mailmap_file:
+            for line in mailmap_file:
+                if line.lstrip().startswith('#'):
+                    continue
+                identities = IdentityResolver.MAILMAP_PATTERN.findall(line)
+                if len(identities) == 1:
+                    proper_name, proper_email = identities[0][0].strip(), ''
+                    commit_name, commit_email = '', identities[0][1]
+                elif len(identities) == 2:
+                    proper_name, proper_email = identities[0][0].strip(), identities[0][1]
+                    commit_name, commit_email = identities[1][0].strip(), identities[1][1]
+                else:
+                    continue
+                if proper_name:
+                    self.proper_names.add(proper_name)
+                self.mailmap[(commit_name.lower(), commit_email.strip().lower())] = \
+                    (proper_name, proper_email)
+        logging.info('Mailmap read - Nb Entries: %d', len(self.mailmap))
+
+    @staticmethod
+    def normalise_email(email):
+        """
+        Get the key of an email: lower case without the sub-address (+tag), GitHub private
+        addresses being reduced to the login
+
+        :param email: Email to normalise
+        :type email: str
+        :return: Normalised email or None if it cannot identify a developer
+        :rtype: str
+        """
+        local, _, domain = email.strip().lower().rpartition('@')
+        if not local or not domain:
+            return None
+        if domain == IdentityResolver.GITHUB_NOREPLY:
+            local = local.split('+')[-1]
+        else:
+            local = local.split('+')[0]
+        if not local or local in IdentityResolver.GENERIC_MAILBOXES:
+            return None
+        return local + '@' + domain
+
+    @staticmethod
+    def normalise_name(name):
+        """
+        Get the key of a name: words without accent nor case nor punctuation, sorted so that
+        'Doe, John' and 'John Doe' are the same name
+
+        :param name: Name to normalise
+        :type name: str
+        :return: Normalised name or None if it cannot identify a developer
+        :rtype: str
+        """
+        decomposed = unicodedata.normalize('NFKD', name)
+        stripped = ''.join(x for x in decomposed if not unicodedata.combining(x))
+        words = sorted(re.findall(r'\w+', stripped.lower()))
+        key = ' '.join(words)
+        if not key or key in IdentityResolver.GENERIC_NAMES:
+            return None
+        return key
+
+    def lookup_mailmap(self, name, email):
+        """
+        Get the proper identity of a commit identity
+
+        :param name: Name of the commit identity
+        :type name: str
+        :param email: Email of the commit identity
+        :type email: str
+        :return: Proper name and proper email (empty if not mapped) or None if the identity
+                 is not in the mailmap
+        :rtype: tuple(str)
+        """
+        email = email.strip().lower()
+        proper = self.mailmap.get((name.lower(), email))
+        if proper is None:
+            proper = self.mailmap.get(('', email))
+        return proper
+
+    def resolve(self, author_dict, author_emails=None):
+        """
+        Cluster the developers: each developer is linked to its normalised name and to
+        its normalised emails and, through the mailmap, to its proper name and email.
+        The developers linked to the same key are the same person.
+
+        :param author_dict: Developer dictionary
+        :type author_dict: dict(str->Developer)
+        :param author_emails: All the emails used by each developer, only the email of the
+                              developer by default
+        :type author_emails: dict(str->iterable(str))
+        :return: UUIDs of the developers of each cluster of several developers, by UUID of
+                 the developer which represents the cluster
+        :rtype: dict(str->list(str))
+        """
+        union_find = UnionFind()
+        for uuid, dev in author_dict.items():
+            union_find.find(uuid)
+            emails = {dev.email}
+            if author_emails is not None:
+                emails.update(author_emails.get(uuid, ()))
+            keys = [('name', IdentityResolver.normalise_name(dev.name))]
+            for email in emails:
+                keys.append(('email', IdentityResolver.normalise_email(email)))
+                proper = self.lookup_mailmap(dev.name, email)
+                if proper is not None:
+                    keys.append(('name', IdentityResolver.normalise_name(proper[0])))
+                    keys.append(('email', IdentityResolver.normalise_email(proper[1])))
+            for key in keys:
+                if key[1] is not None:
+                    union_find.union(uuid, key)
+        clusters = {}
+        for members in union_find.groups(author_dict.keys()).values():
+            if len(members) < 2:
+                continue
+            canonical = min(members, key=lambda x: self.get_priority(author_dict[x]))
+            clusters[canonical] = members
+        logging.info('Identities resolved - Nb Clusters: %d', len(clusters))
+        return clusters
+
+    def get_priority(self, dev):
+        """
+        Get the priority of a developer to represent its cluster: its proper name in the
+        mailmap first, then the earliest first commit
+
+        :param dev: Developer
+        :type dev: Developer
+        :return: Sort key, the lowest is the representative
+        :rtype: tuple
+        """
+        first_commit = dev.first_commit_ordinal
+        return (dev.name not in self.proper_names,
+                first_commit if first_commit is not None else float('inf'), dev.name)
+
+    @staticmethod
+    def merge(author_dict, clusters):
+        """
+        Link the developers of each cluster to the developer which represents it, which
+        takes their commit dates, and remove them from the developer dictionary
+
+        :param author_dict: Developer dictionary
+        :type author_dict: dict(str->Developer)
+        :param clusters: UUIDs of the developers of each cluster by UUID of its representative
+        :type clusters: dict(str->list(str))
+        :return: UUID of the representative of each removed developer
+        :rtype: dict(str->str)
+        """
+        merged_uuids = {}
+        for canonical, members in clusters.items():
+            dev = author_dict[canonical]
+            for uuid in members:
+                if uuid != canonical:
+                    logging.info('Linking UUID %s %s to %s %s', uuid, author_dict[uuid].name,
+                                 canonical, dev.name)
+                    dev.add_alias(author_dict[uuid])
+                    merged_uuids[uuid] = canonical
+            dev.update_based_on_aliases()
+        for uuid in merged_uuids:
+            logging.debug('Deleting UUID %s', uuid)
+            del author_dict[uuid]
+        return merged_uuids
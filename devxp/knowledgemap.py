@@ -0,0 +1,403 @@
+"""
+Module for class KnowledgeMap
+"""
+
+import csv
+import datetime
+import json
+import logging
+import os
+
+import developer
+import experience
+import gitbackend
+import logreader
+import sinks
+import xpengine
+
+
+class PathNode:
+    """
+    Class representing a directory of the repository in the path trie
+    """
+
+    def __init__(self):
+        """
+        Directory without sub-directory nor developer
+        """
+        self.children = {}
+        self.developers = {}
+
+    def touch(self, uuid, ordinal, added, deleted):
+        """
+        Record a change of a developer in the directory
+
+        :param uuid: UUID of the developer
+        :type uuid: str
+        :param ordinal: Ordinal of the date of the change
+        :type ordinal: int
+        :param added: Number of lines added
+        :type added: int
+        :param deleted: Number of lines deleted
+        :type deleted: int
+        """
+        stats = self.developers.get(uuid)
+        if stats is None:
+            self.developers[uuid] = [ordinal, ordinal, added, deleted]
+            return
+        if ordinal < stats[0]:
+            stats[0] = ordinal
+        elif ordinal > stats[1]:
+            stats[1] = ordinal
+        stats[2] += added
+        stats[3] += deleted
+
+
+class KnowledgeMap:
+    """
+    Class giving for each directory of a repository the developers who worked on it:
+    first and last touch dates and line churn
+    """
+
+    INDEX_FILENAME = "knowledge_map.json"
+    OUTPUT_FILENAME = "knowledge_map.csv"
+    OWNERS_FILENAME = "knowledge_owners.csv"
+    INDEX_VERSION = 2
+    LOG_FORMAT = '-z --no-renames {0} "--pretty=format:%x1e%an%x1f%ae%x1f%aI"'
+    COMMIT_MARK = '\x1e'
+    OWNERS_FIELDS = ['Path', 'UUID', 'Name', 'First Touch', 'Last Touch', 'Lines Added',
+                     'Lines Deleted']
+
+    def __init__(self, vcs_path, work_dir=""):
+        """
+        Knowledge map of a repository
+
+        :param vcs_path: Path to the VCS repository
+        :type vcs_path: str
+        :param work_dir: Directory where are located the index and the output files
+        :type work_dir: str
+        """
+        self.vcs_path = vcs_path
+        self.work_dir = work_dir
+        self.index_path = os.path.join(work_dir, KnowledgeMap.INDEX_FILENAME)
+        self.authors = {}
+        self.paths = {}
+        # HEAD of the scanned history
+        self.head = None
+
+    def build(self):
+        """
+        Scan once the history with the line changes of each file and build the path trie,
+        each directory aggregating the changes of all its files and sub-directories
+        """
+        logging.info('Building knowledge map of %s', self.vcs_path)
+        # Read before the scan so that a commit added meanwhile causes a rescan later
+        self.head = gitbackend.GitCommandBackend(self.vcs_path).retrieve_head()
+        root = PathNode()
+        for uuid, ordinal, files in KnowledgeMap.iter_commits(self.vcs_path, '--numstat',
+                                                              self.authors):
+            for numstat in files:
+                numstat = numstat.split('\t', 2)
+                if len(numstat) != 3:
+                    continue
+                # Binary files do not have a number of lines
+                added = int(numstat[0]) if numstat[0] != '-' else 0
+                deleted = int(numstat[1]) if numstat[1] != '-' else 0
+                node = root
+                node.touch(uuid, ordinal, added, deleted)
+                for part in numstat[2].split('/')[:-1]:
+                    child = node.children.get(part)
+                    if child is None:
+                        child = PathNode()
+                        node.children[part] = child
+                    node = child
+                    node.touch(uuid, ordinal, added, deleted)
+        self.paths = {}
+        to_visit = [('', root)]
+        while to_visit:
+            path, node = to_visit.pop()
+            self.paths[path] = node.developers
+            for part, child in node.children.items():
+                to_visit.append((part if not path else path + '/' + part, child))
+        logging.info('Knowledge map built - Nb Directories: %d', len(self.paths))
+
+    @staticmethod
+    def iter_commits(vcs_path, option, authors):
+        """
+        Scan once the history with the files changed by each commit
+
+        :param vcs_path: Path to the VCS repository
+        :type vcs_path: str
+        :param option: Option of git log giving a token per file, such as --numstat or
+                       --name-only
+        :type option: str
+        :param authors: Dictionary filled with the name and the email of each author
+        :type authors: dict(str->list(str))
+        :return: Iterator on the UUID of the author, the ordinal of the date and the file
+                 tokens of each commit
+        :rtype: iterator(tuple(str, int, list(str)))
+        """
+        vcs_cmd = gitbackend.GitCommandBackend.GIT_LOG_CMD.format(
+            vcs_path, KnowledgeMap.LOG_FORMAT.format(option))
+        uuid = None
+        ordinal = None
+        files = []
+        for record in logreader.LogReader(vcs_cmd, None).iter_raw_records():
+            token = record.decode('utf-8', errors='replace').lstrip('\n')
+            if token.startswith(KnowledgeMap.COMMIT_MARK):
+                if uuid is not None:
+                    yield uuid, ordinal, files
+                header, _, token = token[1:].partition('\n')
+                name, email, iso_date = header.split(logreader.LogReader.FIELD_SEPARATOR)
+                uuid = developer.Developer.compute_uuid(name)
+                if uuid not in authors:
+                    authors[uuid] = [name, email]
+                ordinal = datetime.date.fromisoformat(iso_date[:10]).toordinal()
+                files = []
+            if token and uuid is not None:
+                files.append(token)
+        if uuid is not None:
+            yield uuid, ordinal, files
+
+    @staticmethod
+    def build_developers(stats, authors, author_dict=None, resolve_uuid=None):
+        """
+        Build the developers of a sub-tree: their first commit is their first touch of the
+        sub-tree. When a developer has left the project, his/her/its last commit in the
+        project is kept.
+
+        :param stats: First and last touch ordinals, followed by any other statistic, of
+                      each author of the sub-tree
+        :type stats: dict(str->list(int))
+        :param authors: Name and email of each author
+        :type authors: dict(str->list(str))
+        :param author_dict: Developer dictionary of the project giving the departures and
+                            the exclusions
+        :type author_dict: dict(str->Developer)
+        :param resolve_uuid: Function giving the developer representing an author (see
+                             VCSManager.resolve_uuid), an alias is merged in its developer
+        :type resolve_uuid: function
+        :return: Developers of the sub-tree
+        :rtype: list(Developer)
+        """
+        developers = {}
+        for uuid, values in stats.items():
+            first, last = values[0], values[1]
+            if resolve_uuid is not None:
+                uuid = resolve_uuid(uuid)
+            dev = developers.get(uuid)
+            if dev is None:
+                name, email = authors[uuid] if uuid in authors else \
+                    (author_dict[uuid].name, author_dict[uuid].email)
+                dev = developer.Developer(name, email)
+                dev.first_commit_ordinal = first
+                dev.last_commit_ordinal = last
+                developers[uuid] = dev
+                continue
+            dev.first_commit_ordinal = min(dev.first_commit_ordinal, first)
+            dev.last_commit_ordinal = max(dev.last_commit_ordinal, last)
+        for uuid, dev in developers.items():
+            project_dev = None if author_dict is None else author_dict.get(uuid)
+            if project_dev is not None:
+                dev.has_left = project_dev.has_left
+                dev.exclude = project_dev.exclude
+                if project_dev.has_left and project_dev.last_commit_ordinal is not None:
+                    dev.last_commit_ordinal = max(project_dev.last_commit_ordinal,
+                                                  dev.last_commit_ordinal)
+        return list(developers.values())
+
+    @staticmethod
+    def get_day_after(ordinal, vcs_path):
+        """
+        Get the first date of an analysis: the day after the first commit
+
+        :param ordinal: Ordinal of the date of the first commit, None without commit
+        :type ordinal: int
+        :param vcs_path: Path to the VCS repository
+        :type vcs_path: str
+        :return: Start date
+        :rtype: datetime.date
+        """
+        if ordinal is None:
+            raise ValueError('No commit in {0}'.format(vcs_path))
+        return datetime.date.fromordinal(ordinal + 1)
+
+    def save_index(self):
+        """
+        Save the knowledge map so that the queries do not have to scan the history again
+        """
+        logging.info('Saving knowledge map in %s', self.index_path)
+        with open(self.index_path, mode='w', encoding='UTF-8') as index_file:
+            json.dump({'version': KnowledgeMap.INDEX_VERSION, 'head': self.head,
+                       'authors': self.authors, 'paths': self.paths}, index_file)
+
+    def load_index(self):
+        """
+        Load the knowledge map saved by a previous scan, unless HEAD has moved since then
+
+        :return: Boolean telling if the index has been loaded
+        :rtype: bool
+        """
+        if not os.path.isfile(self.index_path):
+            return False
+        logging.info('Loading knowledge map from %s', self.index_path)
+        with open(self.index_path, mode='r', encoding='UTF-8') as index_file:
+            index = json.load(index_file)
+        if index.get('version') != KnowledgeMap.INDEX_VERSION:
+            logging.warning('Unsupported knowledge map version %s', index.get('version'))
+            return False
+        head = gitbackend.GitCommandBackend(self.vcs_path).retrieve_head()
+        if index['head'] != head:
+            logging.warning('Knowledge map of %s outdated, HEAD moved from %s to %s',
+                            self.vcs_path, index['head'], head)
+            return False
+        self.head = head
+        self.authors = index['authors']
+        self.paths = index['paths']
+        return True
+
+    @staticmethod
+    def normalise(path):
+        """
+        Get the key of a directory in the knowledge map, the root being an empty string
+
+        :param path: Path of the directory relative to the root of the repository
+        :type path: str
+        :return: Key of the directory
+        :rtype: str
+        """
+        path = path.strip().strip('/')
+        return '' if path == '.' else path
+
+    def list_paths(self, depth):
+        """
+        Get the directories up to a depth, the root of the repository being the depth 0
+
+        :param depth: Maximal depth
+        :type depth: int
+        :return: Sorted directories
+        :rtype: list(str)
+        """
+        return sorted(x for x in self.paths if (x.count('/') + 1 if x else 0) <= depth)
+
+    def get_developers(self, path, author_dict=None, resolve_uuid=None):
+        """
+        Get the developers of a directory (see build_developers)
+
+        :param path: Path of the sub-tree, relative to the root of the repository
+        :type path: str
+        :param author_dict: Developer dictionary of the project giving the departures and
+                            the exclusions
+        :type author_dict: dict(str->Developer)
+        :param resolve_uuid: Function giving the developer representing an author (see
+                             VCSManager.resolve_uuid)
+        :type resolve_uuid: function
+        :return: Developers of the sub-tree
+        :rtype: list(Developer)
+        """
+        path = KnowledgeMap.normalise(path)
+        if path not in self.paths:
+            raise ValueError('Unknown directory {0}'.format(path))
+        return KnowledgeMap.build_developers(self.paths[path], self.authors, author_dict,
+                                             resolve_uuid)
+
+    def get_owners(self, path, resolve_uuid=None):
+        """
+        Get the first and last touch ordinals and the line churn of the developers of a
+        directory, the statistics of an alias being added to the ones of its developer
+
+        :param path: Path of the directory, relative to the root of the repository
+        :type path: str
+        :param resolve_uuid: Function giving the developer representing an author (see
+                             VCSManager.resolve_uuid)
+        :type resolve_uuid: function
+        :return: Statistics of each developer
+        :rtype: dict(str->list(int))
+        """
+        owners = {}
+        for uuid, (first, last, added, deleted) in self.paths[path].items():
+            if resolve_uuid is not None:
+                uuid = resolve_uuid(uuid)
+            stats = owners.get(uuid)
+            if stats is None:
+                owners[uuid] = [first, last, added, deleted]
+                continue
+            stats[0] = min(stats[0], first)
+            stats[1] = max(stats[1], last)
+            stats[2] += added
+            stats[3] += deleted
+        return owners
+
+    def get_start_date(self):
+        """
+        Get the first date of the analysis: the day after the first commit
+
+        :return: Start date
+        :rtype: datetime.date
+        """
+        return KnowledgeMap.get_day_after(
+            min((x[0] for x in self.paths.get('', {}).values()), default=None), self.vcs_path)
+
+    def save_analyse(self, paths, granularity, author_dict=None, tier_model=None,
+                     resolve_uuid=None):
+        """
+        Save in a CSV file the experience of each sub-tree over time
+
+        :param paths: Paths of the sub-trees
+        :type paths: list(str)
+        :param granularity: Time step of the analysis
+        :type granularity: Granularity
+        :param author_dict: Developer dictionary of the project
+        :type author_dict: dict(str->Developer)
+        :param tier_model: Tiers of experience, junior, advanced and senior by default
+        :type tier_model: TierModel
+        :param resolve_uuid: Function giving the developer representing an author (see
+                             VCSManager.resolve_uuid)
+        :type resolve_uuid: function
+        """
+        csv_sink = sinks.CSVSink(os.path.join(self.work_dir, KnowledgeMap.OUTPUT_FILENAME),
+                                 ['Path'], 'UTF-8',
+                                 experience.Experience.get_field_names(tier_model))
+        try:
+            for path in paths:
+                engine = xpengine.XPEngine(self.get_developers(path, author_dict, resolve_uuid),
+                                           tier_model)
+                dates = granularity.iter_dates(self.get_start_date(), datetime.date.today())
+                extra_values = (KnowledgeMap.normalise(path) or '.',)
+                for values in engine.iter_values(dates):
+                    csv_sink.write(values, extra_values)
+        finally:
+            csv_sink.close()
+
+    def save_owners(self, paths, author_dict=None, resolve_uuid=None):
+        """
+        Save in a CSV file the developers of each sub-tree with their line churn
+
+        :param paths: Paths of the sub-trees
+        :type paths: list(str)
+        :param author_dict: Developer dictionary of the project
+        :type author_dict: dict(str->Developer)
+        :param resolve_uuid: Function giving the developer representing an author (see
+                             VCSManager.resolve_uuid)
+        :type resolve_uuid: function
+        """
+        csv_path = os.path.join(self.work_dir, KnowledgeMap.OWNERS_FILENAME)
+        logging.info('Saving owners per directory in %s', csv_path)
+        with open(csv_path, mode='w', newline='', encoding='UTF-8') as csv_file:
+            owner_writer = csv.writer(csv_file, delimiter=';', quotechar='"',
+                                      quoting=csv.QUOTE_MINIMAL)
+            owner_writer.writerow(KnowledgeMap.OWNERS_FIELDS)
+            for path in paths:
+                path = KnowledgeMap.normalise(path)
+                stats = self.get_owners(path, resolve_uuid)
+                # Biggest contributors first
+                for uuid in sorted(stats, key=lambda x, s=stats: -(s[x][2] + s[x][3])):
+                    if author_dict is not None and uuid in author_dict and \
+                            author_dict[uuid].exclude:
+                        continue
+                    first, last, added, deleted = stats[uuid]
+                    name = self.authors[uuid][0] if uuid in self.authors else \
+                        author_dict[uuid].name
+                    owner_writer.writerow([path or '.', uuid, name,
+                                           datetime.date.fromordinal(first),
+                                           datetime.date.fromordinal(last), added, deleted])
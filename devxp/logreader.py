@@ -0,0 +1,100 @@
+"""
+Module for class LogReader
+"""
+
+import logging
+import subprocess
+
+import profiler
+
+
+class LogReader:
+    """
+    Class which streams the records of a VCS log command
+    """
+
+    CHUNK_SIZE = 1 << 16
+    RECORD_SEPARATOR = b'\0'
+    FIELD_SEPARATOR = '\x1f'
+    LOG_STEP = 100000
+
+    def __init__(self, vcs_cmd, nb_fields):
+        """
+        Read incrementally the output of a VCS command printing NUL-delimited records
+        whose fields are separated by the unit separator character.
+
+        :param vcs_cmd: Command to launch
+        :type vcs_cmd: str
+        :param nb_fields: Number of fields expected in every record
+        :type nb_fields: int
+        """
+        self.vcs_cmd = vcs_cmd
+        self.nb_fields = nb_fields
+        self.nb_records = 0
+
+    def __iter__(self):
+        """
+        Launch the command and yield its records as soon as they are read
+
+        :return: Generator of the fields of each record
+        :rtype: generator(list(str))
+        """
+        for record in self.iter_raw_records():
+            fields = self.decode(record)
+            if fields is not None:
+                yield fields
+        logging.info('End of log - Nb Records: %d', self.nb_records)
+
+    def iter_raw_records(self):
+        """
+        Launch the command and yield its raw NUL-delimited records as soon as they are read
+
+        :return: Generator of records
+        :rtype: generator(bytes)
+        """
+        logging.info(self.vcs_cmd)
+        process = subprocess.Popen(self.vcs_cmd, shell=True, stdout=subprocess.PIPE)
+        profiler.PROFILER.add('subprocesses')
+        completed = False
+        try:
+            pending = b''
+            while True:
+                chunk = process.stdout.read(LogReader.CHUNK_SIZE)
+                if not chunk:
+                    break
+                profiler.PROFILER.add('bytes_read', len(chunk))
+                records = (pending + chunk).split(LogReader.RECORD_SEPARATOR)
+                # The last record may be incomplete
+                pending = records.pop()
+                for record in records:
+                    yield record
+            yield pending
+            completed = True
+        finally:
+            process.stdout.close()
+            if not completed:
+                # The reading has been interrupted
+                process.kill()
+            ret_code = process.wait()
+        if ret_code != 0:
+            raise subprocess.CalledProcessError(ret_code, self.vcs_cmd)
+
+    def decode(self, record):
+        """
+        Convert a raw record in its list of fields
+
+        :param record: Raw record
+        :type record: bytes
+        :return: List of fields or None if the record is malformed
+        :rtype: list(str)
+        """
+        fields = record.decode('utf-8', errors='replace').strip('\n').\
+            split(LogReader.FIELD_SEPARATOR)
+        if len(fields) != self.nb_fields:
+            if record:
+                logging.debug('Ignoring record %s', record)
+            return None
+        self.nb_records += 1
+        if self.nb_records % LogReader.LOG_STEP == 0:
+            logging.info('Processing Commit: %d', self.nb_records)
+        return fields
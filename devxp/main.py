@@ -8,6 +8,10 @@ import logging
 import optparse
 import os
 
+import batch
+import periods
+import profiler
+import server
 import xpanalyser
 
 
@@ -19,6 +23,25 @@ def main():
         python main.py -r ../test/myvcsrepo -w ../output -d -o -a
         python main.py -r ../test/myvcsrepo -w ../output -d -a -v -c
         python main.py -r ../test/myvcsrepo -w ../output -p -i in_author.csv -a
+        python main.py -r ../test/myvcsrepo -w ../output -d -n -a
+        python main.py -r ../test/myvcsrepo -w ../output -b native -d -a
+        python main.py -r ../test/myvcsrepo -w ../output -d -a -g daily,weekly,monthly
+        python main.py -B ../test/allrepos -w ../output -j 8 -o -a
+        python main.py -r ../test/myvcsrepo -w ../output -d -k -l 2
+        python main.py -r ../test/myvcsrepo -w ../output -s src/core,src/ui
+        python main.py -r ../test/myvcsrepo -w ../output -d -u -o -a
+        python main.py -r ../test/myvcsrepo -w ../output -d -a -P profile.json -C devxp.prof
+        python main.py -r ../test/myvcsrepo -w ../output -q authors.txt -j 16
+        python main.py -r ../test/myvcsrepo -w ../output -d -n -a -S
+        python main.py -r ../test/myvcsrepo -w ../output -p -i in_author.csv -e 8080
+        python main.py -r ../test/myvcsrepo -w ../output -d -t 50000 -j 8 -a
+        python main.py -r ../test/myvcsrepo -w ../output -d -a -A -g monthly,quarterly
+        python main.py -r ../test/myvcsrepo -w ../output -d -u -D 180 -o -a
+        python main.py -r ../test/myvcsrepo -w ../output -d -D 90 -T 95 -o -a
+        python main.py -r ../test/myvcsrepo -w ../output -d -a -x tiers.json
+        python main.py -r ../test/myvcsrepo -w ../output -d -K -a
+        python main.py -r ../test/myvcsrepo -w ../output -d -O CODEOWNERS -g monthly,weekly
+        python main.py -r ../test/myvcsrepo -w ../output -R main,refs/heads/release/* -o -a
 
     :return: Nothing
     :rtype: None
@@ -30,11 +53,89 @@ def main():
                       dest="repo",
                       default=".",
                       help="Version control repository to analyse")
+    parser.add_option("-b", "--backend",
+                      action="store",
+                      dest="backend",
+                      type="choice",
+                      default="git",
+                      choices=["git", "native"],
+                      help="Backend used to read the repository: git command or "
+                           "native reading of the objects (git or native)")
+    parser.add_option("-B", "--batch",
+                      action="store",
+                      dest="batch",
+                      default=None,
+                      help="Analyse as a single project the repositories of a directory or "
+                           "listed in a file (one path per line)")
+    parser.add_option("-j", "--jobs",
+                      action="store",
+                      dest="jobs",
+                      type="int",
+                      default=None,
+                      help="Number of worker processes of the batch analyse or of the sharded "
+                           "scan, or of git queries running at the same time")
     parser.add_option("-d", "--date",
                       action="store_true",
                       dest="date",
                       default=False,
                       help="Retrieve commit date")
+    parser.add_option("-n", "--incremental",
+                      action="store_true",
+                      dest="incremental",
+                      default=False,
+                      help="Only process the commits added since the previous analysis")
+    parser.add_option("-R", "--refs",
+                      action="store",
+                      dest="refs",
+                      default=None,
+                      help="Comma separated list of references (or globs such as "
+                           "refs/heads/release/*) scanned with a single traversal instead of "
+                           "HEAD, each one also analysed in refs/<reference>")
+    parser.add_option("-t", "--shard",
+                      action="store",
+                      dest="shard",
+                      type="int",
+                      default=None,
+                      help="Scan the history in parallel shards of this number of "
+                           "first-parent commits, cached in the working directory")
+    parser.add_option("-K", "--cache",
+                      action="store_true",
+                      dest="cache",
+                      default=False,
+                      help="Cache the commits of the history in the working directory and "
+                           "read them back while HEAD has not moved")
+    parser.add_option("-q", "--queries",
+                      action="store",
+                      dest="queries",
+                      default=None,
+                      help="File of author filters (pattern;since;until per line) whose "
+                           "commits are retrieved with concurrent git queries")
+    parser.add_option("-u", "--unify",
+                      action="store_true",
+                      dest="unify",
+                      default=False,
+                      help="Merge automatically the authors with the same email, the same "
+                           "name or the same identity in the mailmap")
+    parser.add_option("-m", "--mailmap",
+                      action="store",
+                      dest="mailmap",
+                      default=None,
+                      help="Mailmap file used to merge the authors, .mailmap of the "
+                           "repository by default")
+    parser.add_option("-D", "--departure",
+                      action="store",
+                      dest="departure",
+                      type="int",
+                      default=None,
+                      help="Mark as departed the developers without commit for this number of "
+                           "days before the last commit of the repository")
+    parser.add_option("-T", "--cadence",
+                      action="store",
+                      dest="cadence",
+                      type="float",
+                      default=None,
+                      help="Mark as departed the developers without commit for longer than this "
+                           "percentile of the gaps between their commits (at least -D days)")
     parser.add_option("-o", "--out",
                       action="store_true",
                       dest="out",
@@ -55,6 +156,73 @@ def main():
                       dest="analyse",
                       default=False,
                       help="Launch analyse")
+    parser.add_option("-A", "--activity",
+                      action="store_true",
+                      dest="activity",
+                      default=False,
+                      help="Compute also the developers active in the last 30, 90 and 365 "
+                           "days, the joins, the leaves and the turnover of each period")
+    parser.add_option("-x", "--tiers",
+                      action="store",
+                      dest="tiers",
+                      default=None,
+                      help="JSON file of the tiers of experience (name and minimal number of "
+                           "days of each tier), junior, advanced and senior by default")
+    parser.add_option("-g", "--granularity",
+                      action="store",
+                      dest="granularity",
+                      default="monthly",
+                      help="Comma separated list of time steps of the analyse: daily, weekly, "
+                           "monthly, quarterly or a number of days, weeks, months or quarters "
+                           "such as 10d, 2w, 6m, 2q")
+    parser.add_option("-k", "--knowledge",
+                      action="store_true",
+                      dest="knowledge",
+                      default=False,
+                      help="Scan the changes of the files to compute the experience per "
+                           "directory")
+    parser.add_option("-s", "--subtree",
+                      action="store",
+                      dest="subtree",
+                      default=None,
+                      help="Comma separated list of directories whose experience is computed "
+                           "from the knowledge map of a previous scan (-k)")
+    parser.add_option("-O", "--owners",
+                      action="store",
+                      dest="owners",
+                      default=None,
+                      help="CODEOWNERS-like file of the sub-trees whose experience is computed "
+                           "with a single scan of the history, one CSV file per sub-tree")
+    parser.add_option("-l", "--depth",
+                      action="store",
+                      dest="depth",
+                      type="int",
+                      default=1,
+                      help="Maximal depth of the directories of the knowledge map")
+    parser.add_option("-S", "--store",
+                      action="store_true",
+                      dest="store",
+                      default=False,
+                      help="Also store the commits, the developers and the experience in the "
+                           "SQLite database devxp.sqlite of the working directory")
+    parser.add_option("-P", "--profile",
+                      action="store",
+                      dest="profile",
+                      default=None,
+                      help="JSON file of the wall time, CPU time, number of subprocesses, "
+                           "bytes read, records and increase of the peak RSS of each stage")
+    parser.add_option("-C", "--cprofile",
+                      action="store",
+                      dest="cprofile",
+                      default=None,
+                      help="File of the cProfile statistics of the run")
+    parser.add_option("-e", "--serve",
+                      action="store",
+                      dest="serve",
+                      type="int",
+                      default=None,
+                      help="Keep the analysis in memory and answer JSON queries on this port "
+                           "of the local host, the analysis is refreshed when HEAD moves")
     parser.add_option("-w", "--workdir",
                       action="store",
                       dest="workdir",
@@ -91,18 +259,92 @@ def main():
     logger.addHandler(console_handler)
 
     logging.info('\n\n\nNew run with options: %s and args: %s', options, args)
+    if options.serve is not None:
+        if options.batch is not None or options.refs is not None or \
+                options.shard is not None or options.queries is not None:
+            raise RuntimeError('The service mode (-e) only analyses HEAD of one repository, '
+                               'it does not support -B, -R, -t and -q.')
+        service = server.ExperienceService(options.repo, options.workdir, options.backend,
+                                           options.in_csv if options.parse else None,
+                                           options.unify, options.mailmap,
+                                           tiers_path=options.tiers,
+                                           departure=options.departure,
+                                           cadence=options.cadence, cache=options.cache)
+        service.refresh()
+        httpd = server.create_server(service, options.serve)
+        logging.info('Serving %s on port %d', options.repo, httpd.server_address[1])
+        try:
+            httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        httpd.server_close()
+        return
     # Check consistency
-    if not options.date and not options.parse:
+    if not options.date and not options.parse and options.batch is None and \
+            not options.knowledge and options.subtree is None and options.queries is None and \
+            options.owners is None and options.refs is None:
         raise RuntimeError('Users must use at least one option:'
                            'date retrieving (-d) or date parsing (-p).')
-    xp_analyser = xpanalyser.XPAnalyser(options.repo, options.workdir)
-    xp_analyser.retrieve_author_information_from_repo(options.date)
+    if options.batch is not None and (options.shard is not None or options.cache or
+                                      options.incremental or options.refs is not None):
+        raise RuntimeError('The batch mode (-B) scans the full history of HEAD of each '
+                           'repository, it does not support -t, -K, -n and -R.')
+    granularities = periods.Granularity.parse_list(options.granularity)
+    if options.profile is not None or options.cprofile is not None:
+        profiler.PROFILER.enable(options.cprofile is not None)
+    if options.batch is not None:
+        batch_analyser = batch.BatchAnalyser(options.batch, options.workdir, options.backend,
+                                             options.jobs)
+        if options.activity or options.cadence is not None:
+            batch_analyser.keep_commit_days()
+        xp_analyser = batch_analyser.retrieve_author_information()
+        if options.store:
+            xp_analyser.open_store()
+    else:
+        xp_analyser = xpanalyser.XPAnalyser(options.repo, options.workdir, options.backend)
+        if options.store:
+            xp_analyser.open_store()
+        if options.shard is not None:
+            xp_analyser.set_sharding(options.shard, options.jobs)
+        if options.cache:
+            xp_analyser.enable_commit_cache()
+        if options.activity or options.cadence is not None:
+            xp_analyser.keep_commit_days()
+        if options.refs is not None:
+            xp_analyser.retrieve_author_information_from_refs(options.refs.split(','))
+        elif options.date or options.parse:
+            xp_analyser.retrieve_author_information_from_repo(options.date, options.incremental)
+    if options.tiers is not None:
+        xp_analyser.load_tiers(options.tiers)
+    if options.queries is not None:
+        xp_analyser.query_authors(options.queries, options.jobs)
+    if options.unify:
+        xp_analyser.resolve_identities(options.mailmap)
+    if options.departure is not None or options.cadence is not None:
+        xp_analyser.detect_departures(options.departure or 0, options.cadence)
     if options.out:
         xp_analyser.save_author_information_in_csv()
     if options.parse:
         xp_analyser.get_author_information_from_csv(options.in_csv)
+    if options.store:
+        xp_analyser.save_developers_in_store()
     if options.analyse:
-        xp_analyser.compute_experience()
+        xp_analyser.compute_experience(granularities)
+    if options.activity:
+        xp_analyser.compute_activity(granularities)
+    if options.refs is not None and options.batch is None:
+        xp_analyser.compute_refs(granularities)
+    if options.knowledge or options.subtree is not None:
+        subtrees = None if options.subtree is None else options.subtree.split(',')
+        xp_analyser.compute_knowledge_map(subtrees, options.depth, granularities[0],
+                                          options.knowledge)
+    if options.owners is not None:
+        xp_analyser.compute_subtrees(options.owners, granularities)
+    profiler.PROFILER.disable()
+    if options.profile is not None:
+        profiler.PROFILER.save_report(options.profile)
+    if options.cprofile is not None:
+        profiler.PROFILER.save_cprofile(options.cprofile)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,829 @@
+"""
+Module for class NativeGitBackend
+Read the objects of a Git repository without launching the git command.
+"""
+
+import collections
+import datetime
+import fnmatch
+import glob
+import heapq
+import logging
+import mmap
+import os
+import struct
+import zlib
+
+
+def read_mapped_file(path):
+    """
+    Map a file in memory in read-only mode
+
+    :param path: Path of the file
+    :type path: str
+    :return: Content of the file
+    :rtype: mmap.mmap
+    """
+    with open(path, mode='rb') as mapped_file:
+        return mmap.mmap(mapped_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def apply_delta(base, delta):
+    """
+    Rebuild an object from its base and a delta of a pack file
+
+    :param base: Content of the base object
+    :type base: bytes
+    :param delta: Delta instructions
+    :type delta: bytes
+    :return: Content of the object
+    :rtype: bytes
+    """
+    pos = 0
+    # Skip the sizes of the source and of the target
+    for _ in range(2):
+        while delta[pos] & 0x80:
+            pos += 1
+        pos += 1
+    result = bytearray()
+    delta_len = len(delta)
+    while pos < delta_len:
+        opcode = delta[pos]
+        pos += 1
+        if opcode & 0x80:
+            copy_offset = 0
+            copy_size = 0
+            for idx in range(4):
+                if opcode & (1 << idx):
+                    copy_offset |= delta[pos] << (8 * idx)
+                    pos += 1
+            for idx in range(3):
+                if opcode & (0x10 << idx):
+                    copy_size |= delta[pos] << (8 * idx)
+                    pos += 1
+            if copy_size == 0:
+                copy_size = 0x10000
+            result += base[copy_offset:copy_offset + copy_size]
+        elif opcode:
+            result += delta[pos:pos + opcode]
+            pos += opcode
+        else:
+            raise ValueError('Invalid delta opcode')
+    return bytes(result)
+
+
+class PackFile:
+    """
+    Class giving access to the objects of a pack file through its index (version 2)
+    """
+
+    IDX_SIGNATURE = b'\377tOc'
+    OFS_DELTA = 6
+    REF_DELTA = 7
+    CACHE_SIZE = 512
+
+    def __init__(self, idx_path):
+        """
+        Open a pack file and its index
+
+        :param idx_path: Path of the index of the pack (.idx)
+        :type idx_path: str
+        """
+        self.idx = read_mapped_file(idx_path)
+        self.pack = read_mapped_file(idx_path[:-len('.idx')] + '.pack')
+        if self.idx[:4] != PackFile.IDX_SIGNATURE or struct.unpack_from('>I', self.idx, 4)[0] != 2:
+            raise ValueError('Unsupported pack index {0}'.format(idx_path))
+        self.fanout = struct.unpack_from('>256I', self.idx, 8)
+        nb_objects = self.fanout[255]
+        self.sha_table = 8 + 256 * 4
+        self.offset_table = self.sha_table + 24 * nb_objects
+        self.large_offset_table = self.offset_table + 4 * nb_objects
+        self.cache = collections.OrderedDict()
+
+    def find(self, sha):
+        """
+        Find the offset of an object in the pack
+
+        :param sha: Binary SHA of the object
+        :type sha: bytes
+        :return: Offset of the object or None if it is not in the pack
+        :rtype: int
+        """
+        low = self.fanout[sha[0] - 1] if sha[0] else 0
+        high = self.fanout[sha[0]]
+        while low < high:
+            mid = (low + high) // 2
+            pos = self.sha_table + 20 * mid
+            mid_sha = self.idx[pos:pos + 20]
+            if mid_sha < sha:
+                low = mid + 1
+            elif mid_sha > sha:
+                high = mid
+            else:
+                offset = struct.unpack_from('>I', self.idx, self.offset_table + 4 * mid)[0]
+                if offset & 0x80000000:
+                    offset = struct.unpack_from(
+                        '>Q', self.idx, self.large_offset_table + 8 * (offset & 0x7fffffff))[0]
+                return offset
+        return None
+
+    def read(self, offset, object_reader):
+        """
+        Read an object of the pack, resolving the deltas
+
+        :param offset: Offset of the object in the pack
+        :type offset: int
+        :param object_reader: Function giving the type and the content of an object
+                              from its SHA, used for the deltas referencing another pack
+        :type object_reader: function
+        :return: Type and content of the object
+        :rtype: str, bytes
+        """
+        deltas = []
+        while True:
+            cached = self.cache.get(offset)
+            if cached is not None:
+                self.cache.move_to_end(offset)
+                obj_type, data = cached
+                break
+            obj_type, size, pos = self.read_header(offset)
+            if obj_type == PackFile.OFS_DELTA:
+                byte = self.pack[pos]
+                pos += 1
+                base_offset = byte & 0x7f
+                while byte & 0x80:
+                    byte = self.pack[pos]
+                    pos += 1
+                    base_offset = ((base_offset + 1) << 7) | (byte & 0x7f)
+                deltas.append((offset, pos, size))
+                offset -= base_offset
+            elif obj_type == PackFile.REF_DELTA:
+                base_sha = self.pack[pos:pos + 20]
+                deltas.append((offset, pos + 20, size))
+                obj_type, data = object_reader(base_sha)
+                break
+            else:
+                obj_type = NativeGitBackend.OBJECT_TYPES[obj_type]
+                data = self.inflate(pos, size)
+                self.store(offset, obj_type, data)
+                break
+        for delta_offset, pos, size in reversed(deltas):
+            data = apply_delta(data, self.inflate(pos, size))
+            self.store(delta_offset, obj_type, data)
+        return obj_type, data
+
+    def read_header(self, offset):
+        """
+        Read the header of an object of the pack
+
+        :param offset: Offset of the object in the pack
+        :type offset: int
+        :return: Type number, size and position of the data of the object
+        :rtype: int, int, int
+        """
+        byte = self.pack[offset]
+        obj_type = (byte >> 4) & 0x7
+        size = byte & 0xf
+        shift = 4
+        pos = offset + 1
+        while byte & 0x80:
+            byte = self.pack[pos]
+            pos += 1
+            size |= (byte & 0x7f) << shift
+            shift += 7
+        return obj_type, size, pos
+
+    def inflate(self, pos, size):
+        """
+        Decompress the data of an object
+
+        :param pos: Position of the compressed data in the pack
+        :type pos: int
+        :param size: Size of the decompressed data
+        :type size: int
+        :return: Decompressed data
+        :rtype: bytes
+        """
+        decompressor = zlib.decompressobj()
+        step = size + 64
+        chunks = []
+        while not decompressor.eof:
+            chunk = self.pack[pos:pos + step]
+            if not chunk:
+                raise ValueError('Truncated object in pack')
+            chunks.append(decompressor.decompress(chunk))
+            pos += step
+        return b''.join(chunks)
+
+    def store(self, offset, obj_type, data):
+        """
+        Keep an object in the cache since it can be the base of other deltas
+
+        :param offset: Offset of the object in the pack
+        :type offset: int
+        :param obj_type: Type of the object
+        :type obj_type: str
+        :param data: Content of the object
+        :type data: bytes
+        """
+        self.cache[offset] = (obj_type, data)
+        if len(self.cache) > PackFile.CACHE_SIZE:
+            self.cache.popitem(last=False)
+
+
+class CommitGraph:
+    """
+    Class giving access to the commit-graph file of a repository
+    """
+
+    SIGNATURE = b'CGPH'
+    NO_PARENT = 0x70000000
+    EXTRA_EDGE = 0x80000000
+    ENTRY_SIZE = 36
+
+    def __init__(self, path):
+        """
+        Open a commit-graph file
+
+        :param path: Path of the commit-graph file
+        :type path: str
+        """
+        self.data = read_mapped_file(path)
+        signature, version, hash_version, nb_chunks, nb_bases = \
+            struct.unpack_from('>4sBBBB', self.data, 0)
+        if signature != CommitGraph.SIGNATURE or version != 1 or hash_version != 1 or nb_bases:
+            raise ValueError('Unsupported commit-graph {0}'.format(path))
+        chunks = {}
+        for idx in range(nb_chunks):
+            chunk_id, offset = struct.unpack_from('>4sQ', self.data, 8 + 12 * idx)
+            chunks[chunk_id] = offset
+        self.fanout = struct.unpack_from('>256I', self.data, chunks[b'OIDF'])
+        self.oid_table = chunks[b'OIDL']
+        self.commit_table = chunks[b'CDAT']
+        self.edge_table = chunks.get(b'EDGE')
+
+    def find(self, sha):
+        """
+        Find the position of a commit in the graph
+
+        :param sha: Binary SHA of the commit
+        :type sha: bytes
+        :return: Position of the commit or None if it is not in the graph
+        :rtype: int
+        """
+        low = self.fanout[sha[0] - 1] if sha[0] else 0
+        high = self.fanout[sha[0]]
+        while low < high:
+            mid = (low + high) // 2
+            pos = self.oid_table + 20 * mid
+            mid_sha = self.data[pos:pos + 20]
+            if mid_sha < sha:
+                low = mid + 1
+            elif mid_sha > sha:
+                high = mid
+            else:
+                return mid
+        return None
+
+    def get_sha(self, position):
+        """
+        Get the SHA of the commit at a position of the graph
+
+        :param position: Position of the commit
+        :type position: int
+        :return: Binary SHA of the commit
+        :rtype: bytes
+        """
+        pos = self.oid_table + 20 * position
+        return self.data[pos:pos + 20]
+
+    def get_commit(self, position):
+        """
+        Get the parents, the generation number and the commit time of a commit
+
+        :param position: Position of the commit
+        :type position: int
+        :return: Binary SHA of the parents, generation number and commit timestamp
+        :rtype: list(bytes), int, int
+        """
+        parent1, parent2, word1, word2 = struct.unpack_from(
+            '>IIII', self.data, self.commit_table + CommitGraph.ENTRY_SIZE * position + 20)
+        parents = []
+        if parent1 != CommitGraph.NO_PARENT:
+            parents.append(self.get_sha(parent1))
+        if parent2 & CommitGraph.EXTRA_EDGE:
+            edge = parent2 & ~CommitGraph.EXTRA_EDGE
+            while True:
+                value = struct.unpack_from('>I', self.data, self.edge_table + 4 * edge)[0]
+                parents.append(self.get_sha(value & ~CommitGraph.EXTRA_EDGE))
+                if value & CommitGraph.EXTRA_EDGE:
+                    break
+                edge += 1
+        elif parent2 != CommitGraph.NO_PARENT:
+            parents.append(self.get_sha(parent2))
+        return parents, word1 >> 2, ((word1 & 0x3) << 32) | word2
+
+
+class NativeGitBackend:
+    """
+    Class which queries a Git repository by reading directly its objects (loose objects,
+    pack files and commit-graph) with the standard library only
+    """
+
+    OBJECT_TYPES = {1: 'commit', 2: 'tree', 3: 'blob', 4: 'tag'}
+    MAX_SYMREF_DEPTH = 10
+    # Number of hidden commits walked after the interesting ones seem unreachable, as git
+    # does, since the commit dates may be out of order
+    SLOP = 5
+
+    def __init__(self, vcs_path):
+        """
+        Give access to the history of a Git repository without the git command
+
+        :param vcs_path: Path to the Git repository
+        :type vcs_path: str
+        """
+        self.vcs_path = vcs_path
+        self.git_dir = os.path.join(vcs_path, '.git')
+        if os.path.isfile(self.git_dir):
+            # Worktree or submodule: .git is a file pointing to the real directory
+            with open(self.git_dir, mode='r', encoding='UTF-8') as git_file:
+                self.git_dir = os.path.join(vcs_path, git_file.read().split(':', 1)[1].strip())
+        self.common_dir = self.git_dir
+        commondir_path = os.path.join(self.git_dir, 'commondir')
+        if os.path.isfile(commondir_path):
+            with open(commondir_path, mode='r', encoding='UTF-8') as commondir_file:
+                self.common_dir = os.path.join(self.git_dir, commondir_file.read().strip())
+        self.objects_dir = os.path.join(self.common_dir, 'objects')
+        self.packs = []
+        for idx_path in sorted(glob.glob(os.path.join(self.objects_dir, 'pack', '*.idx'))):
+            self.packs.append(PackFile(idx_path))
+        self.commit_graph = None
+        graph_path = os.path.join(self.objects_dir, 'info', 'commit-graph')
+        if os.path.isfile(graph_path):
+            try:
+                self.commit_graph = CommitGraph(graph_path)
+            except (ValueError, KeyError, struct.error) as exc:
+                logging.warning('Commit-graph ignored: %s', exc)
+        self.timezones = {}
+        # Commits of a shallow clone whose parents are not in the repository
+        self.shallow = set()
+        shallow_path = os.path.join(self.common_dir, 'shallow')
+        if os.path.isfile(shallow_path):
+            with open(shallow_path, mode='r', encoding='UTF-8') as shallow_file:
+                self.shallow = {bytes.fromhex(x) for x in shallow_file.read().split()}
+        logging.info('Native access to %s - Nb Packs: %d - Commit-graph: %s', self.git_dir,
+                     len(self.packs), self.commit_graph is not None)
+
+    def read_object(self, sha):
+        """
+        Read an object of the repository
+
+        :param sha: Binary SHA of the object
+        :type sha: bytes
+        :return: Type and content of the object
+        :rtype: str, bytes
+        """
+        for pack in self.packs:
+            offset = pack.find(sha)
+            if offset is not None:
+                return pack.read(offset, self.read_object)
+        hex_sha = sha.hex()
+        try:
+            with open(os.path.join(self.objects_dir, hex_sha[:2], hex_sha[2:]),
+                      mode='rb') as object_file:
+                raw = zlib.decompress(object_file.read())
+        except FileNotFoundError:
+            raise KeyError('Unknown object {0}'.format(hex_sha)) from None
+        header_end = raw.index(b'\0')
+        return raw[:header_end].split(b' ')[0].decode('ascii'), raw[header_end + 1:]
+
+    def read_ref(self, name):
+        """
+        Read a reference, loose or packed
+
+        :param name: Full name of the reference such as HEAD or refs/heads/master
+        :type name: str
+        :return: Content of the reference (SHA or 'ref: <target>') or None if it does not exist
+        :rtype: str
+        """
+        for base_dir in (self.git_dir, self.common_dir):
+            ref_path = os.path.join(base_dir, name)
+            if os.path.isfile(ref_path):
+                with open(ref_path, mode='r', encoding='UTF-8') as ref_file:
+                    return ref_file.read().strip()
+        packed_refs_path = os.path.join(self.common_dir, 'packed-refs')
+        if os.path.isfile(packed_refs_path):
+            with open(packed_refs_path, mode='r', encoding='UTF-8') as packed_refs:
+                for line in packed_refs:
+                    data = line.split()
+                    if len(data) == 2 and data[1] == name:
+                        return data[0]
+        return None
+
+    def resolve(self, rev):
+        """
+        Get the commit designated by a revision: a SHA, HEAD or a reference name
+
+        :param rev: Revision to resolve
+        :type rev: str
+        :return: Binary SHA of the commit or None if the revision does not exist
+        :rtype: bytes
+        """
+        if len(rev) == 40:
+            try:
+                return self.peel(bytes.fromhex(rev))
+            except ValueError:
+                pass
+        candidates = [rev] if rev == 'HEAD' or rev.startswith('refs/') else \
+            ['refs/' + rev, 'refs/tags/' + rev, 'refs/heads/' + rev]
+        for name in candidates:
+            for _ in range(NativeGitBackend.MAX_SYMREF_DEPTH):
+                value = self.read_ref(name)
+                if value is None or not value.startswith('ref:'):
+                    break
+                name = value[len('ref:'):].strip()
+            if value is not None:
+                return self.peel(bytes.fromhex(value))
+        return None
+
+    def peel(self, sha):
+        """
+        Follow the annotated tags until a commit
+
+        :param sha: Binary SHA of an object
+        :type sha: bytes
+        :return: Binary SHA of the commit
+        :rtype: bytes
+        """
+        obj_type, data = self.read_object(sha)
+        while obj_type == 'tag':
+            sha = bytes.fromhex(data[len(b'object '):len(b'object ') + 40].decode('ascii'))
+            obj_type, data = self.read_object(sha)
+        return sha
+
+    def read_commit(self, sha):
+        """
+        Read the header of a commit, the commits at the boundary of a shallow clone do not
+        have parents
+
+        :param sha: Binary SHA of the commit
+        :type sha: bytes
+        :return: Binary SHA of the parents, commit timestamp and author line
+        :rtype: list(bytes), int, bytes
+        """
+        data = self.read_object(sha)[1]
+        parents = []
+        author = b''
+        commit_time = 0
+        for line in data[:data.find(b'\n\n')].split(b'\n'):
+            if line.startswith(b'parent '):
+                parents.append(bytes.fromhex(line[7:47].decode('ascii')))
+            elif line.startswith(b'author '):
+                author = line
+            elif line.startswith(b'committer '):
+                commit_time = int(line[line.rindex(b'>') + 1:].split()[0])
+        if sha in self.shallow:
+            parents = []
+        return parents, commit_time, author
+
+    def get_parents(self, sha):
+        """
+        Get the parents and the commit time of a commit, from the commit-graph if possible
+
+        :param sha: Binary SHA of the commit
+        :type sha: bytes
+        :return: Binary SHA of the parents and commit timestamp
+        :rtype: list(bytes), int
+        """
+        if self.commit_graph is not None:
+            position = self.commit_graph.find(sha)
+            if position is not None:
+                parents, _, commit_time = self.commit_graph.get_commit(position)
+                return parents if sha not in self.shallow else [], commit_time
+        parents, commit_time, _ = self.read_commit(sha)
+        return parents, commit_time
+
+    def retrieve_head(self):
+        """
+        Get the identifier of the commit currently checked out
+
+        :return: SHA of HEAD or None if the repository does not have any commit
+        :rtype: str
+        """
+        try:
+            head = self.resolve('HEAD')
+        except KeyError:
+            head = None
+        if head is None:
+            logging.warning('No HEAD found in %s', self.vcs_path)
+            return None
+        return head.hex()
+
+    def is_ancestor(self, ancestor, commit):
+        """
+        Tell if a commit is an ancestor of another one. The generation numbers of the
+        commit-graph are used to stop the walk early.
+
+        :param ancestor: SHA of the possible ancestor
+        :type ancestor: str
+        :param commit: SHA of the descendant
+        :type commit: str
+        :return: Boolean telling if ancestor is reachable from commit
+        :rtype: bool
+        """
+        try:
+            target = self.resolve(ancestor)
+            start = self.resolve(commit)
+        except KeyError:
+            return False
+        if target is None or start is None:
+            return False
+        min_generation = 0
+        if self.commit_graph is not None:
+            position = self.commit_graph.find(target)
+            if position is not None:
+                min_generation = self.commit_graph.get_commit(position)[1]
+        seen = {start}
+        to_visit = [start]
+        while to_visit:
+            sha = to_visit.pop()
+            if sha == target:
+                return True
+            position = None if self.commit_graph is None else self.commit_graph.find(sha)
+            if position is not None:
+                parents, generation, _ = self.commit_graph.get_commit(position)
+                if sha in self.shallow:
+                    parents = []
+                if generation <= min_generation:
+                    # A commit cannot reach a commit of greater or equal generation
+                    continue
+            else:
+                parents = self.read_commit(sha)[0]
+            for parent in parents:
+                if parent not in seen:
+                    seen.add(parent)
+                    to_visit.append(parent)
+        return False
+
+    def list_first_parents(self, rev='HEAD'):
+        """
+        Get the commits of the first-parent chain of a revision
+
+        :param rev: Revision whose chain is listed
+        :type rev: str
+        :return: SHA of the commits from the root to the revision
+        :rtype: list(str)
+        """
+        sha = self.resolve(rev)
+        if sha is None:
+            raise ValueError('Unknown revision {0}'.format(rev))
+        chain = []
+        while sha is not None:
+            chain.append(sha.hex())
+            parents = self.get_parents(sha)[0]
+            sha = parents[0] if parents else None
+        chain.reverse()
+        return chain
+
+    def list_refs(self, patterns):
+        """
+        Get the references matching patterns, such as refs/heads/release/*. As with
+        git for-each-ref, a pattern matches with a glob or up to a slash (see match_ref).
+
+        :param patterns: Patterns of the references
+        :type patterns: list(str)
+        :return: Name and SHA of the commit of each reference, sorted by name
+        :rtype: list(tuple(str, str))
+        """
+        names = set()
+        refs_dir = os.path.join(self.common_dir, 'refs')
+        for dir_path, _, filenames in os.walk(refs_dir):
+            for filename in filenames:
+                names.add('refs/' + os.path.relpath(os.path.join(dir_path, filename),
+                                                    refs_dir).replace(os.path.sep, '/'))
+        packed_refs_path = os.path.join(self.common_dir, 'packed-refs')
+        if os.path.isfile(packed_refs_path):
+            with open(packed_refs_path, mode='r', encoding='UTF-8') as packed_refs:
+                for line in packed_refs:
+                    data = line.split()
+                    if len(data) == 2 and data[1].startswith('refs/'):
+                        names.add(data[1])
+        refs = []
+        for name in sorted(names):
+            if not any(NativeGitBackend.match_ref(name, x) for x in patterns):
+                continue
+            sha = self.resolve(name)
+            if sha is not None and self.read_object(sha)[0] == 'commit':
+                refs.append((name, sha.hex()))
+        return refs
+
+    @staticmethod
+    def match_ref(name, pattern):
+        """
+        Tell if a reference matches a pattern: literally, up to a slash, or with a glob
+        whose wildcards do not match the slashes
+
+        :param name: Full name of the reference such as refs/heads/release/1.0
+        :type name: str
+        :param pattern: Pattern such as refs/heads/release/* or refs/heads
+        :type pattern: str
+        :return: Boolean telling if the reference matches
+        :rtype: bool
+        """
+        pattern = pattern.rstrip('/')
+        if name == pattern or name.startswith(pattern + '/'):
+            return True
+        name_parts = name.split('/')
+        pattern_parts = pattern.split('/')
+        return len(name_parts) == len(pattern_parts) and \
+            all(fnmatch.fnmatchcase(x, y) for x, y in zip(name_parts, pattern_parts))
+
+    def iter_graph(self, revs):
+        """
+        Walk once the commits reachable from several revisions, each commit being given
+        before its parents. The commits whose children have all been given are walked by
+        decreasing commit time.
+
+        :param revs: SHA of the revisions
+        :type revs: list(str)
+        :return: Generator of the SHA, SHA of the parents, name, email and author date
+                 (ISO 8601) of each commit
+        :rtype: generator(tuple(str, list(str), str, str, str))
+        """
+        starts = [bytes.fromhex(x) for x in revs]
+        # Number of children of each reachable commit
+        nb_children = {}
+        commit_times = {}
+        to_visit = []
+        for sha in starts:
+            if sha not in nb_children:
+                nb_children[sha] = 0
+                to_visit.append(sha)
+        while to_visit:
+            sha = to_visit.pop()
+            parents, commit_times[sha] = self.get_parents(sha)
+            for parent in parents:
+                if parent in nb_children:
+                    nb_children[parent] += 1
+                else:
+                    nb_children[parent] = 1
+                    to_visit.append(parent)
+        heap = [(-commit_times[x], x) for x in nb_children if nb_children[x] == 0]
+        heapq.heapify(heap)
+        while heap:
+            sha = heapq.heappop(heap)[1]
+            parents, _, author = self.read_commit(sha)
+            for parent in parents:
+                nb_children[parent] -= 1
+                if nb_children[parent] == 0:
+                    heapq.heappush(heap, (-commit_times[parent], parent))
+            lower = author.index(b'<')
+            upper = author.index(b'>', lower)
+            timestamp, offset = author[upper + 1:].split()[:2]
+            yield (sha.hex(), [x.hex() for x in parents],
+                   author[len(b'author '):lower - 1].decode('utf-8', errors='replace'),
+                   author[lower + 1:upper].decode('utf-8', errors='replace'),
+                   self.format_date(int(timestamp), offset))
+
+    def format_date(self, timestamp, offset):
+        """
+        Convert a Git date in the ISO 8601 format, in the timezone of the author
+
+        :param timestamp: Number of seconds since epoch
+        :type timestamp: int
+        :param offset: Timezone offset such as +0200
+        :type offset: bytes
+        :return: Date with the ISO 8601 format
+        :rtype: str
+        """
+        timezone = self.timezones.get(offset)
+        if timezone is None:
+            minutes = int(offset[1:3]) * 60 + int(offset[3:5])
+            if offset[:1] == b'-':
+                minutes = -minutes
+            timezone = datetime.timezone(datetime.timedelta(minutes=minutes))
+            self.timezones[offset] = timezone
+        return datetime.datetime.fromtimestamp(timestamp, timezone).isoformat()
+
+    def iter_commits(self, rev_range=''):
+        """
+        Walk the commits of the history from the most recent commit date to the oldest one
+
+        :param rev_range: Range of commits to walk: '', '<rev>' or '<rev>..<rev>'.
+                          All the history of HEAD by default
+        :type rev_range: str
+        :return: Generator of the name, email and author date (ISO 8601) of each commit
+        :rtype: generator(list(str))
+        """
+        rev_range = rev_range.strip()
+        excluded = []
+        if '..' in rev_range:
+            exclude_rev, include_rev = rev_range.split('..', 1)
+            excluded.append(exclude_rev or 'HEAD')
+        else:
+            include_rev = rev_range
+        include_rev = include_rev or 'HEAD'
+        hidden = []
+        for rev in excluded:
+            sha = self.resolve(rev)
+            if sha is None:
+                raise ValueError('Unknown revision {0}'.format(rev))
+            hidden.append(sha)
+        start = self.resolve(include_rev)
+        if start is None:
+            logging.warning('Unknown revision %s', include_rev)
+            return
+        nb_commits = 0
+        for author in self.walk(start, hidden):
+            lower = author.index(b'<')
+            upper = author.index(b'>', lower)
+            timestamp, offset = author[upper + 1:].split()[:2]
+            nb_commits += 1
+            yield [author[len(b'author '):lower - 1].decode('utf-8', errors='replace'),
+                   author[lower + 1:upper].decode('utf-8', errors='replace'),
+                   self.format_date(int(timestamp), offset)]
+        logging.info('End of walk - Nb Commits: %d', nb_commits)
+
+    def walk(self, start, hidden):
+        """
+        Walk the commits reachable from a commit but not from the hidden ones, by
+        decreasing commit time. When there are hidden commits, the interesting commits
+        are only given once the hidden walk cannot reach them anymore: the hidden walk goes
+        on for SLOP commits older than the interesting ones.
+
+        :param start: Binary SHA of the commit to start from
+        :type start: bytes
+        :param hidden: Binary SHA of the commits whose ancestors are excluded
+        :type hidden: list(bytes)
+        :return: Generator of the author line of each commit
+        :rtype: generator(bytes)
+        """
+        hidden_flags = {}
+        queued = set()
+        heap = []
+        popped_parents = {}
+        candidates = []
+        state = {'nb_interesting': 0, 'last_time': None}
+
+        def push(sha, is_hidden):
+            current = hidden_flags.get(sha)
+            if current is None:
+                hidden_flags[sha] = is_hidden
+                queued.add(sha)
+                if is_hidden:
+                    author = None
+                    parents, commit_time = self.get_parents(sha)
+                else:
+                    state['nb_interesting'] += 1
+                    parents, commit_time, author = self.read_commit(sha)
+                heapq.heappush(heap, (-commit_time, sha, parents, author))
+            elif is_hidden and not current:
+                # Propagate the exclusion to the commits already walked as interesting
+                to_hide = [sha]
+                while to_hide:
+                    sha = to_hide.pop()
+                    if hidden_flags.get(sha, True):
+                        if sha not in hidden_flags:
+                            push(sha, True)
+                        continue
+                    hidden_flags[sha] = True
+                    if sha in queued:
+                        state['nb_interesting'] -= 1
+                    else:
+                        to_hide.extend(popped_parents.get(sha, ()))
+
+        for sha in hidden:
+            push(sha, True)
+        push(start, False)
+        slop = NativeGitBackend.SLOP
+        while heap:
+            if state['nb_interesting'] == 0:
+                if not hidden or state['last_time'] is None:
+                    break
+                if -heap[0][0] < state['last_time']:
+                    # No hidden commit can reach the interesting ones anymore, unless the
+                    # dates are skewed
+                    slop -= 1
+                    if slop == 0:
+                        break
+                else:
+                    slop = NativeGitBackend.SLOP
+            else:
+                slop = NativeGitBackend.SLOP
+            commit_time, sha, parents, author = heapq.heappop(heap)
+            queued.discard(sha)
+            is_hidden = hidden_flags[sha]
+            if not is_hidden:
+                state['nb_interesting'] -= 1
+                if hidden:
+                    state['last_time'] = -commit_time
+                    popped_parents[sha] = parents
+                    candidates.append((sha, author))
+                else:
+                    yield author
+            for parent in parents:
+                push(parent, is_hidden)
+        for sha, author in candidates:
+            if not hidden_flags[sha]:
+                yield author
@@ -0,0 +1,130 @@
+"""
+Module for class Granularity
+"""
+
+import datetime
+import re
+
+
+class Granularity:
+    """
+    Class describing the time step between two dates of an analysis
+    """
+
+    DAY = 'd'
+    WEEK = 'w'
+    MONTH = 'm'
+    QUARTER = 'q'
+
+    NAMES = {'daily': (1, DAY), 'weekly': (1, WEEK), 'monthly': (1, MONTH),
+             'quarterly': (1, QUARTER)}
+    CUSTOM_PATTERN = re.compile(r'^(\d+)([dwmq])$')
+
+    def __init__(self, spec):
+        """
+        Describe a time step from its specification: daily, weekly, monthly, quarterly or
+        a custom period such as 10d, 2w, 6m or 2q (number of days, weeks, months or quarters)
+
+        :param spec: Specification of the granularity
+        :type spec: str
+        """
+        self.name = spec.strip().lower()
+        if self.name in Granularity.NAMES:
+            self.step, self.unit = Granularity.NAMES[self.name]
+        else:
+            match = Granularity.CUSTOM_PATTERN.match(self.name)
+            if match is None or int(match.group(1)) == 0:
+                raise ValueError('Unknown granularity {0}'.format(spec))
+            self.step = int(match.group(1))
+            self.unit = match.group(2)
+
+    @staticmethod
+    def parse_list(specs):
+        """
+        Get the granularities of a comma separated list of specifications
+
+        :param specs: Specifications such as 'daily,monthly'
+        :type specs: str
+        :return: List of granularities without duplicate
+        :rtype: list(Granularity)
+        """
+        granularities = []
+        for spec in specs.split(','):
+            if spec.strip() and spec.strip().lower() not in [x.name for x in granularities]:
+                granularities.append(Granularity(spec))
+        return granularities
+
+    @staticmethod
+    def add_months(date, nb_month):
+        """
+        Pratical method to get the first day of the month which is a number of months
+        after a date
+
+        :param date: Start date to increment
+        :type date: datetime.datetime.date
+        :param nb_month: Number of months to add
+        :type nb_month: int
+        :return: Incremented date
+        :rtype: datetime.date
+        """
+        next_month = ((date.month + nb_month) % datetime.date.max.month)
+        next_year = date.year + ((date.month + nb_month) // datetime.date.max.month)
+        if next_month == 0:
+            next_month = 12
+            next_year -= 1
+        return datetime.date(next_year, next_month, 1)
+
+    def first_step(self, date):
+        """
+        Get the first date aligned on the granularity after a date: the next day, the
+        next monday, the first day of the next month or of the next quarter
+
+        :param date: Start date
+        :type date: datetime.date
+        :return: Next aligned date
+        :rtype: datetime.date
+        """
+        if self.unit == Granularity.DAY:
+            return date + datetime.timedelta(self.step)
+        if self.unit == Granularity.WEEK:
+            return date + datetime.timedelta(7 * (self.step - 1) + 7 - date.weekday())
+        if self.unit == Granularity.MONTH:
+            return Granularity.add_months(date, self.step)
+        return Granularity.add_months(date, 3 * (self.step - 1) + 3 - (date.month - 1) % 3)
+
+    def next_step(self, date):
+        """
+        Get the date following an aligned date
+
+        :param date: Aligned date
+        :type date: datetime.date
+        :return: Next date
+        :rtype: datetime.date
+        """
+        if self.unit == Granularity.DAY:
+            return date + datetime.timedelta(self.step)
+        if self.unit == Granularity.WEEK:
+            return date + datetime.timedelta(7 * self.step)
+        if self.unit == Granularity.MONTH:
+            return Granularity.add_months(date, self.step)
+        return Granularity.add_months(date, 3 * self.step)
+
+    def iter_dates(self, start_date, end_date):
+        """
+        Give the dates of an analysis: the start date then the aligned dates until the
+        end date
+
+        :param start_date: First date
+        :type start_date: datetime.date
+        :param end_date: Last possible date
+        :type end_date: datetime.date
+        :return: Generator of dates in ascending order
+        :rtype: generator(datetime.date)
+        """
+        curr_date = start_date
+        if curr_date <= end_date:
+            yield curr_date
+            curr_date = self.first_step(curr_date)
+        while curr_date <= end_date:
+            yield curr_date
+            curr_date = self.next_step(curr_date)
@@ -0,0 +1,218 @@
+"""
+Module for class Profiler
+"""
+
+import contextlib
+import cProfile
+import json
+import logging
+import time
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+class Stage:
+    """
+    Class gathering the measures of a stage of the analysis
+    """
+
+    __slots__ = ('name', 'calls', 'wall_time', 'cpu_time', 'counters', 'peak_rss_increase_kb',
+                 'children_peak_rss_increase_kb')
+
+    def __init__(self, name):
+        """
+        Stage which has not been measured yet
+
+        :param name: Name of the stage
+        :type name: str
+        """
+        self.name = name
+        self.calls = 0
+        self.wall_time = 0.0
+        self.cpu_time = 0.0
+        self.counters = dict.fromkeys(Profiler.COUNTERS, 0)
+        # Largest rise of the peak RSS during a run of the stage: the peak RSS of a process
+        # is a high-water mark, a stage using less memory than a previous one does not raise it
+        self.peak_rss_increase_kb = None
+        self.children_peak_rss_increase_kb = None
+
+    def get_dict_values(self):
+        """
+        Return the measures as a dict
+
+        :return: Dict of the measures
+        :rtype: dict
+        """
+        res = {'stage': self.name, 'calls': self.calls, 'wall_time': self.wall_time,
+               'cpu_time': self.cpu_time}
+        res.update(self.counters)
+        res['peak_rss_increase_kb'] = self.peak_rss_increase_kb
+        res['children_peak_rss_increase_kb'] = self.children_peak_rss_increase_kb
+        return res
+
+
+class Profiler:
+    """
+    Class measuring the stages of an analysis: wall time, CPU time, number of subprocesses,
+    bytes read from the VCS, records processed and increase of the peak RSS.
+    Nothing is measured until it is enabled, so that the instrumentation of the analysis
+    costs only a test of a boolean per call.
+    """
+
+    REPORT_VERSION = 2
+    COUNTERS = ('subprocesses', 'bytes_read', 'records')
+
+    def __init__(self):
+        """
+        Disabled profiler
+        """
+        self.enabled = False
+        self.stages = {}
+        self.running = []
+        # Counters of the whole run, including what is done outside of the stages
+        self.counters = dict.fromkeys(Profiler.COUNTERS, 0)
+        self.start_time = None
+        self.cprofile = None
+
+    def enable(self, cprofile=False):
+        """
+        Start measuring
+
+        :param cprofile: Also profile the functions with cProfile
+        :type cprofile: bool
+        """
+        self.enabled = True
+        self.start_time = time.perf_counter()
+        if cprofile:
+            self.cprofile = cProfile.Profile()
+            self.cprofile.enable()
+
+    def disable(self):
+        """
+        Stop measuring, the measures already done are kept
+        """
+        self.enabled = False
+        if self.cprofile is not None:
+            self.cprofile.disable()
+
+    def stage(self, name):
+        """
+        Get a context manager measuring a stage. The measures of a stage which is run
+        several times are added. A stage run in another one is also included in it.
+
+        :param name: Name of the stage
+        :type name: str
+        :return: Context manager
+        :rtype: contextmanager
+        """
+        if not self.enabled:
+            return contextlib.nullcontext()
+        return self.measure(name)
+
+    @contextlib.contextmanager
+    def measure(self, name):
+        """
+        Measure a stage
+
+        :param name: Name of the stage
+        :type name: str
+        """
+        stage = self.stages.get(name)
+        if stage is None:
+            stage = Stage(name)
+            self.stages[name] = stage
+        self.running.append(stage)
+        start_rss = Profiler.get_peak_rss()
+        start_wall = time.perf_counter()
+        start_cpu = time.process_time()
+        try:
+            yield stage
+        finally:
+            stage.calls += 1
+            stage.wall_time += time.perf_counter() - start_wall
+            stage.cpu_time += time.process_time() - start_cpu
+            end_rss = Profiler.get_peak_rss()
+            if end_rss[0] is not None:
+                stage.peak_rss_increase_kb = max(stage.peak_rss_increase_kb or 0,
+                                                 end_rss[0] - start_rss[0])
+                stage.children_peak_rss_increase_kb = max(
+                    stage.children_peak_rss_increase_kb or 0, end_rss[1] - start_rss[1])
+            self.running.remove(stage)
+
+    def add(self, counter, value=1):
+        """
+        Increment a counter of the running stages
+
+        :param counter: Name of the counter (see COUNTERS)
+        :type counter: str
+        :param value: Increment
+        :type value: int
+        """
+        if not self.enabled:
+            return
+        self.counters[counter] += value
+        for stage in self.running:
+            stage.counters[counter] += value
+
+    @staticmethod
+    def get_peak_rss():
+        """
+        Get the peak resident set size of the process and of its terminated subprocesses
+
+        :return: Peak RSS in kilobytes or None if it is not available on the platform
+        :rtype: int, int
+        """
+        if resource is None:
+            return None, None
+        return (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+                resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+
+    def get_report(self):
+        """
+        Get the measures of the stages in the order of their first run
+
+        :return: Report which can be saved in JSON
+        :rtype: dict
+        """
+        wall_time = None
+        if self.start_time is not None:
+            wall_time = time.perf_counter() - self.start_time
+        peak_rss_kb, children_peak_rss_kb = Profiler.get_peak_rss()
+        report = {'version': Profiler.REPORT_VERSION, 'wall_time': wall_time,
+                  'cpu_time': time.process_time()}
+        report.update(self.counters)
+        report['peak_rss_kb'] = peak_rss_kb
+        report['children_peak_rss_kb'] = children_peak_rss_kb
+        report['stages'] = [x.get_dict_values() for x in self.stages.values()]
+        return report
+
+    def save_report(self, path):
+        """
+        Save the measures in a JSON file
+
+        :param path: Path of the report
+        :type path: str
+        """
+        logging.info('Saving profiling report in %s', path)
+        with open(path, mode='w', encoding='UTF-8') as report_file:
+            json.dump(self.get_report(), report_file, indent=2)
+
+    def save_cprofile(self, path):
+        """
+        Save the statistics of cProfile, which can be read with the module pstats
+
+        :param path: Path of the statistics
+        :type path: str
+        """
+        if self.cprofile is None:
+            return
+        logging.info('Saving cProfile statistics in %s', path)
+        self.cprofile.create_stats()
+        self.cprofile.dump_stats(path)
+
+
+# Profiler shared by all the modules of the analysis
+PROFILER = Profiler()
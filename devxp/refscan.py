@@ -0,0 +1,125 @@
+"""
+Module for class RefScan
+"""
+
+import logging
+
+import developer
+import shardscan
+
+
+class RefScan:
+    """
+    Class scanning the history of several references with a single traversal. Each commit
+    is read once with the set of references reaching it, as a bit mask propagated from the
+    children to the parents. The commits are folded in one author table per set of
+    references, so the table of a reference is the merge of the tables of the sets
+    containing it.
+    """
+
+    def __init__(self, backend, patterns):
+        """
+        Scan of the references of a repository
+
+        :param backend: Backend reading the repository
+        :type backend: GitCommandBackend or NativeGitBackend
+        :param patterns: Patterns of the references, such as refs/heads/release/*
+        :type patterns: list(str)
+        """
+        self.backend = backend
+        self.patterns = list(patterns)
+        self.refs = []
+        # Author table (see shardscan.ShardedScan.merge) of each set of references
+        self.tables = {}
+        self.nb_commits = 0
+
+    def build(self, commit_days=None):
+        """
+        Resolve the references and walk once the commits reachable from them
+
+        :param commit_days: Dictionary filled with the days (%Y-%m-%d) of the commits of each
+                            author, not filled by default
+        :type commit_days: dict(str->set(str))
+        """
+        self.refs = self.backend.list_refs(self.patterns)
+        if not self.refs:
+            raise ValueError('No reference matches {0}'.format(self.patterns))
+        logging.info('Scanning references %s', ', '.join(x for x, _ in self.refs))
+        masks = {}
+        for index, (_, sha) in enumerate(self.refs):
+            masks[sha] = masks.get(sha, 0) | 1 << index
+        self.tables = {}
+        self.nb_commits = 0
+        for sha, parents, name, email, iso_date in self.backend.iter_graph(list(masks)):
+            # All the children of a commit have been walked before it
+            mask = masks.pop(sha)
+            for parent in parents:
+                masks[parent] = masks.get(parent, 0) | mask
+            table = self.tables.get(mask)
+            if table is None:
+                table = self.tables[mask] = {}
+            uuid = developer.Developer.compute_uuid(name)
+            day = iso_date[:10]
+            RefScan.add_commit(table, uuid, name, email, day)
+            if commit_days is not None:
+                commit_days.setdefault(uuid, set()).add(day)
+            self.nb_commits += 1
+        logging.info('References scanned - Nb Commits: %d - Nb Sets of References: %d',
+                     self.nb_commits, len(self.tables))
+
+    @staticmethod
+    def add_commit(table, uuid, name, email, day):
+        """
+        Fold a commit in an author table, the email of the most recent day is kept
+
+        :param table: Author table whose emails are sets until the end of the scan
+        :type table: dict(str->list)
+        :param uuid: UUID of the author of the commit
+        :type uuid: str
+        :param name: Name of the author of the commit
+        :type name: str
+        :param email: Email of the author of the commit
+        :type email: str
+        :param day: Day of the commit (%Y-%m-%d)
+        :type day: str
+        """
+        values = table.get(uuid)
+        if values is None:
+            table[uuid] = [name, email, day, day, {email}]
+            return
+        values[4].add(email)
+        if day < values[2]:
+            values[2] = day
+        elif day > values[3]:
+            values[3] = day
+            values[1] = email
+
+    def get_author_table(self, index=None):
+        """
+        Get the author table of a reference or of all the references
+
+        :param index: Index of the reference in refs, all the references by default
+        :type index: int
+        :return: Author table (see shardscan.ShardedScan.merge)
+        :rtype: dict(str->list)
+        """
+        table = {}
+        for mask, mask_table in self.tables.items():
+            if index is None or mask >> index & 1:
+                shardscan.ShardedScan.merge(table, mask_table)
+        return table
+
+    def get_dirname(self, index):
+        """
+        Get the name of the output directory of a reference, such as heads_release_1.0 for
+        refs/heads/release/1.0
+
+        :param index: Index of the reference in refs
+        :type index: int
+        :return: Name of the directory
+        :rtype: str
+        """
+        name = self.refs[index][0]
+        if name.startswith('refs/'):
+            name = name[len('refs/'):]
+        return name.replace('/', '_')
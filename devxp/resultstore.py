@@ -0,0 +1,384 @@
+"""
+Module for classes ResultStore, CommitWriter and ExperienceWriter
+"""
+
+import datetime
+import itertools
+import logging
+import os
+import sqlite3
+
+import developer
+import experienceseries
+import tiers
+
+
+class CommitWriter:
+    """
+    Class writing in the store the commits read by a scan of the history, in a single
+    transaction
+    """
+
+    BATCH_SIZE = 10000
+
+    def __init__(self, store, repo_id):
+        """
+        Writer of the commits of a repository
+
+        :param store: Store of the results
+        :type store: ResultStore
+        :param repo_id: Identifier of the repository in the store
+        :type repo_id: int
+        """
+        self.store = store
+        self.repo_id = repo_id
+        self.rows = []
+        self.nb_commits = 0
+
+    def begin(self, rev_range):
+        """
+        Start the scan of a range of commits: a scan of all the history replaces the
+        commits already stored
+
+        :param rev_range: Range of commits scanned, all the history if empty
+        :type rev_range: str
+        """
+        self.rows = []
+        self.nb_commits = 0
+        if not rev_range:
+            self.store.connection.execute('DELETE FROM commits WHERE repo_id = ?',
+                                          (self.repo_id,))
+
+    def add_commit(self, name, email, iso_date):
+        """
+        Add a commit
+
+        :param name: Name of the author of the commit
+        :type name: str
+        :param email: Email of the author of the commit
+        :type email: str
+        :param iso_date: Author date of the commit with the ISO 8601 format
+        :type iso_date: str
+        """
+        self.rows.append((self.repo_id, developer.Developer.compute_uuid(name), email,
+                          iso_date[:10], iso_date))
+        if len(self.rows) >= CommitWriter.BATCH_SIZE:
+            self.flush()
+
+    def flush(self):
+        """
+        Insert the pending commits
+        """
+        self.store.connection.executemany('INSERT INTO commits VALUES (?, ?, ?, ?, ?)', self.rows)
+        self.nb_commits += len(self.rows)
+        self.rows = []
+
+    def end(self):
+        """
+        Insert the pending commits and commit the transaction
+        """
+        self.flush()
+        self.store.connection.commit()
+        logging.info('Commits stored - Nb Commits: %d', self.nb_commits)
+
+
+class ExperienceWriter:
+    """
+    Class writing in the store the periods of an experience series as soon as they are
+    computed, in a single transaction
+    """
+
+    BATCH_SIZE = 1000
+
+    def __init__(self, store, repo_id, granularity_name, tier_model=None):
+        """
+        Writer replacing the experience series of a repository at a granularity
+
+        :param store: Store of the results
+        :type store: ResultStore
+        :param repo_id: Identifier of the repository in the store
+        :type repo_id: int
+        :param granularity_name: Name of the granularity of the series
+        :type granularity_name: str
+        :param tier_model: Tiers of experience, junior, advanced and senior by default
+        :type tier_model: TierModel
+        """
+        self.store = store
+        self.repo_id = repo_id
+        self.granularity_name = granularity_name
+        self.rows = []
+        self.tier_rows = []
+        if tier_model is None:
+            tier_model = tiers.DEFAULT_MODEL
+        for table in ('experience', 'experience_tiers', 'tiers'):
+            self.store.connection.execute(
+                'DELETE FROM {0} WHERE repo_id = ? AND granularity = ?'.format(table),
+                (repo_id, granularity_name))
+        self.store.connection.executemany(
+            'INSERT INTO tiers VALUES (?, ?, ?, ?, ?)',
+            ((repo_id, granularity_name, position, name, min_days)
+             for position, (name, min_days) in enumerate(tier_model.get_definitions())))
+
+    def write(self, values):
+        """
+        Add a period
+
+        :param values: Date ordinal, real XP days, cumulative XP days and number of
+                       developers of each tier
+        :type values: tuple(int)
+        """
+        day = datetime.date.fromordinal(values[0]).isoformat()
+        self.rows.append((self.repo_id, self.granularity_name, day, values[1], values[2]))
+        self.tier_rows.extend((self.repo_id, self.granularity_name, day, position, count)
+                              for position, count in enumerate(values[3:]))
+        if len(self.rows) >= ExperienceWriter.BATCH_SIZE:
+            self.flush()
+
+    def flush(self):
+        """
+        Insert the pending periods
+        """
+        self.store.connection.executemany('INSERT INTO experience VALUES (?, ?, ?, ?, ?)',
+                                          self.rows)
+        self.store.connection.executemany('INSERT INTO experience_tiers VALUES (?, ?, ?, ?, ?)',
+                                          self.tier_rows)
+        self.rows = []
+        self.tier_rows = []
+
+    def close(self):
+        """
+        Insert the pending periods and commit the transaction
+        """
+        self.flush()
+        self.store.connection.commit()
+
+
+class ResultStore:
+    """
+    Class storing the developers, the commits and the experience series of the analysed
+    repositories in a SQLite database, so that they can be queried without reading all the
+    results
+    """
+
+    STORE_FILENAME = "devxp.sqlite"
+    STORE_VERSION = 2
+    # The experience is computed again by the next analysis, so its tables are dropped when
+    # their layout changes
+    MIGRATIONS = {2: "DROP TABLE IF EXISTS experience;"}
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS repositories (
+            id INTEGER PRIMARY KEY, path TEXT UNIQUE NOT NULL, head TEXT, analysed_at TEXT);
+        CREATE TABLE IF NOT EXISTS developers (
+            repo_id INTEGER NOT NULL, uuid TEXT NOT NULL, name TEXT, email TEXT,
+            first_commit TEXT, last_commit TEXT, has_left INTEGER, exclude INTEGER,
+            PRIMARY KEY (repo_id, uuid));
+        CREATE TABLE IF NOT EXISTS aliases (
+            repo_id INTEGER NOT NULL, uuid TEXT NOT NULL, alias_uuid TEXT NOT NULL,
+            PRIMARY KEY (repo_id, uuid, alias_uuid));
+        CREATE TABLE IF NOT EXISTS commits (
+            repo_id INTEGER NOT NULL, uuid TEXT NOT NULL, email TEXT, day TEXT NOT NULL,
+            author_date TEXT);
+        CREATE TABLE IF NOT EXISTS experience (
+            repo_id INTEGER NOT NULL, granularity TEXT NOT NULL, date TEXT NOT NULL,
+            real_xp INTEGER, cumulative_xp INTEGER, PRIMARY KEY (repo_id, granularity, date));
+        CREATE TABLE IF NOT EXISTS experience_tiers (
+            repo_id INTEGER NOT NULL, granularity TEXT NOT NULL, date TEXT NOT NULL,
+            tier INTEGER NOT NULL, nb INTEGER, PRIMARY KEY (repo_id, granularity, date, tier));
+        CREATE TABLE IF NOT EXISTS tiers (
+            repo_id INTEGER NOT NULL, granularity TEXT NOT NULL, position INTEGER NOT NULL,
+            name TEXT NOT NULL, min_days INTEGER, PRIMARY KEY (repo_id, granularity, position));
+        CREATE INDEX IF NOT EXISTS developers_uuid ON developers (uuid);
+        CREATE INDEX IF NOT EXISTS developers_first_commit ON developers (repo_id, first_commit);
+        CREATE INDEX IF NOT EXISTS aliases_alias_uuid ON aliases (alias_uuid);
+        CREATE INDEX IF NOT EXISTS commits_day ON commits (repo_id, day);
+        CREATE INDEX IF NOT EXISTS commits_uuid ON commits (repo_id, uuid, day);
+        CREATE INDEX IF NOT EXISTS experience_date ON experience (date);
+    """
+
+    def __init__(self, path):
+        """
+        Open the store, it is created if it does not exist
+
+        :param path: Path of the SQLite database
+        :type path: str
+        """
+        logging.info('Opening result store %s', path)
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        # Readers such as dashboards are not blocked by the writes of an analysis
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        version = self.connection.execute('PRAGMA user_version').fetchone()[0]
+        for number in range(version + 1, ResultStore.STORE_VERSION + 1):
+            if number in ResultStore.MIGRATIONS:
+                self.connection.executescript(ResultStore.MIGRATIONS[number])
+        self.connection.executescript(ResultStore.SCHEMA)
+        self.connection.execute('PRAGMA user_version = {0}'.format(ResultStore.STORE_VERSION))
+
+    def close(self):
+        """
+        Close the store
+        """
+        self.connection.close()
+
+    def get_repo_id(self, repo_path, create=True):
+        """
+        Get the identifier of a repository in the store
+
+        :param repo_path: Path to the repository
+        :type repo_path: str
+        :param create: Add the repository if it is not in the store
+        :type create: bool
+        :return: Identifier of the repository or None if it is unknown
+        :rtype: int
+        """
+        repo_path = os.path.abspath(repo_path)
+        row = self.connection.execute('SELECT id FROM repositories WHERE path = ?',
+                                      (repo_path,)).fetchone()
+        if row is not None:
+            return row[0]
+        if not create:
+            return None
+        with self.connection:
+            return self.connection.execute('INSERT INTO repositories (path) VALUES (?)',
+                                           (repo_path,)).lastrowid
+
+    def get_commit_writer(self, repo_path):
+        """
+        Get a writer of the commits of a repository
+
+        :param repo_path: Path to the repository
+        :type repo_path: str
+        :return: Writer to give to the VCS manager
+        :rtype: CommitWriter
+        """
+        return CommitWriter(self, self.get_repo_id(repo_path))
+
+    def save_developers(self, repo_path, author_dict, head=None):
+        """
+        Replace the developers and their aliases of a repository in a single transaction
+
+        :param repo_path: Path to the repository
+        :type repo_path: str
+        :param author_dict: Developer dictionary
+        :type author_dict: dict(str->Developer)
+        :param head: SHA of the commit analysed
+        :type head: str
+        """
+        repo_id = self.get_repo_id(repo_path)
+        logging.info('Storing %d developers of %s', len(author_dict), repo_path)
+        with self.connection:
+            self.connection.execute(
+                'UPDATE repositories SET head = ?, analysed_at = ? WHERE id = ?',
+                (head, datetime.datetime.now().isoformat(timespec='seconds'), repo_id))
+            self.connection.execute('DELETE FROM developers WHERE repo_id = ?', (repo_id,))
+            self.connection.execute('DELETE FROM aliases WHERE repo_id = ?', (repo_id,))
+            self.connection.executemany(
+                'INSERT INTO developers VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                ((repo_id, x.uuid, x.name, x.email, x.get_first_commit_date() or None,
+                  x.get_last_commit_date() or None, x.has_left, x.exclude)
+                 for x in author_dict.values()))
+            self.connection.executemany(
+                'INSERT OR IGNORE INTO aliases VALUES (?, ?, ?)',
+                ((repo_id, x.uuid, alias) for x in author_dict.values()
+                 for alias in x.get_alias_uuids()))
+
+    def get_developers(self, repo_path):
+        """
+        Get the developers of a repository, their aliases are UUIDs
+
+        :param repo_path: Path to the repository
+        :type repo_path: str
+        :return: Developer dictionary
+        :rtype: dict(str->Developer)
+        """
+        repo_id = self.get_repo_id(repo_path, False)
+        author_dict = {}
+        if repo_id is None:
+            return author_dict
+        for name, email, first, last, has_left, exclude in self.connection.execute(
+                'SELECT name, email, first_commit, last_commit, has_left, exclude '
+                'FROM developers WHERE repo_id = ?', (repo_id,)):
+            dev = developer.Developer(name, email)
+            if first is not None:
+                dev.set_first_commit_date(first)
+                dev.set_last_commit_date(last)
+            dev.has_left = bool(has_left)
+            dev.exclude = bool(exclude)
+            author_dict[dev.uuid] = dev
+        for uuid, alias in self.connection.execute(
+                'SELECT uuid, alias_uuid FROM aliases WHERE repo_id = ?', (repo_id,)):
+            if uuid in author_dict:
+                author_dict[uuid].add_alias(alias)
+        return author_dict
+
+    def save_experience(self, repo_path, granularity_name, series):
+        """
+        Replace the experience series of a repository at a granularity in a single
+        transaction
+
+        :param repo_path: Path to the repository
+        :type repo_path: str
+        :param granularity_name: Name of the granularity of the series
+        :type granularity_name: str
+        :param series: Experience series
+        :type series: ExperienceSeries
+        """
+        logging.info('Storing %d periods of experience of %s - Granularity: %s', len(series),
+                     repo_path, granularity_name)
+        writer = self.get_experience_writer(repo_path, granularity_name, series.tier_model)
+        for values in series.iter_values():
+            writer.write(values)
+        writer.close()
+
+    def get_experience_writer(self, repo_path, granularity_name, tier_model=None):
+        """
+        Get a sink replacing the experience series of a repository at a granularity
+
+        :param repo_path: Path to the repository
+        :type repo_path: str
+        :param granularity_name: Name of the granularity of the series
+        :type granularity_name: str
+        :param tier_model: Tiers of experience, junior, advanced and senior by default
+        :type tier_model: TierModel
+        :return: Writer of the periods
+        :rtype: ExperienceWriter
+        """
+        return ExperienceWriter(self, self.get_repo_id(repo_path), granularity_name, tier_model)
+
+    def get_experience(self, repo_path, granularity_name, start_date=None, end_date=None):
+        """
+        Get the experience of a repository between two dates
+
+        :param repo_path: Path to the repository
+        :type repo_path: str
+        :param granularity_name: Name of the granularity of the series
+        :type granularity_name: str
+        :param start_date: First date, the beginning of the series by default
+        :type start_date: datetime.date
+        :param end_date: Last date, the end of the series by default
+        :type end_date: datetime.date
+        :return: Experience series
+        :rtype: ExperienceSeries
+        """
+        repo_id = self.get_repo_id(repo_path, False)
+        if repo_id is None:
+            return experienceseries.ExperienceSeries()
+        definitions = self.connection.execute(
+            'SELECT name, min_days FROM tiers WHERE repo_id = ? AND granularity = ? '
+            'ORDER BY position', (repo_id, granularity_name)).fetchall()
+        series = experienceseries.ExperienceSeries(
+            tier_model=tiers.TierModel(definitions) if definitions else None)
+        start = (start_date or datetime.date.min).isoformat()
+        end = (end_date or datetime.date.max).isoformat()
+        rows = self.connection.execute(
+            'SELECT e.date, e.real_xp, e.cumulative_xp, t.nb FROM experience e '
+            'LEFT JOIN experience_tiers t ON t.repo_id = e.repo_id '
+            'AND t.granularity = e.granularity AND t.date = e.date '
+            'WHERE e.repo_id = ? AND e.granularity = ? AND e.date BETWEEN ? AND ? '
+            'ORDER BY e.date, t.tier', (repo_id, granularity_name, start, end))
+        for (day, real_xp, cumulative_xp), tier_rows in itertools.groupby(
+                rows, key=lambda x: x[:3]):
+            series.append((datetime.date.fromisoformat(day).toordinal(), real_xp, cumulative_xp)
+                          + tuple(x[3] for x in tier_rows))
+        return series
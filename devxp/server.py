@@ -0,0 +1,294 @@
+"""
+Module for classes ExperienceService and ExperienceRequestHandler
+"""
+
+import datetime
+import http.server
+import json
+import logging
+import threading
+import time
+import urllib.parse
+
+import periods
+import xpanalyser
+
+
+class ExperienceService:
+    """
+    Class keeping the analysis of a repository in memory to answer queries without scanning
+    the history again: the analysis is refreshed incrementally when HEAD moves
+    """
+
+    REFRESH_INTERVAL = 5.0
+
+    def __init__(self, path, work_dir="", backend='git', in_csv=None, unify=False,
+                 mailmap_path=None, refresh_interval=REFRESH_INTERVAL, tiers_path=None,
+                 departure=None, cadence=None, cache=False):
+        """
+        Service answering the queries on a repository
+
+        :param path: Path to the VCS repository to analyse
+        :type path: str
+        :param work_dir: Path to the working directory, the state of the analysis is kept
+                         there so that the refreshes only process the new commits
+        :type work_dir: str
+        :param backend: Name of the backend used to read the repository ('git' or 'native')
+        :type backend: str
+        :param in_csv: CSV file of the working directory applied after each refresh
+        :type in_csv: str
+        :param unify: Merge automatically the authors after each refresh
+        :type unify: bool
+        :param mailmap_path: Mailmap file used to merge the authors
+        :type mailmap_path: str
+        :param refresh_interval: Minimal number of seconds between two checks of HEAD
+        :type refresh_interval: float
+        :param tiers_path: JSON file of the tiers of experience (see TierModel.load)
+        :type tiers_path: str
+        :param departure: Number of days without commit after which a developer has left
+                          (see XPAnalyser.detect_departures)
+        :type departure: int
+        :param cadence: Percentile of the gaps between the commits of each developer after
+                        which a developer has left (see XPAnalyser.detect_departures)
+        :type cadence: float
+        :param cache: Cache the commits of the history in the working directory
+        :type cache: bool
+        """
+        self.path = path
+        self.work_dir = work_dir
+        self.backend = backend
+        self.in_csv = in_csv
+        self.unify = unify
+        self.mailmap_path = mailmap_path
+        self.refresh_interval = refresh_interval
+        self.tiers_path = tiers_path
+        self.departure = departure
+        self.cadence = cadence
+        self.cache = cache
+        self.analyser = None
+        self.refreshed_at = None
+        self.last_check = 0.0
+        # Only one refresh at a time, the queries keep using the previous analysis meanwhile
+        self.refresh_lock = threading.Lock()
+
+    def load(self):
+        """
+        Analyse the repository, only the commits added since the state saved in the working
+        directory are read
+
+        :return: Analyser whose index is built
+        :rtype: XPAnalyser
+        """
+        analyser = xpanalyser.XPAnalyser(self.path, self.work_dir, self.backend)
+        if self.cache:
+            analyser.enable_commit_cache()
+        if self.cadence is not None:
+            analyser.keep_commit_days()
+        analyser.retrieve_author_information_from_repo(True, True)
+        if self.tiers_path is not None:
+            analyser.load_tiers(self.tiers_path)
+        if self.unify:
+            analyser.resolve_identities(self.mailmap_path)
+        if self.departure is not None or self.cadence is not None:
+            analyser.detect_departures(self.departure or 0, self.cadence)
+        if self.in_csv is not None:
+            analyser.get_author_information_from_csv(self.in_csv)
+        analyser.get_index()
+        return analyser
+
+    def refresh(self, force=False):
+        """
+        Reload the analysis if HEAD has moved since the previous one
+
+        :param force: Check HEAD even if the previous check is recent
+        :type force: bool
+        :return: Current analyser
+        :rtype: XPAnalyser
+        """
+        analyser = self.analyser
+        if not force and analyser is not None and \
+                time.monotonic() - self.last_check < self.refresh_interval:
+            return analyser
+        with self.refresh_lock:
+            # Another thread may have refreshed the analysis while this one was waiting
+            if self.analyser is not analyser and not force:
+                return self.analyser
+            self.last_check = time.monotonic()
+            if analyser is not None and \
+                    analyser.vcs_mgr.retrieve_head() == analyser.vcs_mgr.head:
+                return analyser
+            logging.info('Refreshing the analysis of %s', self.path)
+            # The new analysis is swapped in one assignment once it is complete
+            self.analyser = self.load()
+            self.refreshed_at = datetime.datetime.now().isoformat(timespec='seconds')
+            return self.analyser
+
+    def get_status(self):
+        """
+        Get the state of the analysis
+
+        :return: Path, HEAD, number of developers and date of the last refresh
+        :rtype: dict
+        """
+        analyser = self.refresh()
+        return {'repository': self.path, 'head': analyser.vcs_mgr.head,
+                'nb_developers': len(analyser.vcs_mgr.author_dict),
+                'refreshed_at': self.refreshed_at}
+
+    def get_experience(self, params):
+        """
+        Get the experience of the project at a date, today by default, or between two dates
+        (start and end) at a granularity (monthly by default)
+
+        :param params: Parameters of the query
+        :type params: dict(str->str)
+        :return: Experience or list of experiences
+        :rtype: dict or list(dict)
+        """
+        analyser = self.refresh()
+        if 'start' in params or 'end' in params:
+            granularity = periods.Granularity(
+                params.get('granularity', xpanalyser.XPAnalyser.DEFAULT_GRANULARITY))
+            start = params.get('start')
+            if start is None:
+                start = analyser.vcs_mgr.first_commit_repo + datetime.timedelta(1)
+            series = analyser.experience_between(start, params.get('end', datetime.date.today()),
+                                                 granularity)
+            return [ExperienceService.get_experience_dict(x) for x in series]
+        curr_xp = analyser.experience_at(params.get('date', datetime.date.today()))
+        return ExperienceService.get_experience_dict(curr_xp)
+
+    def get_categories(self, params):
+        """
+        Get the number of developers of each category of experience at a date, today by
+        default
+
+        :param params: Parameters of the query
+        :type params: dict(str->str)
+        :return: Number of developers of each tier
+        :rtype: dict
+        """
+        curr_xp = self.refresh().experience_at(params.get('date', datetime.date.today()))
+        categories = {'date': curr_xp.get_curr_date()}
+        categories.update((x.lower(), y) for x, y in zip(curr_xp.tier_model.names,
+                                                         curr_xp.counts))
+        return categories
+
+    def get_developers(self, params):
+        """
+        Get the developers whose UUID is given or whose name or email contains a string
+        (case insensitive)
+
+        :param params: Parameters of the query: uuid, name or email
+        :type params: dict(str->str)
+        :return: Attributes of the developers
+        :rtype: list(dict)
+        """
+        author_dict = self.refresh().vcs_mgr.author_dict
+        if 'uuid' in params:
+            dev = author_dict.get(params['uuid'])
+            return [] if dev is None else [ExperienceService.get_developer_dict(dev)]
+        name = params.get('name', '').lower()
+        email = params.get('email', '').lower()
+        return [ExperienceService.get_developer_dict(x) for x in author_dict.values()
+                if name in x.name.lower() and email in (x.email or '').lower()]
+
+    @staticmethod
+    def get_developer_dict(dev):
+        """
+        Get the attributes of a developer with the names of the CSV columns
+
+        :param dev: Developer
+        :type dev: Developer
+        :return: Attributes of the developer, the dates with the format %Y-%m-%d
+        :rtype: dict
+        """
+        return dict(zip(dev.FIELDS.keys(), [dev.uuid] + dev.get_values()))
+
+    @staticmethod
+    def get_experience_dict(curr_xp):
+        """
+        Get the values of an experience with the names of the CSV columns
+
+        :param curr_xp: Experience
+        :type curr_xp: Experience
+        :return: Values of the experience
+        :rtype: dict
+        """
+        return dict(zip(curr_xp.get_field_names(curr_xp.tier_model), curr_xp.get_values()))
+
+
+class ExperienceRequestHandler(http.server.BaseHTTPRequestHandler):
+    """
+    Class answering the HTTP queries with JSON documents:
+        /status
+        /experience?date=2020-01-01
+        /experience?start=2019-01-01&end=2020-01-01&granularity=quarterly
+        /categories?date=2020-01-01
+        /developers?name=joe or /developers?email=joe@ or /developers?uuid=...
+    """
+
+    ROUTES = {'/status': lambda service, params: service.get_status(),
+              '/experience': ExperienceService.get_experience,
+              '/categories': ExperienceService.get_categories,
+              '/developers': ExperienceService.get_developers}
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """
+        Answer a query
+        """
+        url = urllib.parse.urlsplit(self.path)
+        route = ExperienceRequestHandler.ROUTES.get(url.path.rstrip('/'))
+        if route is None:
+            self.send_json(404, {'error': 'Unknown path {0}'.format(url.path)})
+            return
+        params = dict(urllib.parse.parse_qsl(url.query))
+        try:
+            result = route(self.server.service, params)
+        except ValueError as exc:
+            self.send_json(400, {'error': str(exc)})
+            return
+        except Exception as exc:  # pylint: disable=broad-except
+            # The client gets an answer and the server keeps serving the other queries
+            logging.exception('Query %s failed', self.path)
+            self.send_json(500, {'error': '{0}: {1}'.format(type(exc).__name__, exc)})
+            return
+        self.send_json(200, result)
+
+    def send_json(self, code, result):
+        """
+        Send a JSON document
+
+        :param code: HTTP status code
+        :type code: int
+        :param result: Document
+        :type result: dict or list
+        """
+        body = json.dumps(result).encode('utf-8')
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        logging.debug('%s - %s', self.address_string(), format % args)
+
+
+def create_server(service, port=0, host='127.0.0.1'):
+    """
+    Create the HTTP server of a service, each query is answered in its own thread
+
+    :param service: Service answering the queries
+    :type service: ExperienceService
+    :param port: Port of the server, chosen by the system by default
+    :type port: int
+    :param host: Address of the server, only the local host by default
+    :type host: str
+    :return: Server, call serve_forever to start it
+    :rtype: http.server.ThreadingHTTPServer
+    """
+    httpd = http.server.ThreadingHTTPServer((host, port), ExperienceRequestHandler)
+    httpd.daemon_threads = True
+    httpd.service = service
+    return httpd
@@ -0,0 +1,206 @@
+"""
+Module for class ShardedScan
+"""
+
+import concurrent.futures
+import json
+import logging
+import os
+
+import vcsmanager
+
+
+def scan_shard(path, backend, rev_range):
+    """
+    Retrieve the author table of a range of commits.
+    Function executed in the worker processes.
+
+    :param path: Path to the VCS repository
+    :type path: str
+    :param backend: Name of the backend used to read the repository
+    :type backend: str
+    :param rev_range: Range of commits of the shard
+    :type rev_range: str
+    :return: Author table of the shard (see ShardedScan.merge)
+    :rtype: dict(str->list)
+    """
+    vcs_mgr = vcsmanager.VCSManager(path, backend)
+    vcs_mgr.retrieve_author(rev_range)
+    return vcs_mgr.get_author_table()
+
+
+class ShardedScan:
+    """
+    Class scanning the history of a repository in parallel: the first-parent chain of HEAD
+    is cut every shard_size commits and each range between two cuts is scanned in a worker
+    process. A commit belongs to exactly one range, so the author tables of the shards
+    are merged by keeping the earliest first commit and the latest last commit.
+    The cuts are counted from the root, so that all the shards but the last one stay the
+    same when HEAD moves and their cached tables are reused.
+    """
+
+    SHARD_SIZE = 50000
+    CACHE_VERSION = 1
+
+    def __init__(self, vcs_path, backend='git', shard_size=SHARD_SIZE, max_workers=None,
+                 cache_dir=None):
+        """
+        Sharded scan of a repository
+
+        :param vcs_path: Path to the VCS repository
+        :type vcs_path: str
+        :param backend: Name of the backend used to read the repository
+        :type backend: str
+        :param shard_size: Number of first-parent commits of each shard
+        :type shard_size: int
+        :param max_workers: Number of worker processes, number of CPUs by default
+        :type max_workers: int
+        :param cache_dir: Directory of the author tables of the shards, no cache by default
+        :type cache_dir: str
+        """
+        if shard_size < 1:
+            raise ValueError('Invalid shard size {0}'.format(shard_size))
+        self.vcs_path = vcs_path
+        self.backend = backend
+        self.shard_size = shard_size
+        self.max_workers = max_workers
+        self.cache_dir = cache_dir
+
+    def get_shards(self, first_parents):
+        """
+        Cut the first-parent chain into ranges of commits
+
+        :param first_parents: SHA of the first-parent chain from the root to HEAD
+        :type first_parents: list(str)
+        :return: Ranges of commits from the oldest to the most recent one
+        :rtype: list(str)
+        """
+        cuts = first_parents[self.shard_size - 1::self.shard_size]
+        if first_parents and (not cuts or cuts[-1] != first_parents[-1]):
+            cuts.append(first_parents[-1])
+        return [x if y is None else '{0}..{1}'.format(y, x)
+                for x, y in zip(cuts, [None] + cuts[:-1])]
+
+    def get_cache_path(self, rev_range):
+        """
+        Get the path of the cached author table of a shard
+
+        :param rev_range: Range of commits of the shard
+        :type rev_range: str
+        :return: Path of the cache file or None without cache
+        :rtype: str
+        """
+        if self.cache_dir is None:
+            return None
+        return os.path.join(self.cache_dir, rev_range.replace('..', '_') + '.json')
+
+    def load_table(self, rev_range):
+        """
+        Load the cached author table of a shard
+
+        :param rev_range: Range of commits of the shard
+        :type rev_range: str
+        :return: Author table or None if it is not cached
+        :rtype: dict(str->list)
+        """
+        path = self.get_cache_path(rev_range)
+        if path is None or not os.path.isfile(path):
+            return None
+        with open(path, mode='r', encoding='UTF-8') as cache_file:
+            try:
+                cache = json.load(cache_file)
+            except ValueError as exc:
+                logging.warning('Invalid shard cache %s: %s', path, exc)
+                return None
+        if cache.get('version') != ShardedScan.CACHE_VERSION:
+            return None
+        return cache['authors']
+
+    def save_table(self, rev_range, table):
+        """
+        Cache the author table of a shard, the commits of a range never change
+
+        :param rev_range: Range of commits of the shard
+        :type rev_range: str
+        :param table: Author table
+        :type table: dict(str->list)
+        """
+        path = self.get_cache_path(rev_range)
+        if path is None:
+            return
+        with open(path, mode='w', encoding='UTF-8') as cache_file:
+            json.dump({'version': ShardedScan.CACHE_VERSION, 'authors': table}, cache_file)
+
+    def prune_cache(self, shards):
+        """
+        Delete the cached tables of the shards which are not used anymore, such as the
+        previous last shard
+
+        :param shards: Ranges of commits of the current shards
+        :type shards: list(str)
+        """
+        if self.cache_dir is None:
+            return
+        used = {os.path.basename(self.get_cache_path(x)) for x in shards}
+        for filename in os.listdir(self.cache_dir):
+            if filename.endswith('.json') and filename not in used:
+                os.remove(os.path.join(self.cache_dir, filename))
+
+    def run(self, first_parents):
+        """
+        Scan the shards which are not cached and merge all the author tables
+
+        :param first_parents: SHA of the first-parent chain from the root to HEAD
+        :type first_parents: list(str)
+        :return: Author table of the history
+        :rtype: dict(str->list)
+        """
+        shards = self.get_shards(first_parents)
+        if self.cache_dir is not None:
+            os.makedirs(self.cache_dir, exist_ok=True)
+        tables = [self.load_table(x) for x in shards]
+        missing = [x for x, table in zip(shards, tables) if table is None]
+        logging.info('Sharded scan of %s - Nb Shards: %d - Nb Cached: %d', self.vcs_path,
+                     len(shards), len(shards) - len(missing))
+        if missing:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = {x: executor.submit(scan_shard, self.vcs_path, self.backend, x)
+                           for x in missing}
+                for index, rev_range in enumerate(shards):
+                    if tables[index] is None:
+                        tables[index] = futures[rev_range].result()
+                        self.save_table(rev_range, tables[index])
+        self.prune_cache(shards)
+        result = {}
+        for table in tables:
+            result = ShardedScan.merge(result, table)
+        return result
+
+    @staticmethod
+    def merge(table, newer):
+        """
+        Merge the author tables of two ranges of commits. An author table associates the
+        UUID of each author with its name, email of its last commit, first and last commit
+        days and all its emails. The merge is associative, so that the tables can be merged
+        in any grouping as long as the shards stay in the order of the history.
+
+        :param table: Author table of the older commits, updated by the merge
+        :type table: dict(str->list)
+        :param newer: Author table of the more recent commits
+        :type newer: dict(str->list)
+        :return: Merged table
+        :rtype: dict(str->list)
+        """
+        for uuid, (name, email, first, last, emails) in newer.items():
+            values = table.get(uuid)
+            if values is None:
+                table[uuid] = [name, email, first, last, sorted(emails)]
+                continue
+            if first < values[2]:
+                values[2] = first
+            # On the same day, the email of the more recent shard is kept as in a single scan
+            if last >= values[3]:
+                values[1] = email
+                values[3] = last
+            values[4] = sorted(set(values[4]).union(emails))
+        return table
@@ -0,0 +1,95 @@
+"""
+Module for the sinks of the experience: classes CSVSink and SeriesSink
+"""
+
+import csv
+import datetime
+import logging
+
+import experience
+import experienceseries
+
+
+class CSVSink:
+    """
+    Class writing the periods of experience in a CSV file as soon as they are computed
+    """
+
+    FLUSH_STEP = 256
+
+    def __init__(self, path, extra_fields=None, encoding=None, fields=None):
+        """
+        Open the CSV file and write its header
+
+        :param path: Path of the CSV file
+        :type path: str
+        :param extra_fields: Names of the columns written before the experience columns
+        :type extra_fields: list(str)
+        :param encoding: Encoding of the file, the one of the platform by default
+        :type encoding: str
+        :param fields: Names of the columns of the values, the experience columns of the default
+                       tiers by default
+        :type fields: list(str)
+        """
+        logging.info('Writing experience in %s', path)
+        self.path = path
+        self.csv_file = open(path, mode='w', newline='', encoding=encoding)
+        self.xp_writer = csv.writer(self.csv_file, delimiter=';', quotechar='"',
+                                    quoting=csv.QUOTE_MINIMAL)
+        if fields is None:
+            fields = experience.Experience.get_field_names()
+        self.xp_writer.writerow((extra_fields or []) + list(fields))
+        self.nb_periods = 0
+
+    def write(self, values, extra_values=()):
+        """
+        Write a period
+
+        :param values: Date ordinal, real XP days, cumulative XP days and number of
+                       developers of each tier
+        :type values: tuple(int)
+        :param extra_values: Values of the extra columns
+        :type extra_values: tuple
+        """
+        self.xp_writer.writerow(extra_values + (datetime.date.fromordinal(values[0]),)
+                                + tuple(values[1:]))
+        self.nb_periods += 1
+        # The periods already written can be read while the analysis goes on
+        if self.nb_periods % CSVSink.FLUSH_STEP == 0:
+            self.csv_file.flush()
+
+    def close(self):
+        """
+        Close the CSV file
+        """
+        self.csv_file.close()
+
+
+class SeriesSink:
+    """
+    Class keeping the periods of experience in memory in a series
+    """
+
+    def __init__(self, series=None):
+        """
+        Sink filling a series
+
+        :param series: Series to fill, a new one by default
+        :type series: ExperienceSeries
+        """
+        self.series = series if series is not None else experienceseries.ExperienceSeries()
+
+    def write(self, values):
+        """
+        Add a period to the series
+
+        :param values: Date ordinal, real XP days, cumulative XP days and number of
+                       developers of each tier
+        :type values: tuple(int)
+        """
+        self.series.append(values)
+
+    def close(self):
+        """
+        Nothing to release
+        """
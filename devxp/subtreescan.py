@@ -0,0 +1,180 @@
+"""
+Module for class SubtreeScan
+"""
+
+import logging
+import os
+
+import knowledgemap
+
+
+class SubtreeScan:
+    """
+    Class giving the developers of many sub-trees of a repository with a single scan of the
+    history: the files changed by each commit are routed to the sub-trees containing them
+    through an index of the path prefixes
+    """
+
+    GLOB_CHARS = '*?['
+
+    def __init__(self, vcs_path, subtrees):
+        """
+        Scan of the sub-trees of a repository
+
+        :param vcs_path: Path to the VCS repository
+        :type vcs_path: str
+        :param subtrees: Paths of the sub-trees (directories or files) relative to the root
+                         of the repository, the root being '' or '.'
+        :type subtrees: iterable(str)
+        """
+        self.vcs_path = vcs_path
+        self.subtrees = []
+        self.prefixes = {}
+        for subtree in subtrees:
+            subtree = SubtreeScan.normalise(subtree)
+            if subtree not in self.prefixes:
+                self.prefixes[subtree] = len(self.subtrees)
+                self.subtrees.append(subtree)
+        if not self.subtrees:
+            raise ValueError('At least one sub-tree is required')
+        # Sub-trees containing each directory already met
+        self.directories = {}
+        self.authors = {}
+        self.developers = [{} for _ in self.subtrees]
+        self.first_ordinal = None
+
+    @staticmethod
+    def normalise(path):
+        """
+        Get the key of a sub-tree, the root being an empty string
+
+        :param path: Path of the sub-tree relative to the root of the repository
+        :type path: str
+        :return: Key of the sub-tree
+        :rtype: str
+        """
+        path = path.strip().strip('/')
+        return '' if path == '.' else path
+
+    @staticmethod
+    def load(path):
+        """
+        Load the sub-trees of a CODEOWNERS-like file: the first token of each line is a
+        path, the owners following it and the comments (#) are ignored. Trailing /* and /**
+        are removed, the other glob patterns are not supported.
+
+        :param path: Path of the file
+        :type path: str
+        :return: Paths of the sub-trees
+        :rtype: list(str)
+        """
+        logging.info('Loading sub-trees from %s', path)
+        subtrees = []
+        with open(path, mode='r', encoding='UTF-8') as subtree_file:
+            for line in subtree_file:
+                tokens = line.split('#', 1)[0].split()
+                if not tokens:
+                    continue
+                pattern = tokens[0]
+                while pattern.endswith(('/*', '/**')):
+                    pattern = pattern.rsplit('/', 1)[0]
+                if pattern in ('*', '**'):
+                    pattern = ''
+                if any(x in pattern for x in SubtreeScan.GLOB_CHARS):
+                    logging.warning('Ignoring unsupported pattern %s', tokens[0])
+                    continue
+                subtrees.append(SubtreeScan.normalise(pattern))
+        return subtrees
+
+    def get_subtrees(self, file_path):
+        """
+        Get the sub-trees containing a file: the ones of its directory are computed once
+        from the prefixes of the directory
+
+        :param file_path: Path of the file relative to the root of the repository
+        :type file_path: str
+        :return: Indexes of the sub-trees
+        :rtype: tuple(int)
+        """
+        directory = file_path.rpartition('/')[0]
+        indexes = self.directories.get(directory)
+        if indexes is None:
+            indexes = ()
+            if '' in self.prefixes:
+                indexes = (self.prefixes[''],)
+            prefix = ''
+            for part in directory.split('/') if directory else ():
+                prefix = part if not prefix else prefix + '/' + part
+                if prefix in self.prefixes:
+                    indexes += (self.prefixes[prefix],)
+            self.directories[directory] = indexes
+        if file_path in self.prefixes:
+            indexes += (self.prefixes[file_path],)
+        return indexes
+
+    def build(self):
+        """
+        Scan once the history with the names of the files changed by each commit, and keep
+        the first and last commit dates of each developer in each sub-tree
+        """
+        logging.info('Scanning %d sub-trees of %s', len(self.subtrees), self.vcs_path)
+        nb_commits = 0
+        for uuid, ordinal, files in knowledgemap.KnowledgeMap.iter_commits(
+                self.vcs_path, '--name-only', self.authors):
+            if self.first_ordinal is None or ordinal < self.first_ordinal:
+                self.first_ordinal = ordinal
+            nb_commits += 1
+            # A commit changing several files of a sub-tree is counted once
+            touched = set()
+            for file_path in files:
+                touched.update(self.get_subtrees(file_path))
+            for index in touched:
+                stats = self.developers[index].get(uuid)
+                if stats is None:
+                    self.developers[index][uuid] = [ordinal, ordinal]
+                elif ordinal < stats[0]:
+                    stats[0] = ordinal
+                elif ordinal > stats[1]:
+                    stats[1] = ordinal
+        logging.info('Sub-trees scanned - Nb Commits: %d', nb_commits)
+
+    def get_developers(self, index, author_dict=None, resolve_uuid=None):
+        """
+        Get the developers of a sub-tree (see KnowledgeMap.build_developers)
+
+        :param index: Index of the sub-tree
+        :type index: int
+        :param author_dict: Developer dictionary of the project giving the departures and
+                            the exclusions
+        :type author_dict: dict(str->Developer)
+        :param resolve_uuid: Function giving the developer representing an author (see
+                             VCSManager.resolve_uuid), an alias is merged in its developer
+        :type resolve_uuid: function
+        :return: Developers of the sub-tree
+        :rtype: list(Developer)
+        """
+        return knowledgemap.KnowledgeMap.build_developers(self.developers[index], self.authors,
+                                                          author_dict, resolve_uuid)
+
+    def get_start_date(self):
+        """
+        Get the first date of the analysis of all the sub-trees: the day after the first
+        commit of the repository
+
+        :return: Start date
+        :rtype: datetime.date
+        """
+        return knowledgemap.KnowledgeMap.get_day_after(self.first_ordinal, self.vcs_path)
+
+    def get_dirname(self, index):
+        """
+        Get the path of the output directory of a sub-tree relative to the directory of all
+        the sub-trees: it follows the layout of the repository so that sub-trees such as a/b
+        and a_b do not collide, the directory of the root being '.'
+
+        :param index: Index of the sub-tree
+        :type index: int
+        :return: Relative path of the directory
+        :rtype: str
+        """
+        return os.path.join(*self.subtrees[index].split('/')) if self.subtrees[index] else '.'
@@ -0,0 +1,110 @@
+"""
+Module for class TierModel
+"""
+
+import bisect
+import json
+import logging
+
+
+class TierModel:
+    """
+    Class defining the tiers of experience of the developers: each tier starts after a
+    number of days of real experience, the tier of a developer is found by a binary search
+    """
+
+    DEFAULT_TIERS = (('Junior', 0), ('Advanced', 365), ('Senior', 730))
+
+    def __init__(self, tiers=DEFAULT_TIERS):
+        """
+        Model of the tiers of experience
+
+        :param tiers: Name and minimal number of days of real experience of each tier, in
+                      ascending order. The first tier starts at 0 day.
+        :type tiers: iterable(tuple(str, int))
+        """
+        tiers = [(str(x), int(y)) for x, y in tiers]
+        if not tiers:
+            raise ValueError('At least one tier is required')
+        self.names = [x for x, _ in tiers]
+        self.thresholds = [x for _, x in tiers]
+        if self.thresholds[0] != 0:
+            raise ValueError('The first tier {0} must start at 0 day'.format(self.names[0]))
+        for (name, days), previous in zip(tiers[1:], self.thresholds):
+            if days <= previous:
+                raise ValueError('Tier {0} must start after {1} days'.format(name, previous))
+        if len(set(self.get_columns())) != len(tiers):
+            raise ValueError('Duplicated tier names {0}'.format(self.names))
+
+    def __len__(self):
+        return len(self.names)
+
+    def __eq__(self, other):
+        return isinstance(other, TierModel) and self.names == other.names and \
+            self.thresholds == other.thresholds
+
+    def __hash__(self):
+        return hash((tuple(self.names), tuple(self.thresholds)))
+
+    def classify(self, days):
+        """
+        Get the tier of a number of days of real experience
+
+        :param days: Number of days of real experience
+        :type days: int
+        :return: Index of the tier
+        :rtype: int
+        """
+        return max(0, bisect.bisect_right(self.thresholds, days) - 1)
+
+    def get_fields(self):
+        """
+        Get the names of the CSV columns of the number of developers of each tier
+
+        :return: Names of the columns
+        :rtype: list(str)
+        """
+        return ['Nb {0}'.format(x) for x in self.names]
+
+    def get_columns(self):
+        """
+        Get the identifiers of the columns of the number of developers of each tier, such as
+        nb_junior
+
+        :return: Identifiers of the columns
+        :rtype: list(str)
+        """
+        return ['nb_' + '_'.join(x.lower().split()) for x in self.names]
+
+    def get_definitions(self):
+        """
+        Get the definition of the tiers
+
+        :return: Name and minimal number of days of each tier
+        :rtype: list(tuple(str, int))
+        """
+        return list(zip(self.names, self.thresholds))
+
+    @staticmethod
+    def load(path):
+        """
+        Load the tiers from a JSON file such as:
+            {"tiers": [{"name": "Junior", "min_days": 0},
+                       {"name": "Advanced", "min_days": 365},
+                       {"name": "Senior", "min_days": 730}]}
+
+        :param path: Path of the JSON file
+        :type path: str
+        :return: Model of the tiers
+        :rtype: TierModel
+        """
+        logging.info('Loading tiers of experience from %s', path)
+        with open(path, mode='r', encoding='UTF-8') as config_file:
+            config = json.load(config_file)
+        try:
+            return TierModel((x['name'], x['min_days']) for x in config['tiers'])
+        except (KeyError, TypeError) as exc:
+            raise ValueError('Invalid tiers in {0}: {1}'.format(path, exc)) from exc
+
+
+DEFAULT_MODEL = TierModel()
@@ -3,12 +3,21 @@ Module for class VCSManager
 """
 
 import datetime
+import json
 import logging
 import os
-import subprocess
 import sys
 
+import commitcache
+import departure
 import developer
+import gitbackend
+import gitqueries
+import identity
+import nativegit
+import profiler
+import refscan
+import shardscan
 
 
 class VCSManager:
@@ -16,100 +25,531 @@ class VCSManager:
     Class which realises operations on the VCS repository
     """
 
-    GIT_LOG_CMD = 'git --git-dir={0}' + os.path.sep + '.git  --work-tree={0} log {1}'
-    AUTHOR_FORMAT = '"--pretty=%an;%ae"'
-    AUTHOR_DATE = '--author={0} --pretty="%aI"'
+    BACKENDS = {'git': gitbackend.GitCommandBackend, 'native': nativegit.NativeGitBackend}
+    STATE_VERSION = 1
 
-    def __init__(self, vcs_path):
+    def __init__(self, vcs_path, backend='git'):
         """
         Class in a charge of retrieving developer information from a VCS (Version Control System)
 
         :param vcs_path: Path to the VCS repository
         :type vcs_path: str
+        :param backend: Name of the backend used to read the repository: 'git' launches the
+                        git command, 'native' reads directly the objects of the repository
+        :type backend: str
         """
+        if backend not in VCSManager.BACKENDS:
+            raise ValueError('Unknown backend {0}'.format(backend))
         self.vcs_path = vcs_path
+        self.backend_name = backend
+        self.backend = VCSManager.BACKENDS[backend](vcs_path)
         self.max_number_of_authors = sys.maxsize
         self.author_dict = dict()
+        self.commit_dates = dict()
+        self.author_emails = dict()
+        self.merged_uuids = dict()
         self.first_commit_repo = datetime.date.max
+        self.head = None
+        # Optional writer receiving each commit read (see resultstore.CommitWriter)
+        self.commit_writer = None
+        # Optional sharded scan of the full history (see shardscan.ShardedScan)
+        self.sharded_scan = None
+        # Optional directory of the binary cache of the commits (see commitcache.CommitCache)
+        self.commit_cache_dir = None
+        # Days of the commits of each author, only kept when needed (see keep_commit_days)
+        self.commit_days = None
 
-    def build_author_dict(self, full=True):
+    def build_author_dict(self, full=True, state_path=None):
         """
         Build the author directory by getting the authors list and their first/last commit dates
 
         :param full: Retrieve also the date
         :type bool
+        :param state_path: Path of the state of a previous analysis. If it is given, only the
+                           commits which have been added since this analysis are retrieved.
+        :type state_path: str
         """
-        self.retrieve_author()
+        self.head = self.retrieve_head()
+        rev_range = ''
+        if state_path is not None:
+            last_head = self.load_state(state_path)
+            if last_head is None:
+                logging.info('No previous analysis, full scan of the history')
+            elif last_head == self.head:
+                logging.info('No new commit since %s', last_head)
+                rev_range = None
+            elif self.is_ancestor(last_head, self.head):
+                logging.info('Incremental scan from %s to %s', last_head, self.head)
+                rev_range = '{0}..{1}'.format(last_head, self.head)
+            else:
+                logging.warning('History has been rewritten since %s, full scan of the history',
+                                last_head)
+                self.reset()
+        if rev_range == '' and self.commit_cache_dir is not None and self.head is not None:
+            self.retrieve_author_cached()
+        elif rev_range == '' and self.sharded_scan is not None:
+            self.retrieve_author_sharded()
+        elif rev_range is not None:
+            self.retrieve_author(rev_range)
         if full:
             self.retrieve_commit_date()
 
-    def retrieve_author(self):
-        """
-        Get the authors list by using a command of the VCS
-
-        """
-        logging.info('Retrieving author')
-        vcs_cmd = VCSManager.GIT_LOG_CMD.format(self.vcs_path, VCSManager.AUTHOR_FORMAT)
-        logging.info(vcs_cmd)
-        output = subprocess.check_output(vcs_cmd, shell=True).decode("utf-8")
-        idx = 0
-        log_percent = 0
-        output_set = set(str(output).split('\n'))
-        for line in output_set:
-            if idx/len(output_set) > log_percent:
-                logging.info('Processing Author: %.2f%%', 100*idx/len(output_set))
-                log_percent += 0.1
-            if idx > self.max_number_of_authors:
-                logging.warning('Maximal number or author reached')
-                break
-            logging.debug('Processing line %s', line)
-            idx += 1
-            data = line.split(';')
-            if len(data) != 2:
+    def build_author_dict_from_refs(self, patterns):
+        """
+        Build the author directory from the commits reachable from several references,
+        walked once whatever the number of references reaching them
+
+        :param patterns: Patterns of the references, such as refs/heads/release/*
+        :type patterns: list(str)
+        :return: Scan of the references giving the author table of each reference
+        :rtype: RefScan
+        """
+        self.reset()
+        self.head = None
+        with profiler.PROFILER.stage('retrieve_author'):
+            logging.info('Retrieving author of references %s', ', '.join(patterns))
+            scan = refscan.RefScan(self.backend, patterns)
+            scan.build(self.commit_days)
+            self.add_author_table(scan.get_author_table())
+            profiler.PROFILER.add('records', scan.nb_commits)
+            logging.info('Dictionary of author build - Nb Authors: %d', len(self.author_dict))
+        self.retrieve_commit_date()
+        return scan
+
+    def reset(self):
+        """
+        Forget all the authors and commit dates already retrieved
+        """
+        self.author_dict.clear()
+        self.commit_dates.clear()
+        self.author_emails.clear()
+        self.merged_uuids.clear()
+        if self.commit_days is not None:
+            self.commit_days.clear()
+        self.first_commit_repo = datetime.date.max
+
+    def keep_commit_days(self):
+        """
+        Keep the days on which each author has committed, which are required by the
+        activity metrics. They must be kept before the history is scanned.
+        """
+        if self.commit_days is None:
+            self.commit_days = dict()
+
+    def retrieve_head(self):
+        """
+        Get the identifier of the commit currently checked out
+
+        :return: SHA of HEAD or None if the repository does not have any commit
+        :rtype: str
+        """
+        return self.backend.retrieve_head()
+
+    def is_ancestor(self, ancestor, commit):
+        """
+        Tell if a commit is an ancestor of another one, i.e. if the history between them
+        has not been rewritten
+
+        :param ancestor: SHA of the possible ancestor
+        :type ancestor: str
+        :param commit: SHA of the descendant
+        :type commit: str
+        :return: Boolean telling if ancestor is reachable from commit
+        :rtype: bool
+        """
+        if commit is None:
+            return False
+        return self.backend.is_ancestor(ancestor, commit)
+
+    def save_state(self, path):
+        """
+        Save the author table, the processed HEAD and the first commit date of the repository
+        so that a next analysis only has to process the new commits
+
+        :param path: Path of the state file
+        :type path: str
+        """
+        if self.head is None:
+            return
+        logging.info('Saving analysis state in %s', path)
+        authors = []
+        for key, dates in self.commit_dates.items():
+            dev = self.author_dict.get(key)
+            if dev is not None:
+                author = {'name': dev.name, 'email': dev.email,
+                          'emails': sorted(self.author_emails.get(key, ())),
+                          'first': dates[0], 'last': dates[1]}
+                if self.commit_days is not None:
+                    author['days'] = sorted(self.commit_days.get(key, ()))
+                authors.append(author)
+        first_commit_repo = None
+        if self.first_commit_repo != datetime.date.max:
+            first_commit_repo = self.first_commit_repo.isoformat()
+        state = {'version': VCSManager.STATE_VERSION, 'head': self.head,
+                 'first_commit_repo': first_commit_repo, 'authors': authors}
+        with open(path, mode='w', encoding='UTF-8') as state_file:
+            json.dump(state, state_file)
+
+    def load_state(self, path):
+        """
+        Restore the author table saved by a previous analysis
+
+        :param path: Path of the state file
+        :type path: str
+        :return: SHA of the HEAD processed by the previous analysis or None if
+                 there is no usable state
+        :rtype: str
+        """
+        if not os.path.isfile(path):
+            return None
+        logging.info('Loading analysis state from %s', path)
+        with open(path, mode='r', encoding='UTF-8') as state_file:
+            try:
+                state = json.load(state_file)
+            except ValueError as exc:
+                logging.warning('Invalid state file %s: %s', path, exc)
+                return None
+        if state.get('version') != VCSManager.STATE_VERSION:
+            logging.warning('Unsupported state version %s', state.get('version'))
+            return None
+        if self.commit_days is not None and any('days' not in x for x in state['authors']):
+            logging.info('The commit days are not in the state %s', path)
+            return None
+        self.reset()
+        for author in state['authors']:
+            dev = developer.Developer(author['name'], author['email'])
+            self.author_dict[dev.uuid] = dev
+            self.commit_dates[dev.uuid] = [author['first'], author['last']]
+            self.author_emails[dev.uuid] = set(author.get('emails', [author['email']]))
+            if self.commit_days is not None:
+                self.commit_days[dev.uuid] = set(author['days'])
+        if state['first_commit_repo'] is not None:
+            self.first_commit_repo = datetime.date.fromisoformat(state['first_commit_repo'])
+        return state['head']
+
+    def retrieve_author(self, rev_range='', cache_writer=None):
+        """
+        Get the authors list and the date of each of their commits with a single
+        traversal of the history by using the backend of the VCS.
+        The log is streamed so that each commit is folded in the author table as
+        soon as it is read. The commit dates are kept per author until
+        retrieve_commit_date is called.
+
+        :param rev_range: Range of commits to process, all the history by default
+        :type rev_range: str
+        :param cache_writer: Writer of the binary cache of the commits, no cache by default
+        :type cache_writer: commitcache.CommitCacheWriter
+        """
+        with profiler.PROFILER.stage('retrieve_author'):
+            logging.info('Retrieving author')
+            nb_commits = 0
+            writers = [x for x in (self.commit_writer, cache_writer) if x is not None]
+            for writer in writers:
+                writer.begin(rev_range)
+            for name, email, iso_date in self.backend.iter_commits(rev_range):
+                self.add_commit(name, email, iso_date)
+                for writer in writers:
+                    writer.add_commit(name, email, iso_date)
+                nb_commits += 1
+            for writer in writers:
+                writer.end()
+            profiler.PROFILER.add('records', nb_commits)
+            logging.info('Dictionary of author build - Nb Authors: %d', len(self.author_dict))
+
+    def set_commit_cache(self, cache_dir):
+        """
+        Cache the commits of the full history in a binary file, so that a later scan of the
+        same references only reads back the file
+
+        :param cache_dir: Directory of the cache files
+        :type cache_dir: str
+        """
+        self.commit_cache_dir = cache_dir
+
+    def retrieve_author_cached(self):
+        """
+        Get the authors list and their first/last commit days from the commit cache of the
+        current HEAD. Without cache, the history is scanned with a single traversal which
+        fills the cache. The commit writer needs the commits, so the cache is only filled
+        when it is used.
+        """
+        cache = commitcache.CommitCache(self.commit_cache_dir, self.vcs_path, [self.head])
+        if self.commit_writer is None and cache.exists():
+            with profiler.PROFILER.stage('retrieve_author'):
+                logging.info('Retrieving author from the commit cache')
+                days = dict() if self.commit_days is not None else None
+                table = cache.get_author_table(days)
+                if table is not None:
+                    self.add_author_table(table)
+                    for key, dev_days in (days or {}).items():
+                        self.commit_days.setdefault(key, set()).update(dev_days)
+                    profiler.PROFILER.add('records', len(table))
+                    logging.info('Dictionary of author build - Nb Authors: %d',
+                                 len(self.author_dict))
+                    return
+        self.retrieve_author(cache_writer=commitcache.CommitCacheWriter(cache))
+
+    def set_sharding(self, shard_size, max_workers=None, cache_dir=None):
+        """
+        Scan the full history in parallel shards instead of a single traversal
+
+        :param shard_size: Number of first-parent commits of each shard
+        :type shard_size: int
+        :param max_workers: Number of worker processes, number of CPUs by default
+        :type max_workers: int
+        :param cache_dir: Directory of the author tables of the shards, no cache by default
+        :type cache_dir: str
+        """
+        self.sharded_scan = shardscan.ShardedScan(self.vcs_path, self.backend_name, shard_size,
+                                                  max_workers, cache_dir)
+
+    def retrieve_author_sharded(self):
+        """
+        Get the authors list and their first/last commit days by scanning the shards of the
+        history in parallel. The commit writer and the commit days need the commits, so a
+        single traversal is done when they are used.
+        """
+        if self.commit_writer is not None or self.commit_days is not None:
+            logging.info('Commits are stored or their days are kept, the history is not sharded')
+            self.retrieve_author()
+            return
+        with profiler.PROFILER.stage('retrieve_author'):
+            logging.info('Retrieving author with a sharded scan')
+            if self.head is None:
+                return
+            table = self.sharded_scan.run(self.backend.list_first_parents(self.head))
+            self.add_author_table(table)
+            profiler.PROFILER.add('records', len(table))
+            logging.info('Dictionary of author build - Nb Authors: %d', len(self.author_dict))
+
+    def get_author_table(self):
+        """
+        Get the authors retrieved and their commit days as an author table
+        (see shardscan.ShardedScan.merge)
+
+        :return: Author table
+        :rtype: dict(str->list)
+        """
+        return {key: [dev.name, dev.email, self.commit_dates[key][0], self.commit_dates[key][1],
+                      sorted(self.author_emails[key])]
+                for key, dev in self.author_dict.items() if key in self.commit_dates}
+
+    def add_author_table(self, table):
+        """
+        Take into account the authors of an author table as if their commits had been read
+
+        :param table: Author table (see shardscan.ShardedScan.merge)
+        :type table: dict(str->list)
+        """
+        for key, (name, email, first, last, emails) in table.items():
+            dates = self.commit_dates.get(key)
+            if dates is None:
+                self.author_dict[key] = developer.Developer(name, email)
+                self.commit_dates[key] = [first, last]
+                self.author_emails[key] = set(emails)
                 continue
-            dev = developer.Developer(data[0], data[1])
+            self.author_emails[key].update(emails)
+            if first < dates[0]:
+                dates[0] = first
+            if last > dates[1]:
+                dates[1] = last
+                self.author_dict[key].email = email
+
+    def resolve_uuid(self, uuid):
+        """
+        Get the developer which now represents an author, following the merges of identities
+
+        :param uuid: UUID of the author
+        :type uuid: str
+        :return: UUID of the developer in the author dictionary, the UUID of the author if
+                 it has not been merged
+        :rtype: str
+        """
+        while uuid not in self.author_dict and uuid in self.merged_uuids:
+            uuid = self.merged_uuids[uuid]
+        return uuid
+
+    def resolve_author_table(self, table):
+        """
+        Get an author table whose authors merged in a developer of this manager are
+        replaced by this developer
+
+        :param table: Author table (see shardscan.ShardedScan.merge)
+        :type table: dict(str->list)
+        :return: Author table
+        :rtype: dict(str->list)
+        """
+        resolved = {}
+        for uuid, values in table.items():
+            uuid = self.resolve_uuid(uuid)
+            if uuid in self.author_dict:
+                values = [self.author_dict[uuid].name] + values[1:]
+            shardscan.ShardedScan.merge(resolved, {uuid: values})
+        return resolved
+
+    def add_commit(self, name, email, iso_date):
+        """
+        Take into account a commit of the history: the author is created if it is
+        unknown and its first/last commit dates (and its email) are updated.
+
+        :param name: Name of the author of the commit
+        :type name: str
+        :param email: Email of the author of the commit
+        :type email: str
+        :param iso_date: Author date of the commit with the ISO 8601 format
+        :type iso_date: str
+        """
+        # ISO 8601 dates can be compared as strings
+        day = iso_date[:10]
+        uuid = developer.Developer.compute_uuid(name)
+        dates = self.commit_dates.get(uuid)
+        if dates is None:
+            if len(self.author_dict) >= self.max_number_of_authors:
+                logging.warning('Maximal number or author reached, ignore %s', name)
+                return
+            dev = developer.Developer(name, email)
             self.author_dict[dev.uuid] = dev
-        logging.info('Dictionary of author build - Nb Authors: %d', len(self.author_dict))
+            self.commit_dates[dev.uuid] = [day, day]
+            self.author_emails[dev.uuid] = {email}
+            if self.commit_days is not None:
+                self.commit_days[dev.uuid] = {day}
+            return
+        self.author_emails[uuid].add(email)
+        if self.commit_days is not None:
+            self.commit_days[uuid].add(day)
+        if day < dates[0]:
+            dates[0] = day
+        elif day > dates[1]:
+            dates[1] = day
+            # Keep the email of the most recent commit
+            self.author_dict[uuid].email = email
 
     def retrieve_commit_date(self):
         """
-        Get the first and last commit dates of the author by using a command of the VCS
-
-        """
-        logging.info('Retrieving commit date')
-        vcs_cmd = VCSManager.GIT_LOG_CMD.format(self.vcs_path, VCSManager.AUTHOR_DATE)
-        logging.info(vcs_cmd)
-        idx = 0
-        log_percent = 0
-        dev_to_del = []
-        for key, dev in self.author_dict.items():
-            if (idx/len(self.author_dict.items())) > log_percent:
-                logging.info('Retrieving commit date: %f%%', 100*idx/len(self.author_dict.items()))
-                log_percent += 0.1
-            idx += 1
-            # repr() must be use to convert possible escape characters
-            logging.debug(vcs_cmd.format(VCSManager.repr_spe(dev.name)))
-            commit_dates = subprocess.check_output(vcs_cmd.format(
-                VCSManager.repr_spe(dev.name)), shell=True).decode("utf-8")
-            if commit_dates == '':
-                logging.warning(vcs_cmd.format(VCSManager.repr_spe(dev.name)))
-                logging.warning('%s does not have commit for %s', dev.name, commit_dates)
-                dev_to_del.append(key)
-                continue
-            dates_list = commit_dates.split('\n')
-            first_date = dates_list[-2] if dates_list[-1] == '' else dates_list[-1]
-            last_date = dates_list[0]
-            logging.debug('Commit of %s - First: %s - Last: %s', dev.name, first_date, last_date)
-            if first_date is None or last_date is None:
-                logging.warning('%s does not have commit for %s', dev.name, commit_dates)
-                dev_to_del.append(key)
+        Set the first and last commit dates of the authors from the commits
+        gathered by retrieve_author
+
+        """
+        with profiler.PROFILER.stage('retrieve_commit_date'):
+            logging.info('Retrieving commit date')
+            dev_to_del = []
+            for key, dev in self.author_dict.items():
+                dates = self.commit_dates.get(key)
+                if dates is None:
+                    logging.warning('%s does not have commit', dev.name)
+                    dev_to_del.append(key)
+                    continue
+                logging.debug('Commit of %s - First: %s - Last: %s', dev.name, dates[0], dates[1])
+                dev.set_first_commit_date(dates[0])
+                dev.set_last_commit_date(dates[1])
+                self.update_first_commit_date(dev.first_commit_date)
+            for key in dev_to_del:
+                logging.warning('Deletion of %s %s', key, self.author_dict[key].name)
+                del self.author_dict[key]
+
+    def merge_author_dict(self, author_dict, author_emails=None, commit_days=None):
+        """
+        Merge the authors retrieved from another repository: a developer known by both is
+        identified by its UUID and keeps the earliest first commit date and the latest
+        last commit date.
+
+        :param author_dict: Developer dictionary with commit dates
+        :type author_dict: dict(str->Developer)
+        :param author_emails: All the emails used by each developer
+        :type author_emails: dict(str->set(str))
+        :param commit_days: Days (%Y-%m-%d) of the commits of each author, merged with the
+                            ones already kept (see keep_commit_days)
+        :type commit_days: dict(str->set(str))
+        """
+        if self.commit_days is not None and commit_days is not None:
+            for key, days in commit_days.items():
+                self.commit_days.setdefault(key, set()).update(days)
+        for key, dev in author_dict.items():
+            if dev.first_commit_date is None:
                 continue
-            dev.set_first_commit_date(first_date)
-            dev.set_last_commit_date(last_date)
-            self.update_first_commit_date(dev.first_commit_date)
-        for key in dev_to_del:
-            logging.warning('Deletion of %s %s', key, self.author_dict[key].name)
-            del self.author_dict[key]
+            emails = self.author_emails.setdefault(key, set())
+            emails.add(dev.email)
+            if author_emails is not None:
+                emails.update(author_emails.get(key, ()))
+            dates = self.commit_dates.get(key)
+            if dates is None:
+                self.author_dict[key] = dev
+                self.commit_dates[key] = [dev.get_first_commit_date(), dev.get_last_commit_date()]
+            else:
+                known_dev = self.author_dict[key]
+                if dev.get_first_commit_date() < dates[0]:
+                    dates[0] = dev.get_first_commit_date()
+                    known_dev.first_commit_date = dev.first_commit_date
+                if dev.get_last_commit_date() > dates[1]:
+                    dates[1] = dev.get_last_commit_date()
+                    known_dev.last_commit_date = dev.last_commit_date
+                    known_dev.email = dev.email
+            self.update_first_commit_date(self.author_dict[key].first_commit_date)
+
+    def resolve_identities(self, mailmap_path=None):
+        """
+        Merge automatically the developers who are the same person: same normalised email,
+        same normalised name or same identity in the mailmap. The merged developers become
+        aliases of the one with the proper name or else with the earliest first commit.
+
+        :param mailmap_path: Path of the .mailmap file, the one of the repository by default
+        :type mailmap_path: str
+        """
+        if mailmap_path is None:
+            mailmap_path = os.path.join(self.vcs_path, identity.IdentityResolver.MAILMAP_FILENAME)
+        logging.info('Resolving identities of %d authors', len(self.author_dict))
+        if any(x.first_commit_ordinal is None for x in self.author_dict.values()):
+            raise ValueError('Commit dates are required to resolve identities')
+        with profiler.PROFILER.stage('resolve_identities'):
+            resolver = identity.IdentityResolver(mailmap_path)
+            clusters = resolver.resolve(self.author_dict, self.author_emails)
+            merged_uuids = identity.IdentityResolver.merge(self.author_dict, clusters)
+        for uuid, canonical in merged_uuids.items():
+            dev = self.author_dict[canonical]
+            self.commit_dates[canonical] = [dev.get_first_commit_date(), dev.get_last_commit_date()]
+            self.author_emails.setdefault(canonical, set()).update(
+                self.author_emails.pop(uuid, ()))
+            self.commit_dates.pop(uuid, None)
+        self.merged_uuids.update(merged_uuids)
+        logging.info('Identities resolved - Nb Merged: %d - Nb Authors: %d', len(merged_uuids),
+                     len(self.author_dict))
+
+    def detect_departures(self, gap_days=departure.DepartureDetector.GAP_DAYS, percentile=None):
+        """
+        Mark as departed the developers who have not committed for a long time
+
+        :param gap_days: Number of days without commit after which a developer has left,
+                         minimal number of days with a percentile
+        :type gap_days: int
+        :param percentile: Percentile of the gaps between the commit days of each developer
+                           after which the developer has left (commit days must be kept)
+        :type percentile: float
+        :return: UUIDs of the developers detected as departed
+        :rtype: list(str)
+        """
+        with profiler.PROFILER.stage('detect_departures'):
+            detector = departure.DepartureDetector(gap_days, percentile)
+            return detector.detect(self.author_dict, self.commit_days, self.resolve_uuid)
+
+    def query_authors(self, filters, max_concurrency=None):
+        """
+        Run a git query per author filter, several queries being run concurrently
+
+        :param filters: Pattern of the author (name and/or email), start and end dates
+                        (None if not limited) of each filter
+        :type filters: list(tuple(str))
+        :param max_concurrency: Maximal number of queries running at the same time, number
+                                of CPUs by default
+        :type max_concurrency: int
+        :return: Number of commits, first and last commit days (None without commit)
+                 in the order of the filters
+        :rtype: list(tuple)
+        """
+        with profiler.PROFILER.stage('query_authors'):
+            executor = gitqueries.GitQueryExecutor(self.vcs_path, max_concurrency)
+            results = executor.query_authors(filters)
+            profiler.PROFILER.add('records', len(filters))
+        return results
 
     def compute_first_commit_date(self):
         """
@@ -130,23 +570,3 @@ class VCSManager:
         if date < self.first_commit_repo:
             logging.debug('First commit of repository is now: %s', date)
             self.first_commit_repo = date
-
-    @staticmethod
-    def repr_spe(esc_str):
-        """
-        Own repr implementation to bypass double quote problem
-
-        :param esc_str: String to change
-        :type esc_str: str
-        :return: New string that can be inserted in a commande line
-        :rtype: str
-        """
-        esc_str = esc_str.replace('@', '@@')
-        esc_str = esc_str.replace('"', '+ at +')
-        esc_str = esc_str.replace("'", '- at -')
-        esc_str = repr(esc_str)[1:-1]
-        # Reverse the changes
-        esc_str = esc_str.replace('- at -', "'")
-        esc_str = esc_str.replace('+ at +', r'\"')
-        esc_str = esc_str.replace('@@', '@')
-        return '"%s"' % esc_str
@@ -4,12 +4,25 @@ Module for class XPAnalyser
 
 import csv
 import datetime
+import heapq
+import itertools
 import logging
 import os
 
+import activity
 import authorcsv
 import experience
+import experienceseries
+import knowledgemap
+import periods
+import profiler
+import resultstore
+import sinks
+import subtreescan
+import tiers
 import vcsmanager
+import xpengine
+import xpindex
 
 
 class XPAnalyser:
@@ -18,9 +31,16 @@ class XPAnalyser:
     """
 
     OUTPUT_FILENAME = "experience.csv"
-    DEFAULT_INCREMENT = 1
+    ACTIVITY_FILENAME = "activity.csv"
+    QUERIES_FILENAME = "author_queries.csv"
+    STATE_FILENAME = "devxp_state.json"
+    SHARDS_DIRNAME = "shards"
+    COMMIT_CACHE_DIRNAME = "commit_cache"
+    SUBTREES_DIRNAME = "subtrees"
+    REFS_DIRNAME = "refs"
+    DEFAULT_GRANULARITY = 'monthly'
 
-    def __init__(self, path, work_dir=""):
+    def __init__(self, path, work_dir="", backend='git'):
         """
         Class in charge of the analysis
 
@@ -28,31 +48,181 @@ class XPAnalyser:
         :type path: str
         :param work_dir: Path to the working directory (for output and output file)
         :type work_dir: str
+        :param backend: Name of the backend used to read the repository ('git' or 'native')
+        :type backend: str
         """
         self.path = path
-        self.vcs_mgr = vcsmanager.VCSManager(path)
+        self.vcs_mgr = vcsmanager.VCSManager(path, backend)
         self.work_dir = work_dir
         self.csv_path = os.path.join(self.work_dir, XPAnalyser.OUTPUT_FILENAME)
+        self.state_path = os.path.join(self.work_dir, XPAnalyser.STATE_FILENAME)
         self.author_csv = None
-        self.experiences = []
+        self.experiences = {}
+        self.store = None
+        self.xp_index = None
+        self.tier_model = tiers.DEFAULT_MODEL
+        self.ref_scan = None
 
-    def retrieve_author_information_from_repo(self, full=True):
+    def retrieve_author_information_from_repo(self, full=True, incremental=False):
         """
         Retrieve all the information of the author of the repository
 
         :param full: Retrieve also the date
         :type bool
+        :param incremental: Only process the commits added since the previous analysis
+                            saved in the working directory
+        :type incremental: bool
         """
         logging.info('Retrieving author information from repository %s', self.path)
-        self.vcs_mgr.build_author_dict(full)
-        self.author_csv = authorcsv.AuthorCSV(self.vcs_mgr.author_dict, self.work_dir)
+        if self.store is not None:
+            self.vcs_mgr.commit_writer = self.store.get_commit_writer(self.path)
+        self.vcs_mgr.build_author_dict(full, self.state_path if incremental else None)
+        if full:
+            self.vcs_mgr.save_state(self.state_path)
+        self.author_csv = authorcsv.AuthorCSV(self.vcs_mgr, self.work_dir)
+        self.xp_index = None
+
+    def retrieve_author_information_from_refs(self, patterns):
+        """
+        Retrieve the information of the authors of the commits reachable from several
+        references instead of HEAD, with a single traversal of the history
+
+        :param patterns: Patterns of the references, such as refs/heads/release/*
+        :type patterns: list(str)
+        """
+        logging.info('Retrieving author information from references of repository %s',
+                     self.path)
+        self.ref_scan = self.vcs_mgr.build_author_dict_from_refs(patterns)
+        self.author_csv = authorcsv.AuthorCSV(self.vcs_mgr, self.work_dir)
+        self.xp_index = None
+
+    def load_tiers(self, path):
+        """
+        Use the tiers of experience defined in a JSON file instead of junior, advanced and
+        senior (see TierModel.load)
+
+        :param path: Path of the JSON file
+        :type path: str
+        """
+        self.tier_model = tiers.TierModel.load(path)
+        self.xp_index = None
+
+    def set_sharding(self, shard_size, max_workers=None):
+        """
+        Scan the full history in parallel shards whose author tables are cached in the
+        working directory
+
+        :param shard_size: Number of first-parent commits of each shard
+        :type shard_size: int
+        :param max_workers: Number of worker processes, number of CPUs by default
+        :type max_workers: int
+        """
+        self.vcs_mgr.set_sharding(shard_size, max_workers,
+                                  os.path.join(self.work_dir, XPAnalyser.SHARDS_DIRNAME))
+
+    def enable_commit_cache(self):
+        """
+        Cache the commits of the full history in the working directory, the cache is read
+        back instead of scanning the history as long as HEAD has not moved
+        """
+        self.vcs_mgr.set_commit_cache(os.path.join(self.work_dir,
+                                                   XPAnalyser.COMMIT_CACHE_DIRNAME))
+
+    def open_store(self, path=None):
+        """
+        Store the results in a SQLite database in addition to the CSV files: the commits read
+        from the repository, the developers and the experience series
+
+        :param path: Path of the database, devxp.sqlite in the working directory by default
+        :type path: str
+        """
+        if path is None:
+            path = os.path.join(self.work_dir, resultstore.ResultStore.STORE_FILENAME)
+        self.store = resultstore.ResultStore(path)
+
+    def save_developers_in_store(self):
+        """
+        Write the developers, with the changes of the CSV file, in the store
+        """
+        self.store.save_developers(self.path, self.vcs_mgr.author_dict, self.vcs_mgr.head)
+
+    def merge_author_information(self, author_dict, author_emails=None, commit_days=None):
+        """
+        Add the authors retrieved from another repository to the analysis
+
+        :param author_dict: Developer dictionary with commit dates
+        :type author_dict: dict(str->Developer)
+        :param author_emails: All the emails used by each developer
+        :type author_emails: dict(str->set(str))
+        :param commit_days: Days (%Y-%m-%d) of the commits of each author
+        :type commit_days: dict(str->set(str))
+        """
+        self.vcs_mgr.merge_author_dict(author_dict, author_emails, commit_days)
+        self.author_csv = authorcsv.AuthorCSV(self.vcs_mgr, self.work_dir)
+        self.xp_index = None
+
+    def resolve_identities(self, mailmap_path=None):
+        """
+        Merge automatically the authors who are the same person, before the changes of
+        the CSV file which stay the final word
+
+        :param mailmap_path: Path of the .mailmap file, the one of the repository by default
+        :type mailmap_path: str
+        """
+        self.vcs_mgr.resolve_identities(mailmap_path)
+        self.xp_index = None
+
+    def detect_departures(self, gap_days, percentile=None):
+        """
+        Mark as departed the developers who have not committed for a long time: longer than a
+        number of days or than a percentile of the gaps between their own commits. The CSV
+        file of the authors parsed afterwards still overrides them.
+
+        :param gap_days: Number of days without commit after which a developer has left,
+                         minimal number of days with a percentile
+        :type gap_days: int
+        :param percentile: Percentile of the gaps between the commit days of each developer
+        :type percentile: float
+        """
+        self.vcs_mgr.detect_departures(gap_days, percentile)
+        self.xp_index = None
+
+    def query_authors(self, path, max_concurrency=None):
+        """
+        Get the commits of the author filters of a file and save them in a CSV file. Each line
+        of the file is a pattern of the author (name and/or email), optionally followed by
+        the start and end dates of the query, separated by ';'.
+
+        :param path: Path to the file of the filters
+        :type path: str
+        :param max_concurrency: Maximal number of git queries running at the same time
+        :type max_concurrency: int
+        """
+        filters = []
+        with open(os.path.join(self.work_dir, path), mode='r', encoding='UTF-8') as filter_file:
+            for line in filter_file:
+                if not line.strip() or line.startswith('#'):
+                    continue
+                fields = [x.strip() or None for x in line.rstrip('\n').split(';')]
+                filters.append((fields + [None, None])[:3])
+        results = self.vcs_mgr.query_authors(filters, max_concurrency)
+        csv_path = os.path.join(self.work_dir, XPAnalyser.QUERIES_FILENAME)
+        logging.info('Saving author queries in %s', csv_path)
+        with open(csv_path, mode='w', newline='', encoding='UTF-8') as csv_file:
+            query_writer = csv.writer(csv_file, delimiter=';', quotechar='"',
+                                      quoting=csv.QUOTE_MINIMAL)
+            query_writer.writerow(['Author', 'Since', 'Until', 'Nb Commits', 'First Commit',
+                                   'Last Commit'])
+            for author_filter, result in zip(filters, results):
+                query_writer.writerow(list(author_filter) + list(result))
 
     def save_author_information_in_csv(self):
         """
         Write authors' information in a CSV file
 
         """
-        self.author_csv.save_data_in_csv()
+        with profiler.PROFILER.stage('save_author_csv'):
+            self.author_csv.save_data_in_csv()
 
     def get_author_information_from_csv(self, path):
         """
@@ -61,26 +231,303 @@ class XPAnalyser:
         :param path: Path to the CSV file
         :type path: str
         """
-        self.author_csv.update_data_from_csv(os.path.join(self.work_dir, path))
-        self.vcs_mgr.compute_first_commit_date()
+        with profiler.PROFILER.stage('update_data_from_csv'):
+            self.author_csv.update_data_from_csv(os.path.join(self.work_dir, path))
+            self.vcs_mgr.compute_first_commit_date()
+        self.xp_index = None
 
-    def compute_experience(self):
+    def compute_experience(self, granularities=None, save=True, keep=False):
         """
         Compute from the start date of project (i.e. first commit) until today
         all the experience of the developer based on their first commit date and
         when they left the project (if they left it).
+        Several granularities can be computed with a single sweep of the developers' events.
+        Each period is written in the sinks (CSV file, store, series kept in memory) as soon
+        as it is computed, so that the memory used does not depend on the number of periods.
+
+        :param granularities: Time steps of the analysis, monthly by default
+        :type granularities: list(Granularity)
+        :param save: Save the analysis of each granularity in the working directory
+        :type save: bool
+        :param keep: Keep the series of each granularity in experiences, which stays empty
+                     by default
+        :type keep: bool
+        """
+        with profiler.PROFILER.stage('compute_experience'):
+            if granularities is None:
+                granularities = [periods.Granularity(XPAnalyser.DEFAULT_GRANULARITY)]
+            granularity_sinks = {x.name: self.get_sinks(x.name, save, keep) for x in granularities}
+            nb_periods = 0
+            try:
+                for names, values in self.iter_periods(granularities):
+                    for name in names:
+                        for sink in granularity_sinks[name]:
+                            sink.write(values)
+                    nb_periods += 1
+            finally:
+                for granularity_sink in granularity_sinks.values():
+                    for sink in granularity_sink:
+                        sink.close()
+            logging.info('Experience computed on %d dates', nb_periods)
+            profiler.PROFILER.add('records', nb_periods)
+
+    def keep_commit_days(self):
+        """
+        Keep the days of the commits when the repository is scanned, so that the activity
+        can be computed
+        """
+        self.vcs_mgr.keep_commit_days()
+
+    def compute_activity(self, granularities=None, windows=activity.ActivityEngine.WINDOWS):
+        """
+        Compute from the start date of the project until today the number of active
+        developers in trailing windows, the joins, the leaves and the turnover of each
+        period, and save them in activity.csv (activity_<granularity>.csv for the other
+        granularities)
+
+        :param granularities: Time steps of the analysis, monthly by default
+        :type granularities: list(Granularity)
+        :param windows: Number of days of the trailing windows
+        :type windows: tuple(int)
+        """
+        if self.vcs_mgr.commit_days is None:
+            raise ValueError('Commit days are required to compute the activity')
+        with profiler.PROFILER.stage('compute_activity'):
+            if granularities is None:
+                granularities = [periods.Granularity(XPAnalyser.DEFAULT_GRANULARITY)]
+            engine = activity.ActivityEngine(self.vcs_mgr.author_dict.values(),
+                                             self.vcs_mgr.commit_days,
+                                             self.vcs_mgr.resolve_uuid, windows)
+            start_date = self.vcs_mgr.first_commit_repo + datetime.timedelta(1)
+            end_date = datetime.date.today()
+            for granularity in granularities:
+                sink = sinks.CSVSink(self.get_csv_path(granularity.name,
+                                                       XPAnalyser.ACTIVITY_FILENAME),
+                                     fields=engine.get_fields())
+                try:
+                    for values in engine.iter_values(granularity.iter_dates(start_date,
+                                                                            end_date)):
+                        sink.write(values)
+                finally:
+                    sink.close()
+                logging.info('Activity computed on %d dates - Granularity: %s', sink.nb_periods,
+                             granularity.name)
+                profiler.PROFILER.add('records', sink.nb_periods)
+
+    def get_index(self):
+        """
+        Get the index of the experience of the developers, it is built at the first query
+        after a change of the developers
+
+        :return: Index of the experience
+        :rtype: XPIndex
+        """
+        if self.xp_index is None:
+            with profiler.PROFILER.stage('build_index'):
+                engine = xpengine.XPEngine(self.vcs_mgr.author_dict.values(), self.tier_model)
+                self.xp_index = xpindex.XPIndex(engine)
+        return self.xp_index
+
+    def experience_at(self, curr_date):
+        """
+        Get the experience of the project at any date, without computing the other periods
+
+        :param curr_date: Date of the query
+        :type curr_date: datetime.date or str
+        :return: Experience at this date
+        :rtype: Experience
+        """
+        return self.get_index().experience_at(xpindex.XPIndex.get_date(curr_date))
+
+    def experience_between(self, start_date, end_date, granularity=None):
+        """
+        Get the experience of the project between two dates, without computing the periods
+        which are outside
+
+        :param start_date: First date
+        :type start_date: datetime.date or str
+        :param end_date: Last possible date
+        :type end_date: datetime.date or str
+        :param granularity: Time step between the dates, monthly by default
+        :type granularity: Granularity
+        :return: Experience series
+        :rtype: ExperienceSeries
+        """
+        if granularity is None:
+            granularity = periods.Granularity(XPAnalyser.DEFAULT_GRANULARITY)
+        return self.get_index().experience_between(xpindex.XPIndex.get_date(start_date),
+                                                   xpindex.XPIndex.get_date(end_date),
+                                                   granularity)
+
+    def get_sinks(self, granularity_name, save=True, keep=False):
+        """
+        Get the sinks of the periods of experience of a granularity
 
+        :param granularity_name: Name of the granularity
+        :type granularity_name: str
+        :param save: Write the periods in a CSV file of the working directory
+        :type save: bool
+        :param keep: Keep the periods in a series of experiences
+        :type keep: bool
+        :return: Sinks
+        :rtype: list
         """
-        curr_date = self.vcs_mgr.first_commit_repo + datetime.timedelta(1)
+        granularity_sinks = []
+        if save:
+            granularity_sinks.append(sinks.CSVSink(
+                self.get_csv_path(granularity_name),
+                fields=experience.Experience.get_field_names(self.tier_model)))
+        if self.store is not None:
+            granularity_sinks.append(self.store.get_experience_writer(self.path, granularity_name,
+                                                                      self.tier_model))
+        if keep:
+            series_sink = sinks.SeriesSink(
+                experienceseries.ExperienceSeries(tier_model=self.tier_model))
+            self.experiences[granularity_name] = series_sink.series
+            granularity_sinks.append(series_sink)
+        return granularity_sinks
+
+    def iter_periods(self, granularities):
+        """
+        Compute the experience on the union of the dates of several granularities
+
+        :param granularities: Time steps of the analysis
+        :type granularities: list(Granularity)
+        :return: Generator of the names of the granularities having the date and the values
+                 of the experience (see XPEngine.iter_values) at each date in ascending order
+        :rtype: generator(list(str), tuple(int))
+        """
+        start_date = self.vcs_mgr.first_commit_repo + datetime.timedelta(1)
         end_date = datetime.date.today()
-        while curr_date <= end_date:
-            curr_xp = experience.Experience(curr_date)
-            for dev in self.vcs_mgr.author_dict.values():
-                if not dev.exclude:
-                    curr_xp.process_dev(dev)
-            self.experiences.append(curr_xp)
-            curr_date = XPAnalyser.increment_date(curr_date, XPAnalyser.DEFAULT_INCREMENT)
-        self.save_analyse()
+        engine = xpengine.XPEngine(self.vcs_mgr.author_dict.values(), self.tier_model)
+        all_dates = (x for x, _ in itertools.groupby(heapq.merge(
+            *[x.iter_dates(start_date, end_date) for x in granularities])))
+        iterators = {x.name: x.iter_dates(start_date, end_date) for x in granularities}
+        next_dates = {name: next(iterator, None) for name, iterator in iterators.items()}
+        for values in engine.iter_values(all_dates):
+            curr_date = datetime.date.fromordinal(values[0])
+            names = []
+            for name, iterator in iterators.items():
+                if next_dates[name] == curr_date:
+                    names.append(name)
+                    next_dates[name] = next(iterator, None)
+            yield names, values
+
+    def compute_knowledge_map(self, paths=None, depth=1, granularity=None, rescan=True):
+        """
+        Compute the experience per directory of the repository. The history is scanned once
+        to build the knowledge map which is saved in the working directory, so that the
+        queries on other sub-trees can reuse it without scanning the history again as long
+        as HEAD has not moved.
+
+        :param paths: Paths of the sub-trees to analyse, all the directories up to the
+                      depth by default
+        :type paths: list(str)
+        :param depth: Maximal depth of the directories analysed when no path is given
+        :type depth: int
+        :param granularity: Time step of the analysis, monthly by default
+        :type granularity: Granularity
+        :param rescan: Scan the history even if a knowledge map has already been saved
+        :type rescan: bool
+        :return: Knowledge map of the repository
+        :rtype: KnowledgeMap
+        """
+        with profiler.PROFILER.stage('knowledge_map'):
+            knowledge_map = knowledgemap.KnowledgeMap(self.path, self.work_dir)
+            if rescan or not knowledge_map.load_index():
+                knowledge_map.build()
+                knowledge_map.save_index()
+            if granularity is None:
+                granularity = periods.Granularity(XPAnalyser.DEFAULT_GRANULARITY)
+            if paths is None:
+                paths = knowledge_map.list_paths(depth)
+            author_dict = self.vcs_mgr.author_dict if self.author_csv is not None else None
+            knowledge_map.save_analyse(paths, granularity, author_dict, self.tier_model,
+                                       self.vcs_mgr.resolve_uuid)
+            knowledge_map.save_owners(paths, author_dict, self.vcs_mgr.resolve_uuid)
+            return knowledge_map
+
+    def compute_subtrees(self, path, granularities=None):
+        """
+        Compute the experience of each sub-tree listed in a CODEOWNERS-like file with a
+        single scan of the history, and save it in subtrees/<sub-tree>/experience.csv, the
+        root in subtrees/experience.csv (experience_<granularity>.csv for the other
+        granularities)
+
+        :param path: Path of the file listing the sub-trees (see SubtreeScan.load)
+        :type path: str
+        :param granularities: Time steps of the analysis, monthly by default
+        :type granularities: list(Granularity)
+        :return: Scan of the sub-trees
+        :rtype: SubtreeScan
+        """
+        with profiler.PROFILER.stage('compute_subtrees'):
+            if granularities is None:
+                granularities = [periods.Granularity(XPAnalyser.DEFAULT_GRANULARITY)]
+            scan = subtreescan.SubtreeScan(self.path, subtreescan.SubtreeScan.load(path))
+            scan.build()
+            author_dict = self.vcs_mgr.author_dict if self.author_csv is not None else None
+            # The series of all the sub-trees have the same dates
+            start_date = scan.get_start_date()
+            end_date = datetime.date.today()
+            for index, subtree in enumerate(scan.subtrees):
+                developers = scan.get_developers(index, author_dict, self.vcs_mgr.resolve_uuid)
+                if not developers:
+                    logging.warning('No commit in sub-tree %s', subtree or '.')
+                    continue
+                subtree_dir = os.path.join(self.work_dir, XPAnalyser.SUBTREES_DIRNAME,
+                                           scan.get_dirname(index))
+                os.makedirs(subtree_dir, exist_ok=True)
+                engine = xpengine.XPEngine(developers, self.tier_model)
+                for granularity in granularities:
+                    csv_path = os.path.join(subtree_dir,
+                                            os.path.basename(self.get_csv_path(granularity.name)))
+                    sink = sinks.CSVSink(
+                        csv_path, fields=experience.Experience.get_field_names(self.tier_model))
+                    try:
+                        for values in engine.iter_values(granularity.iter_dates(start_date,
+                                                                                end_date)):
+                            sink.write(values)
+                    finally:
+                        sink.close()
+                logging.info('Experience of sub-tree %s saved in %s - Nb Developers: %d',
+                             subtree or '.', subtree_dir, len(developers))
+            profiler.PROFILER.add('records', len(scan.subtrees))
+            return scan
+
+    def compute_refs(self, granularities=None):
+        """
+        Save the authors and the experience of each reference scanned in refs/<reference>/
+        of the working directory. The identities merged and the departures of the combined
+        analysis are applied to each reference.
+
+        :param granularities: Time steps of the analysis, monthly by default
+        :type granularities: list(Granularity)
+        """
+        if self.ref_scan is None:
+            raise ValueError('The references must be scanned before their analysis')
+        with profiler.PROFILER.stage('compute_refs'):
+            for index, (name, _) in enumerate(self.ref_scan.refs):
+                ref_dir = os.path.join(self.work_dir, XPAnalyser.REFS_DIRNAME,
+                                       self.ref_scan.get_dirname(index))
+                os.makedirs(ref_dir, exist_ok=True)
+                ref_analyser = XPAnalyser(self.path, ref_dir, self.vcs_mgr.backend_name)
+                ref_analyser.tier_model = self.tier_model
+                ref_mgr = ref_analyser.vcs_mgr
+                ref_mgr.add_author_table(self.vcs_mgr.resolve_author_table(
+                    self.ref_scan.get_author_table(index)))
+                ref_mgr.retrieve_commit_date()
+                for uuid, dev in ref_mgr.author_dict.items():
+                    project_dev = self.vcs_mgr.author_dict.get(uuid)
+                    if project_dev is not None:
+                        dev.has_left = project_dev.has_left
+                        dev.exclude = project_dev.exclude
+                ref_analyser.author_csv = authorcsv.AuthorCSV(ref_mgr, ref_dir)
+                ref_analyser.save_author_information_in_csv()
+                ref_analyser.compute_experience(granularities)
+                logging.info('Analysis of %s saved in %s - Nb Authors: %d', name, ref_dir,
+                             len(ref_mgr.author_dict))
+            profiler.PROFILER.add('records', len(self.ref_scan.refs))
 
     @staticmethod
     def increment_date(date, nb_month):
@@ -94,26 +541,47 @@ class XPAnalyser:
         :return: Incremented date
         :rtype: datetime.date
         """
-        next_month = ((date.month + nb_month) % datetime.date.max.month)
-        next_year = date.year + ((date.month + nb_month) // datetime.date.max.month)
-        if next_month == 0:
-            next_month = 12
-            next_year -= 1
-        return datetime.date(next_year, next_month, 1)
+        return periods.Granularity.add_months(date, nb_month)
+
+    def get_csv_path(self, granularity_name, filename=OUTPUT_FILENAME):
+        """
+        Get the path of the CSV file of the analysis of a granularity: experience.csv for
+        the default granularity, experience_<granularity>.csv otherwise
+
+        :param granularity_name: Name of the granularity
+        :type granularity_name: str
+        :param filename: Name of the file of the default granularity
+        :type filename: str
+        :return: Path of the CSV file
+        :rtype: str
+        """
+        if granularity_name == XPAnalyser.DEFAULT_GRANULARITY:
+            return os.path.join(self.work_dir, filename)
+        root, ext = os.path.splitext(filename)
+        return os.path.join(self.work_dir, '{0}_{1}{2}'.format(root, granularity_name, ext))
 
-    def save_analyse(self):
+    def save_analyse(self, granularity_name=DEFAULT_GRANULARITY):
         """
-        Save the analysis in a CSV file in the working directory
+        Save the analysis in a CSV file in the working directory. The series kept in memory
+        (see compute_experience) is saved, the analysis is computed again otherwise.
 
+        :param granularity_name: Name of the granularity to save
+        :type granularity_name: str
         """
-        with open(self.csv_path, mode='w', newline='') as csv_file:
-            xp_writer = csv.DictWriter(csv_file,
-                                       fieldnames=experience.Experience.FIELDS.keys(),
-                                       delimiter=';',
-                                       quotechar='"',
-                                       quoting=csv.QUOTE_MINIMAL)
-            xp_writer.writeheader()
+        with profiler.PROFILER.stage('save_analyse'):
+            series = self.experiences.get(granularity_name)
+            if series is not None:
+                tier_model = series.tier_model
+                all_values = series.iter_values()
+            else:
+                tier_model = self.tier_model
+                all_values = (x for _, x in self.iter_periods(
+                    [periods.Granularity(granularity_name)]))
+            csv_sink = sinks.CSVSink(self.get_csv_path(granularity_name),
+                                     fields=experience.Experience.get_field_names(tier_model))
             try:
-                [xp_writer.writerow(x.get_dict_values()) for x in self.experiences]
-            except UnicodeEncodeError as exc:
-                logging.error('Catch exception: %s', exc.reason)
+                for values in all_values:
+                    csv_sink.write(values)
+            finally:
+                csv_sink.close()
+            profiler.PROFILER.add('records', csv_sink.nb_periods)
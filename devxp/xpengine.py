@@ -0,0 +1,127 @@
+"""
+Module for class XPEngine
+"""
+
+import logging
+
+import experience
+import experienceseries
+import tiers
+
+
+class XPEngine:
+    """
+    Class computing the experience of a project on a series of dates by sweeping the
+    timeline of the events of the developers (join, leave and change of category)
+    """
+
+    ACTIVE = 0
+    FIRST_SUM = 1
+    DEPARTED_XP = 2
+    CATEGORY_OFFSET = 3
+
+    def __init__(self, developers, tier_model=None):
+        """
+        Build and sort once the events of the developers
+
+        :param developers: Developers of the project
+        :type developers: iterable(Developer)
+        :param tier_model: Tiers of experience, junior, advanced and senior by default
+        :type tier_model: TierModel
+        """
+        self.tier_model = tier_model if tier_model is not None else tiers.DEFAULT_MODEL
+        # Each category starts after a number of days of experience, a developer is counted
+        # from its first day of real experience
+        self.thresholds = [(max(1, x), XPEngine.CATEGORY_OFFSET + index)
+                           for index, x in enumerate(self.tier_model.thresholds)]
+        self.nb_accumulators = XPEngine.CATEGORY_OFFSET + len(self.tier_model)
+        self.events = []
+        for dev in developers:
+            if dev.exclude:
+                continue
+            if dev.first_commit_ordinal is None:
+                logging.warning('%s does not have commit date, it is ignored', dev.name)
+                continue
+            self.add_developer(dev)
+        self.events.sort(key=lambda event: event[0])
+        logging.info('Experience engine - Nb Events: %d', len(self.events))
+
+    def add_developer(self, dev):
+        """
+        Add the events of a developer: an event is a tuple (ordinal of the date, index of
+        the accumulator, delta) where the accumulator index is either one of ACTIVE,
+        FIRST_SUM and DEPARTED_XP or a category of experience shifted by CATEGORY_OFFSET.
+
+        :param dev: Developer to add
+        :type dev: Developer
+        """
+        first = dev.first_commit_ordinal
+        leave = dev.last_commit_ordinal + 1 if dev.has_left else None
+        if leave is not None and leave <= first:
+            # Left before arriving: only the cumulative XP (negative or null) is impacted
+            self.events.append((first, XPEngine.DEPARTED_XP, leave - 1 - first))
+            return
+        self.events.append((first, XPEngine.ACTIVE, 1))
+        self.events.append((first, XPEngine.FIRST_SUM, first))
+        previous = None
+        for threshold, category in self.thresholds:
+            if leave is not None and first + threshold >= leave:
+                break
+            if previous is not None:
+                self.events.append((first + threshold, previous, -1))
+            self.events.append((first + threshold, category, 1))
+            previous = category
+        if leave is not None:
+            self.events.append((leave, XPEngine.ACTIVE, -1))
+            self.events.append((leave, XPEngine.FIRST_SUM, -first))
+            self.events.append((leave, XPEngine.DEPARTED_XP, leave - 1 - first))
+            if previous is not None:
+                self.events.append((leave, previous, -1))
+
+    def compute(self, dates):
+        """
+        Compute the experience of the project at each date
+
+        :param dates: Dates in ascending order
+        :type dates: iterable(datetime.date)
+        :return: Generator of the experience at each date
+        :rtype: generator(Experience)
+        """
+        for values in self.iter_values(dates):
+            yield experience.Experience.from_values(values, self.tier_model)
+
+    def compute_series(self, dates):
+        """
+        Compute the experience of the project at each date in a columnar series
+
+        :param dates: Dates in ascending order
+        :type dates: iterable(datetime.date)
+        :return: Experience series
+        :rtype: ExperienceSeries
+        """
+        series = experienceseries.ExperienceSeries(tier_model=self.tier_model)
+        for values in self.iter_values(dates):
+            series.append(values)
+        return series
+
+    def iter_values(self, dates):
+        """
+        Compute the experience of the project at each date without building objects
+
+        :param dates: Dates in ascending order
+        :type dates: iterable(datetime.date)
+        :return: Generator of the date ordinal, real XP days, cumulative XP days and number
+                 of developers of each tier at each date
+        :rtype: generator(tuple(int))
+        """
+        accumulators = [0] * self.nb_accumulators
+        idx = 0
+        nb_events = len(self.events)
+        for curr_date in dates:
+            ordinal = curr_date.toordinal()
+            while idx < nb_events and self.events[idx][0] <= ordinal:
+                accumulators[self.events[idx][1]] += self.events[idx][2]
+                idx += 1
+            real_xp = accumulators[XPEngine.ACTIVE] * ordinal - accumulators[XPEngine.FIRST_SUM]
+            yield (ordinal, real_xp, real_xp + accumulators[XPEngine.DEPARTED_XP]) + \
+                tuple(accumulators[XPEngine.CATEGORY_OFFSET:])
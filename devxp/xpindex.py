@@ -0,0 +1,145 @@
+"""
+Module for class XPIndex
+"""
+
+import array
+import bisect
+import datetime
+import itertools
+import operator
+
+import experience
+import experienceseries
+import xpengine
+
+
+class XPIndex:
+    """
+    Class answering the experience of a project at any date in O(log n): the dates of the
+    events of the developers (join, leave and change of category) are sorted and the
+    accumulators of the engine are kept after each of them (prefix sums)
+    """
+
+    TYPECODE = 'q'
+
+    def __init__(self, engine):
+        """
+        Build the index from the sorted events of an engine
+
+        :param engine: Experience engine of the developers
+        :type engine: XPEngine
+        """
+        self.tier_model = engine.tier_model
+        nb_accumulators = engine.nb_accumulators
+        self.ordinals = array.array(XPIndex.TYPECODE)
+        self.columns = [array.array(XPIndex.TYPECODE) for _ in range(nb_accumulators)]
+        accumulators = [0] * nb_accumulators
+        for ordinal, events in itertools.groupby(engine.events, key=operator.itemgetter(0)):
+            for _, index, delta in events:
+                accumulators[index] += delta
+            self.ordinals.append(ordinal)
+            for column, value in zip(self.columns, accumulators):
+                column.append(value)
+
+    def __len__(self):
+        return len(self.ordinals)
+
+    def values_at(self, ordinal):
+        """
+        Get the experience of the project at a date
+
+        :param ordinal: Ordinal of the date
+        :type ordinal: int
+        :return: Date ordinal, real XP days, cumulative XP days and number of developers
+                 of each tier
+        :rtype: tuple(int)
+        """
+        position = bisect.bisect_right(self.ordinals, ordinal) - 1
+        if position < 0:
+            return (ordinal, 0, 0) + (0,) * len(self.tier_model)
+        return self.get_values(position, ordinal)
+
+    def get_values(self, position, ordinal):
+        """
+        Get the experience at a date from the accumulators of an event
+
+        :param position: Position of the last event which is not after the date
+        :type position: int
+        :param ordinal: Ordinal of the date
+        :type ordinal: int
+        :return: Date ordinal, real XP days, cumulative XP days and number of developers
+                 of each tier
+        :rtype: tuple(int)
+        """
+        columns = self.columns
+        real_xp = columns[xpengine.XPEngine.ACTIVE][position] * ordinal - \
+            columns[xpengine.XPEngine.FIRST_SUM][position]
+        return (ordinal, real_xp, real_xp + columns[xpengine.XPEngine.DEPARTED_XP][position]) + \
+            tuple(x[position] for x in columns[xpengine.XPEngine.CATEGORY_OFFSET:])
+
+    def experience_at(self, curr_date):
+        """
+        Get the experience of the project at a date
+
+        :param curr_date: Date of the query
+        :type curr_date: datetime.date
+        :return: Experience at this date
+        :rtype: Experience
+        """
+        return experience.Experience.from_values(self.values_at(curr_date.toordinal()),
+                                                 self.tier_model)
+
+    def iter_values(self, dates):
+        """
+        Get the experience at dates in ascending order: a single search is done for the
+        first date, then the events are walked forward
+
+        :param dates: Dates in ascending order
+        :type dates: iterable(datetime.date)
+        :return: Generator of the values of the experience (see values_at)
+        :rtype: generator(tuple(int))
+        """
+        position = None
+        nb_events = len(self.ordinals)
+        for curr_date in dates:
+            ordinal = curr_date.toordinal()
+            if position is None:
+                position = bisect.bisect_right(self.ordinals, ordinal) - 1
+            while position + 1 < nb_events and self.ordinals[position + 1] <= ordinal:
+                position += 1
+            if position < 0:
+                yield (ordinal, 0, 0) + (0,) * len(self.tier_model)
+            else:
+                yield self.get_values(position, ordinal)
+
+    def experience_between(self, start_date, end_date, granularity):
+        """
+        Get the experience of the project between two dates
+
+        :param start_date: First date
+        :type start_date: datetime.date
+        :param end_date: Last possible date
+        :type end_date: datetime.date
+        :param granularity: Time step between the dates after the first one
+        :type granularity: Granularity
+        :return: Experience series
+        :rtype: ExperienceSeries
+        """
+        series = experienceseries.ExperienceSeries(tier_model=self.tier_model)
+        for values in self.iter_values(granularity.iter_dates(start_date, end_date)):
+            series.append(values)
+        return series
+
+    @staticmethod
+    def get_date(value):
+        """
+        Practical method to accept dates as datetime.date or as ISO 8601 strings
+
+        :param value: Date
+        :type value: datetime.date or str
+        :return: Date
+        :rtype: datetime.date
+        """
+        if isinstance(value, str):
+            return datetime.date.fromisoformat(value[:10])
+        return value
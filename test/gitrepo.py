@@ -0,0 +1,31 @@
+import unittest
+import os
+import shutil
+import subprocess
+import tempfile
+
+
+@unittest.skipIf(shutil.which('git') is None, 'git is not available')
+class GitRepoTestCase(unittest.TestCase):
+    # Each test works on a new repository in a temporary directory
+
+    def setUp(self):
+        self.repo = tempfile.mkdtemp()
+        self.git('init', '-q', '-b', 'master')
+        # Identity of the commands run without an author, such as merge and tag
+        self.git('config', 'user.name', 'Committer')
+        self.git('config', 'user.email', 'committer@happy.com')
+
+    def tearDown(self):
+        shutil.rmtree(self.repo)
+
+    def git(self, *args, env=None):
+        return subprocess.check_output(['git', '-C', self.repo] + list(args),
+                                       env=env).decode('utf-8').strip()
+
+    def commit(self, name, email, date, *args):
+        # The author and the committer of an empty commit by default, or of args
+        env = dict(os.environ, GIT_AUTHOR_NAME=name, GIT_AUTHOR_EMAIL=email,
+                   GIT_COMMITTER_NAME=name, GIT_COMMITTER_EMAIL=email,
+                   GIT_AUTHOR_DATE=date, GIT_COMMITTER_DATE=date)
+        return self.git(*(args or ('commit', '-q', '--allow-empty', '-m', date)), env=env)
@@ -0,0 +1,68 @@
+import unittest
+import datetime
+import random
+
+import sys
+from os import path
+sys.path.append(path.join(path.dirname(path.dirname(path.abspath(__file__))), 'devxp'))
+import activity
+import developer
+import periods
+
+
+class TestActivityEngine(unittest.TestCase):
+
+    NB_DEVELOPERS = 40
+
+    def build_developers(self):
+        rand = random.Random(7)
+        developers = {}
+        commit_days = {}
+        for idx in range(self.NB_DEVELOPERS):
+            dev = developer.Developer('Dev{0}'.format(idx), 'dev{0}@happy.com'.format(idx))
+            first = datetime.date(2015, 1, 1) + datetime.timedelta(rand.randint(0, 1000))
+            days = sorted(first + datetime.timedelta(rand.randint(0, 800)) for _ in range(20))
+            dev.first_commit_date = first
+            dev.last_commit_date = days[-1]
+            dev.has_left = rand.random() < 0.5
+            dev.exclude = rand.random() < 0.1
+            developers[dev.uuid] = dev
+            commit_days[dev.uuid] = {x.isoformat() for x in days + [first]}
+        return developers, commit_days
+
+    def test_same_as_loop(self):
+        developers, commit_days = self.build_developers()
+        # The commits of an alias are counted for its developer
+        alias = developer.Developer('Alias', 'alias@happy.com')
+        canonical = next(x for x in developers.values() if not x.exclude)
+        commit_days[alias.uuid] = {'2016-06-01'}
+        engine = activity.ActivityEngine(
+            developers.values(), commit_days,
+            lambda x: canonical.uuid if x == alias.uuid else x)
+        dates = list(periods.Granularity('weekly').iter_dates(datetime.date(2014, 12, 1),
+                                                              datetime.date(2019, 1, 1)))
+        previous = None
+        for curr_date, values in zip(dates, engine.iter_values(dates)):
+            expected = [curr_date.toordinal()]
+            for window in activity.ActivityEngine.WINDOWS:
+                start = curr_date - datetime.timedelta(window)
+                expected.append(sum(
+                    1 for uuid, dev in developers.items() if not dev.exclude and any(
+                        start < datetime.date.fromisoformat(x) <= curr_date
+                        for x in commit_days[uuid].union(
+                            commit_days[alias.uuid] if dev is canonical else ()))))
+            present = [x for x in developers.values() if not x.exclude and x.is_present(curr_date)]
+            expected.append(len(present))
+            self.assertEqual(values[:len(expected)], tuple(expected))
+            if previous is not None:
+                joined = sum(1 for x in developers.values() if not x.exclude and
+                             previous < x.first_commit_date <= curr_date)
+                left = sum(1 for x in developers.values() if not x.exclude and x.has_left and
+                           previous <= x.last_commit_date < curr_date)
+                self.assertEqual(values[len(expected):len(expected) + 2], (joined, left))
+            previous = curr_date
+        self.assertEqual(len(engine.get_fields()), len(values))
+
+
+if __name__ == '__main__':
+    unittest.main()
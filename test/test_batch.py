@@ -0,0 +1,68 @@
+import unittest
+import os
+import shutil
+import tempfile
+
+import sys
+from os import path
+sys.path.append(path.join(path.dirname(path.dirname(path.abspath(__file__))), 'devxp'))
+sys.path.append(path.dirname(path.abspath(__file__)))
+import batch
+import developer
+import gitrepo
+
+
+class TestBatchAnalyser(gitrepo.GitRepoTestCase):
+
+    # Commits of the repositories of the batch, in the directory of the test repository
+    COMMITS = {'alpha': [('Joe', 'joe@happy.com', '2015-03-01'),
+                         ('Jane', 'jane@happy.com', '2015-04-01')],
+               'beta': [('Joe', 'joe@work.com', '2015-01-01'),
+                        ('Joe', 'joe@work.com', '2015-02-01')]}
+
+    def setUp(self):
+        super().setUp()
+        self.work_dir = tempfile.mkdtemp()
+        for name, commits in self.COMMITS.items():
+            self.git('init', '-q', '-b', 'master', name)
+            for author, email, date in commits:
+                self.commit(author, email, date + 'T10:00:00+0000', '-C', name, 'commit', '-q',
+                            '--allow-empty', '-m', date)
+
+    def tearDown(self):
+        super().tearDown()
+        shutil.rmtree(self.work_dir)
+
+    def test_merge(self):
+        list_path = path.join(self.work_dir, 'repositories.txt')
+        with open(list_path, mode='w') as list_file:
+            list_file.write('# Repositories\n')
+            for name in ('alpha', path.join('missing', 'repo'), 'beta'):
+                list_file.write(path.join(self.repo, name) + '\n')
+        batch_analyser = batch.BatchAnalyser(list_path, self.work_dir, max_workers=2)
+        xp_analyser = batch_analyser.retrieve_author_information()
+        # The missing repository is reported without stopping the others
+        self.assertEqual(list(batch_analyser.failures), [path.join(self.repo, 'missing', 'repo')])
+        author_dict = xp_analyser.vcs_mgr.author_dict
+        self.assertEqual(sorted(x.name for x in author_dict.values()), ['Jane', 'Joe'])
+        # The same identity keeps the earliest first commit of all the repositories
+        joe = author_dict[developer.Developer.compute_uuid('Joe')]
+        self.assertEqual(joe.first_commit_date.isoformat(), '2015-01-01')
+        self.assertEqual(joe.last_commit_date.isoformat(), '2015-03-01')
+        self.assertEqual(sorted(xp_analyser.vcs_mgr.author_emails[joe.uuid]),
+                         ['joe@happy.com', 'joe@work.com'])
+        self.assertEqual(xp_analyser.vcs_mgr.first_commit_repo.isoformat(), '2015-01-01')
+
+    def test_commit_days(self):
+        batch_analyser = batch.BatchAnalyser(self.repo, self.work_dir, max_workers=2)
+        batch_analyser.keep_commit_days()
+        xp_analyser = batch_analyser.retrieve_author_information()
+        joe = developer.Developer.compute_uuid('Joe')
+        self.assertEqual(sorted(xp_analyser.vcs_mgr.commit_days[joe]),
+                         ['2015-01-01', '2015-02-01', '2015-03-01'])
+        xp_analyser.compute_activity()
+        self.assertTrue(os.path.isfile(path.join(self.work_dir, 'activity.csv')))
+
+
+if __name__ == '__main__':
+    unittest.main()
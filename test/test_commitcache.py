@@ -0,0 +1,59 @@
+import unittest
+import os
+import shutil
+import tempfile
+
+import sys
+from os import path
+sys.path.append(path.join(path.dirname(path.dirname(path.abspath(__file__))), 'devxp'))
+sys.path.append(path.dirname(path.abspath(__file__)))
+import gitrepo
+import vcsmanager
+
+
+class TestCommitCache(gitrepo.GitRepoTestCase):
+
+    AUTHORS = [('Joe', 'joe@happy.com'), ('Jane', 'jane@happy.com'), ('Joe', 'joe@sad.com')]
+    # The day of a commit is the one of its author timezone
+    DATES = ['2015-{0:02d}-01T23:30:00-0500', '2015-{0:02d}-01T00:30:00+0900',
+             '2015-{0:02d}-28T12:00:00+0000']
+
+    def setUp(self):
+        super().setUp()
+        self.cache_dir = tempfile.mkdtemp()
+        for idx in range(10):
+            self.commit_idx(idx)
+
+    def tearDown(self):
+        super().tearDown()
+        shutil.rmtree(self.cache_dir)
+
+    def commit_idx(self, idx):
+        name, email = self.AUTHORS[idx % len(self.AUTHORS)]
+        self.commit(name, email, self.DATES[idx % len(self.DATES)].format(idx % 12 + 1))
+
+    def get_table(self, cache=False, backend='git'):
+        vcs_mgr = vcsmanager.VCSManager(self.repo, backend)
+        vcs_mgr.keep_commit_days()
+        if cache:
+            vcs_mgr.set_commit_cache(self.cache_dir)
+        vcs_mgr.build_author_dict()
+        return vcs_mgr.get_author_table(), vcs_mgr.commit_days
+
+    def test_cache(self):
+        expected = self.get_table()
+        # The first scan fills the cache, the next ones read it back
+        self.assertEqual(self.get_table(True), expected)
+        cached = os.listdir(self.cache_dir)
+        self.assertEqual(len(cached), 1)
+        self.assertEqual(self.get_table(True), expected)
+        self.assertEqual(self.get_table(True, 'native'), expected)
+        # A new commit moves HEAD, the outdated cache is replaced
+        self.commit_idx(10)
+        self.assertEqual(self.get_table(True), self.get_table())
+        self.assertEqual(len(os.listdir(self.cache_dir)), 1)
+        self.assertNotEqual(os.listdir(self.cache_dir), cached)
+
+
+if __name__ == '__main__':
+    unittest.main()
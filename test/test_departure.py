@@ -0,0 +1,47 @@
+import unittest
+import datetime
+
+import sys
+from os import path
+sys.path.append(path.join(path.dirname(path.dirname(path.abspath(__file__))), 'devxp'))
+import departure
+import developer
+
+
+class TestDepartureDetector(unittest.TestCase):
+
+    def build_developer(self, name, days):
+        dev = developer.Developer(name, name.lower() + '@happy.com')
+        dev.set_first_commit_date(days[0])
+        dev.set_last_commit_date(days[-1])
+        return dev
+
+    def setUp(self):
+        self.commit_days = {}
+        self.author_dict = {}
+        for name, days in (('Regular', ['2015-01-01', '2015-01-08', '2015-01-15', '2015-01-22']),
+                           ('Rare', ['2014-01-01', '2014-06-01', '2014-11-01']),
+                           ('Recent', ['2015-02-01', '2015-03-01'])):
+            dev = self.build_developer(name, days)
+            self.author_dict[dev.uuid] = dev
+            self.commit_days[dev.uuid] = set(days)
+
+    def get_departed(self, detector):
+        departed = detector.detect(self.author_dict, self.commit_days)
+        return sorted(self.author_dict[x].name for x in departed)
+
+    def test_gap(self):
+        self.assertEqual(self.get_departed(departure.DepartureDetector(60)), ['Rare'])
+        self.assertTrue(self.author_dict[developer.Developer.compute_uuid('Rare')].has_left)
+        self.assertEqual(self.get_departed(departure.DepartureDetector(
+            10, reference_date=datetime.date(2015, 3, 5))), ['Regular'])
+
+    def test_cadence(self):
+        # Rare commits every 5 months, Regular every week
+        self.assertEqual(self.get_departed(departure.DepartureDetector(14, 90)), ['Regular'])
+        with self.assertRaises(ValueError):
+            departure.DepartureDetector(14, 90).detect(self.author_dict)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -106,7 +106,7 @@ class TestDeveloper(unittest.TestCase):
         dev.set_last_commit_date(last_commit)
         dev_alias.set_first_commit_date(first_commit_alias)
         dev_alias.set_last_commit_date(last_commit_alias)
-        dev.aliases.append(dev_alias)
+        dev.add_alias(dev_alias)
         dev.update_based_on_aliases()
         self.assertEqual(dev.get_first_commit_date(), first_commit_alias)
         self.assertEqual(dev.get_last_commit_date(), last_commit_alias)
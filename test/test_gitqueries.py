@@ -0,0 +1,40 @@
+
+import unittest
+import subprocess
+
+import sys
+from os import path
+sys.path.append(path.join(path.dirname(path.dirname(path.abspath(__file__))), 'devxp'))
+sys.path.append(path.dirname(path.abspath(__file__)))
+import gitrepo
+import gitqueries
+
+
+class TestGitQueries(gitrepo.GitRepoTestCase):
+
+    AUTHORS = [('Joe', 'joe@happy.com'), ('Jane "JJ" Doe', 'jane@happy.com'),
+               ('Jack O\'Neil', 'jack@sad.com')]
+
+    def setUp(self):
+        super().setUp()
+        for idx in range(12):
+            name, email = self.AUTHORS[idx % len(self.AUTHORS)]
+            self.commit(name, email, '2015-{0:02d}-01T10:00:00+0000'.format(idx + 1))
+
+    def test_query_authors(self):
+        filters = [('Jack O\'Neil', None, None), ('Jane "JJ" Doe <jane@happy.com>', None, None),
+                   ('Joe', '2015-06-01', None), ('$(nobody)', None, None)]
+        for max_concurrency in (1, 3):
+            executor = gitqueries.GitQueryExecutor(self.repo, max_concurrency)
+            self.assertEqual(executor.query_authors(filters),
+                             [(4, '2015-03-01', '2015-12-01'), (4, '2015-02-01', '2015-11-01'),
+                              (2, '2015-07-01', '2015-10-01'), (0, None, None)])
+
+    def test_failure(self):
+        executor = gitqueries.GitQueryExecutor(self.repo, 2)
+        with self.assertRaises(subprocess.CalledProcessError):
+            executor.run([['log', '--format=%aI'], ['log', 'unknown-revision']])
+
+
+if __name__ == '__main__':
+    unittest.main()
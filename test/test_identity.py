@@ -0,0 +1,105 @@
+
+import unittest
+import csv
+import datetime
+import os
+import shutil
+import tempfile
+
+import sys
+from os import path
+sys.path.append(path.join(path.dirname(path.dirname(path.abspath(__file__))), 'devxp'))
+import authorcsv
+import developer
+import identity
+import vcsmanager
+
+
+class TestIdentity(unittest.TestCase):
+
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        self.dev_dict = {}
+        for idx, (name, email) in enumerate([('John Doe', 'john@happy.com'),
+                                             ('doe, john', 'jdoe@sad.com'),
+                                             ('JD', 'John@Happy.com'),
+                                             ('Jane', 'jane@happy.com'),
+                                             ('jane-work', 'jane.smith@work.com'),
+                                             ('root', 'root@localhost'),
+                                             ('Jack', 'root@localhost')]):
+            dev = developer.Developer(name, email)
+            dev.first_commit_date = datetime.date(2015, 1, 1) + datetime.timedelta(10 * idx)
+            dev.last_commit_date = datetime.date(2016, 1, 1) + datetime.timedelta(idx)
+            self.dev_dict[dev.uuid] = dev
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir)
+
+    def uuid(self, name):
+        return developer.Developer.compute_uuid(name)
+
+    def test_union_find(self):
+        union_find = identity.UnionFind()
+        for idx in range(10):
+            union_find.union(idx, idx + 2)
+        self.assertEqual(union_find.find(0), union_find.find(10))
+        self.assertNotEqual(union_find.find(1), union_find.find(10))
+        self.assertEqual(len(union_find.groups()), 2)
+
+    def test_normalise(self):
+        self.assertEqual(identity.IdentityResolver.normalise_email(' John+dev@Happy.com'),
+                         'john@happy.com')
+        self.assertEqual(identity.IdentityResolver.normalise_email(
+            '123+jdoe@users.noreply.github.com'), 'jdoe@users.noreply.github.com')
+        self.assertIsNone(identity.IdentityResolver.normalise_email('noreply@github.com'))
+        self.assertEqual(identity.IdentityResolver.normalise_name('Doe, Jöhn'), 'doe john')
+        self.assertIsNone(identity.IdentityResolver.normalise_name('Root'))
+
+    def test_resolve(self):
+        mailmap_path = os.path.join(self.work_dir, '.mailmap')
+        with open(mailmap_path, mode='w', encoding='UTF-8') as mailmap_file:
+            mailmap_file.write('# Jane\nJane <jane@happy.com> jane-work <jane.smith@work.com>\n')
+        resolver = identity.IdentityResolver(mailmap_path)
+        clusters = resolver.resolve(self.dev_dict)
+        self.assertEqual(sorted(clusters[self.uuid('John Doe')]),
+                         sorted([self.uuid('John Doe'), self.uuid('doe, john'), self.uuid('JD')]))
+        self.assertEqual(sorted(clusters[self.uuid('Jane')]),
+                         sorted([self.uuid('Jane'), self.uuid('jane-work')]))
+        self.assertEqual(len(clusters), 2)
+        merged_uuids = identity.IdentityResolver.merge(self.dev_dict, clusters)
+        self.assertEqual(merged_uuids[self.uuid('JD')], self.uuid('John Doe'))
+        self.assertEqual(len(self.dev_dict), 4)
+        john = self.dev_dict[self.uuid('John Doe')]
+        self.assertEqual(john.last_commit_date, datetime.date(2016, 1, 3))
+        self.assertEqual(sorted(john.get_alias_uuids()),
+                         sorted([self.uuid('doe, john'), self.uuid('JD')]))
+
+    def test_csv_overrides(self):
+        clusters = identity.IdentityResolver().resolve(self.dev_dict)
+        vcs_mgr = vcsmanager.VCSManager(self.work_dir)
+        vcs_mgr.author_dict = self.dev_dict
+        vcs_mgr.merged_uuids = identity.IdentityResolver.merge(self.dev_dict, clusters)
+        csv_path = os.path.join(self.work_dir, 'in_author.csv')
+        author_csv = authorcsv.AuthorCSV(vcs_mgr, self.work_dir)
+        author_csv.csv_path = csv_path
+        author_csv.save_data_in_csv()
+        with open(csv_path, mode='r', newline='', encoding='UTF-8') as csv_file:
+            rows = list(csv.DictReader(csv_file, delimiter=';'))
+        # Chain Jack -> root -> Jane, and the row of an already merged developer
+        aliases = {self.uuid('Jack'): self.uuid('root'), self.uuid('root'): self.uuid('Jane')}
+        for row in rows:
+            row['Aliases'] = aliases.get(row['UUID'], row['Aliases'])
+        rows.append(dict(rows[0], UUID=self.uuid('JD'), Name='JD', Aliases=self.uuid('doe, john')))
+        with open(csv_path, mode='w', newline='', encoding='UTF-8') as csv_file:
+            csv_writer = csv.DictWriter(csv_file, fieldnames=rows[0].keys(), delimiter=';')
+            csv_writer.writeheader()
+            csv_writer.writerows(rows)
+        author_csv.update_data_from_csv(csv_path)
+        self.assertEqual(sorted(self.dev_dict), sorted([self.uuid('John Doe'), self.uuid('Jack'),
+                                                       self.uuid('jane-work')]))
+        jack = self.dev_dict[self.uuid('Jack')]
+        self.assertEqual(jack.first_commit_date, datetime.date(2015, 1, 31))
+
+
+if __name__ == '__main__':
+    unittest.main()
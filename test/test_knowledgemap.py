@@ -0,0 +1,89 @@
+import unittest
+import csv
+import os
+import shutil
+import tempfile
+
+import sys
+from os import path
+sys.path.append(path.join(path.dirname(path.dirname(path.abspath(__file__))), 'devxp'))
+sys.path.append(path.dirname(path.abspath(__file__)))
+import developer
+import gitrepo
+import knowledgemap
+import xpanalyser
+
+
+class TestKnowledgeMap(gitrepo.GitRepoTestCase):
+
+    # Joe and joe smith share an email, so they are merged by -u
+    CHANGES = [('Joe', '2015-01-01', {'src/core/a.py': 3}),
+               ('Jane', '2015-02-01', {'doc/b.md': 2, 'src/c.py': 1}),
+               ('joe smith', '2015-03-01', {'src/core/a.py': 1})]
+
+    def setUp(self):
+        super().setUp()
+        self.work_dir = tempfile.mkdtemp()
+        for name, date, files in self.CHANGES:
+            for file_path, nb_lines in files.items():
+                os.makedirs(path.join(self.repo, path.dirname(file_path)), exist_ok=True)
+                with open(path.join(self.repo, file_path), mode='a') as changed_file:
+                    changed_file.write('line\n' * nb_lines)
+            self.git('add', '-A')
+            email = 'jane@happy.com' if name == 'Jane' else 'joe@happy.com'
+            self.commit(name, email, date + 'T10:00:00+0000')
+
+    def tearDown(self):
+        super().tearDown()
+        shutil.rmtree(self.work_dir)
+
+    def read_owners(self):
+        with open(path.join(self.work_dir, knowledgemap.KnowledgeMap.OWNERS_FILENAME),
+                  mode='r', newline='', encoding='UTF-8') as csv_file:
+            return [(x['Path'], x['Lines Added']) for x in csv.DictReader(csv_file,
+                                                                          delimiter=';')]
+
+    def test_build(self):
+        with open(path.join(self.repo, 'src', 'logo.png'), mode='wb') as binary_file:
+            binary_file.write(b'\0\1\2')
+        self.git('add', '-A')
+        self.commit('Jane', 'jane@happy.com', '2015-04-01T10:00:00+0000')
+        knowledge_map = knowledgemap.KnowledgeMap(self.repo, self.work_dir)
+        knowledge_map.build()
+        joe = developer.Developer.compute_uuid('Joe')
+        jane = developer.Developer.compute_uuid('Jane')
+        self.assertEqual(knowledge_map.list_paths(1), ['', 'doc', 'src'])
+        # Each directory aggregates its files and sub-directories, binary files count no line
+        smith = developer.Developer.compute_uuid('joe smith')
+        self.assertEqual(knowledge_map.paths[''], {
+            joe: [735599, 735599, 3, 0], jane: [735630, 735689, 3, 0],
+            smith: [735658, 735658, 1, 0]})
+        self.assertEqual(knowledge_map.paths['src'][jane], [735630, 735689, 1, 0])
+        self.assertEqual(sorted(knowledge_map.paths['src/core']), sorted([joe, smith]))
+        self.assertEqual(knowledge_map.get_start_date().isoformat(), '2015-01-02')
+        # The saved index is reused until HEAD moves
+        knowledge_map.save_index()
+        loaded_map = knowledgemap.KnowledgeMap(self.repo, self.work_dir)
+        self.assertTrue(loaded_map.load_index())
+        self.assertEqual(loaded_map.paths, knowledge_map.paths)
+        self.assertEqual(loaded_map.authors, knowledge_map.authors)
+        self.commit('Jane', 'jane@happy.com', '2015-05-01T10:00:00+0000')
+        self.assertFalse(knowledgemap.KnowledgeMap(self.repo, self.work_dir).load_index())
+
+    def test_merged_alias(self):
+        analyser = xpanalyser.XPAnalyser(self.repo, self.work_dir)
+        analyser.retrieve_author_information_from_repo(True)
+        analyser.resolve_identities()
+        self.assertEqual(len(analyser.vcs_mgr.author_dict), 2)
+        knowledge_map = analyser.compute_knowledge_map(None, 2)
+        # The alias is counted once, with the churn of both identities
+        self.assertEqual(self.read_owners(), [('.', '4'), ('.', '3'), ('doc', '2'),
+                                              ('src', '4'), ('src', '1'), ('src/core', '4')])
+        developers = knowledge_map.get_developers('src/core', analyser.vcs_mgr.author_dict,
+                                                  analyser.vcs_mgr.resolve_uuid)
+        self.assertEqual([(x.first_commit_date.isoformat(), x.last_commit_date.isoformat())
+                          for x in developers], [('2015-01-01', '2015-03-01')])
+
+
+if __name__ == '__main__':
+    unittest.main()
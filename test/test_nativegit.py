@@ -0,0 +1,93 @@
+
+import unittest
+import os
+import shutil
+import subprocess
+import tempfile
+
+import sys
+from os import path
+sys.path.append(path.join(path.dirname(path.dirname(path.abspath(__file__))), 'devxp'))
+sys.path.append(path.dirname(path.abspath(__file__)))
+import gitbackend
+import gitrepo
+import nativegit
+
+
+class TestNativeGit(gitrepo.GitRepoTestCase):
+
+    AUTHORS = [('Joe', 'joe@happy.com'), ('Jane', 'jane@happy.com'), ('Jack O\'Neil', 'jack@sad.com')]
+
+    def setUp(self):
+        super().setUp()
+        for idx in range(30):
+            self.commit_idx(idx)
+            if idx == 10:
+                self.git('checkout', '-q', '-b', 'feature')
+            if idx == 20:
+                self.git('checkout', '-q', 'master')
+                self.git('merge', '-q', '--no-ff', 'feature', '-m', 'merge')
+        self.git('tag', '-a', 'v1', '-m', 'v1')
+
+    def commit_idx(self, idx):
+        with open(os.path.join(self.repo, 'file{0}.txt'.format(idx % 4)), 'a') as test_file:
+            test_file.write('line {0}\n'.format(idx))
+        self.git('add', '-A')
+        self.commit(*self.AUTHORS[idx % len(self.AUTHORS)],
+                    '2015-{0:02d}-{1:02d}T10:00:00+0{2}00'.format(idx % 12 + 1, idx % 28 + 1,
+                                                                 idx % 3))
+
+    def check_same_commits(self, rev_range=''):
+        expected = sorted(tuple(x) for x in gitbackend.GitCommandBackend(self.repo).iter_commits(rev_range))
+        native = nativegit.NativeGitBackend(self.repo)
+        self.assertEqual(sorted(tuple(x) for x in native.iter_commits(rev_range)), expected)
+        self.assertEqual(native.retrieve_head(), self.git('rev-parse', 'HEAD'))
+
+    def test_loose_objects(self):
+        self.check_same_commits()
+        self.check_same_commits('{0}..HEAD'.format(self.git('rev-parse', 'HEAD~5')))
+
+    def test_pack_and_commit_graph(self):
+        self.git('gc', '-q', '--aggressive')
+        self.check_same_commits()
+        self.git('commit-graph', 'write', '--reachable')
+        self.check_same_commits()
+        self.check_same_commits('feature..HEAD')
+
+    def test_skewed_dates(self):
+        # The root is dated after its children, and HEAD~1 is an ancestor of HEAD
+        self.git('checkout', '-q', '--orphan', 'skewed')
+        for timestamp in (5000, 3000, 1000, 2000):
+            self.commit('Joe', 'joe@happy.com', '@{0} +0000'.format(timestamp))
+        self.check_same_commits('HEAD..HEAD~2')
+        self.assertEqual(list(nativegit.NativeGitBackend(self.repo).iter_commits('HEAD..HEAD~2')),
+                         [])
+
+    def test_shallow_clone(self):
+        clone = tempfile.mkdtemp()
+        try:
+            subprocess.check_call(['git', 'clone', '-q', '--depth', '3',
+                                   'file://' + self.repo, clone])
+            expected = list(gitbackend.GitCommandBackend(clone).iter_commits())
+            native = nativegit.NativeGitBackend(clone)
+            self.assertEqual(len(list(native.iter_commits())), len(expected))
+            self.assertEqual(sorted(tuple(x) for x in native.iter_commits()),
+                             sorted(tuple(x) for x in expected))
+            self.assertEqual(len(native.list_first_parents()), 3)
+        finally:
+            shutil.rmtree(clone)
+
+    def test_is_ancestor(self):
+        old = self.git('rev-parse', 'HEAD~3')
+        head = self.git('rev-parse', 'HEAD')
+        for prepare in ([], ['gc', '-q'], ['commit-graph', 'write', '--reachable']):
+            if prepare:
+                self.git(*prepare)
+            native = nativegit.NativeGitBackend(self.repo)
+            self.assertTrue(native.is_ancestor(old, head))
+            self.assertFalse(native.is_ancestor(head, old))
+            self.assertEqual(native.resolve('v1').hex(), head)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+import contextlib
+import json
+import os
+import tempfile
+
+import sys
+from os import path
+sys.path.append(path.join(path.dirname(path.dirname(path.abspath(__file__))), 'devxp'))
+import profiler
+
+
+class TestProfiler(unittest.TestCase):
+
+    STAGE_KEYS = ['stage', 'calls', 'wall_time', 'cpu_time', 'subprocesses', 'bytes_read',
+                  'records', 'peak_rss_increase_kb', 'children_peak_rss_increase_kb']
+
+    def test_disabled(self):
+        prof = profiler.Profiler()
+        self.assertIsInstance(prof.stage('scan'), contextlib.nullcontext)
+        with prof.stage('scan'):
+            prof.add('records', 5)
+        self.assertEqual(prof.stages, {})
+        self.assertEqual(prof.counters, {'subprocesses': 0, 'bytes_read': 0, 'records': 0})
+
+    def test_report(self):
+        prof = profiler.Profiler()
+        prof.enable()
+        for _ in range(2):
+            with prof.stage('scan'):
+                prof.add('subprocesses')
+                # A nested stage is also measured in the outer one
+                with prof.stage('parse'):
+                    prof.add('bytes_read', 100)
+                    prof.add('records', 3)
+        prof.add('records')
+        prof.disable()
+        prof.add('records', 50)
+        fd, report_path = tempfile.mkstemp(suffix='.json')
+        os.close(fd)
+        try:
+            prof.save_report(report_path)
+            with open(report_path, mode='r', encoding='UTF-8') as report_file:
+                report = json.load(report_file)
+        finally:
+            os.remove(report_path)
+        self.assertEqual(list(report), ['version', 'wall_time', 'cpu_time', 'subprocesses',
+                                        'bytes_read', 'records', 'peak_rss_kb',
+                                        'children_peak_rss_kb', 'stages'])
+        self.assertEqual(report['version'], profiler.Profiler.REPORT_VERSION)
+        self.assertEqual((report['subprocesses'], report['bytes_read'], report['records']),
+                         (2, 200, 7))
+        self.assertEqual([x['stage'] for x in report['stages']], ['scan', 'parse'])
+        for stage in report['stages']:
+            self.assertEqual(list(stage), self.STAGE_KEYS)
+            self.assertEqual(stage['calls'], 2)
+            self.assertGreaterEqual(stage['wall_time'], 0.0)
+            if profiler.resource is not None:
+                self.assertGreaterEqual(stage['peak_rss_increase_kb'], 0)
+        scan, parse = report['stages']
+        self.assertEqual((scan['subprocesses'], scan['bytes_read'], scan['records']),
+                         (2, 200, 6))
+        self.assertEqual((parse['subprocesses'], parse['bytes_read'], parse['records']),
+                         (0, 200, 6))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+
+import sys
+from os import path
+sys.path.append(path.join(path.dirname(path.dirname(path.abspath(__file__))), 'devxp'))
+sys.path.append(path.dirname(path.abspath(__file__)))
+import gitrepo
+import nativegit
+import refscan
+import vcsmanager
+
+
+class TestRefScan(gitrepo.GitRepoTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.commit_month('Ann', '2014-01')
+        self.commit_month('Bob', '2014-03')
+        self.git('branch', '-q', 'release/1.0')
+        self.commit_month('Ann', '2014-06')
+        self.git('checkout', '-q', 'release/1.0')
+        self.commit_month('Cid', '2014-07')
+        self.commit_month('Bob', '2015-02')
+        self.git('checkout', '-q', '-b', 'release/2.0', 'master')
+        self.commit_month('Dan', '2015-05')
+        self.git('checkout', '-q', 'master')
+        self.commit_month('Eve', '2015-06', 'merge', '-q', '--no-ff', 'release/1.0', '-m', 'merge')
+        self.commit_month('Ann', '2015-07', 'tag', '-a', 'v1.0', '-m', 'v1.0', 'release/1.0')
+
+    def commit_month(self, name, month, *args):
+        self.commit(name, name + '@happy.com', '{0}-01T10:00:00+0000'.format(month), *args)
+
+    def test_refs(self):
+        for backend in vcsmanager.VCSManager.BACKENDS:
+            vcs_mgr = vcsmanager.VCSManager(self.repo, backend)
+            scan = refscan.RefScan(vcs_mgr.backend, ['refs/heads/*', 'refs/heads/release/*',
+                                                     'refs/tags'])
+            scan.build()
+            self.assertEqual([x for x, _ in scan.refs],
+                             ['refs/heads/master', 'refs/heads/release/1.0',
+                              'refs/heads/release/2.0', 'refs/tags/v1.0'])
+            # Each commit is walked once
+            self.assertEqual(scan.nb_commits, 7)
+            for index, (name, _) in enumerate(scan.refs):
+                ref_mgr = vcsmanager.VCSManager(self.repo, backend)
+                ref_mgr.retrieve_author(name)
+                self.assertEqual(scan.get_author_table(index), ref_mgr.get_author_table())
+            self.assertEqual(sorted(x[0] for x in scan.get_author_table().values()),
+                             ['Ann', 'Bob', 'Cid', 'Dan', 'Eve'])
+
+    def test_match_ref(self):
+        match_ref = nativegit.NativeGitBackend.match_ref
+        self.assertTrue(match_ref('refs/heads/release/1.0', 'refs/heads/release/*'))
+        self.assertTrue(match_ref('refs/heads/release/1.0', 'refs/heads'))
+        self.assertFalse(match_ref('refs/heads/release/1.0', 'refs/heads/*'))
+        self.assertFalse(match_ref('refs/heads/releases', 'refs/heads/release'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+
+import unittest
+import datetime
+
+import sys
+from os import path
+sys.path.append(path.join(path.dirname(path.dirname(path.abspath(__file__))), 'devxp'))
+import developer
+import experienceseries
+import resultstore
+
+
+class TestResultStore(unittest.TestCase):
+
+    REPO = '/tmp/myvcsrepo'
+
+    def setUp(self):
+        self.store = resultstore.ResultStore(':memory:')
+
+    def tearDown(self):
+        self.store.close()
+
+    def test_developers(self):
+        joe = developer.Developer('Joe', 'joe@happy.com')
+        joe.set_first_commit_date('2015-01-01')
+        joe.set_last_commit_date('2016-01-01')
+        joe.has_left = True
+        joe.add_alias(developer.Developer.compute_uuid('joe'))
+        for _ in range(2):
+            self.store.save_developers(self.REPO, {joe.uuid: joe}, 'abc')
+        author_dict = self.store.get_developers(self.REPO)
+        self.assertEqual(list(author_dict), [joe.uuid])
+        self.assertEqual(author_dict[joe.uuid].get_values(), joe.get_values())
+        self.assertEqual(self.store.get_developers('/tmp/unknown'), {})
+
+    def test_experience(self):
+        series = experienceseries.ExperienceSeries()
+        start = datetime.date(2018, 1, 1).toordinal()
+        for idx in range(48):
+            series.append((start + 30 * idx, idx, 2 * idx, idx % 3, idx % 5, idx % 7))
+        self.store.save_experience(self.REPO, 'monthly', series)
+        self.store.save_experience(self.REPO, 'monthly', series)
+        result = self.store.get_experience(self.REPO, 'monthly', datetime.date(2019, 1, 1),
+                                           datetime.date(2020, 12, 31))
+        expected = [x.get_values() for x in series
+                    if datetime.date(2019, 1, 1) <= x.curr_date <= datetime.date(2020, 12, 31)]
+        self.assertEqual([x.get_values() for x in result], expected)
+        self.assertEqual(len(self.store.get_experience(self.REPO, 'weekly')), 0)
+
+    def test_commits(self):
+        writer = self.store.get_commit_writer(self.REPO)
+        for rev_range, nb_commits in (('', 3), ('a..b', 2), ('', 1)):
+            writer.begin(rev_range)
+            for idx in range(nb_commits):
+                writer.add_commit('Joe', 'joe@happy.com', '2015-01-0{0}T10:00:00+02:00'.format(idx + 1))
+            writer.end()
+        self.assertEqual(self.store.connection.execute('SELECT COUNT(*) FROM commits').fetchone(),
+                         (1,))
+
+
+if __name__ == '__main__':
+    unittest.main()
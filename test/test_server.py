@@ -0,0 +1,78 @@
+import unittest
+import json
+import shutil
+import tempfile
+import threading
+import urllib.error
+import urllib.request
+
+import sys
+from os import path
+sys.path.append(path.join(path.dirname(path.dirname(path.abspath(__file__))), 'devxp'))
+sys.path.append(path.dirname(path.abspath(__file__)))
+import gitrepo
+import server
+
+
+class TestServer(gitrepo.GitRepoTestCase):
+
+    AUTHORS = [('Joe', 'joe@happy.com'), ('Jane', 'jane@happy.com')]
+
+    def setUp(self):
+        super().setUp()
+        self.work_dir = tempfile.mkdtemp()
+        for idx in range(4):
+            self.commit_idx(idx, '2015-{0:02d}-01T10:00:00+0000'.format(idx + 1))
+        self.service = server.ExperienceService(self.repo, self.work_dir, refresh_interval=0)
+        self.service.refresh()
+        self.httpd = server.create_server(self.service)
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def tearDown(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        super().tearDown()
+        shutil.rmtree(self.work_dir)
+
+    def commit_idx(self, idx, date):
+        self.commit(*self.AUTHORS[idx % len(self.AUTHORS)], date)
+
+    def get(self, query):
+        url = 'http://127.0.0.1:{0}{1}'.format(self.httpd.server_address[1], query)
+        with urllib.request.urlopen(url) as response:
+            return json.loads(response.read().decode('utf-8'))
+
+    def test_queries(self):
+        self.assertEqual(self.get('/experience?date=2015-03-01'),
+                         {'Date': '2015-03-01', 'Real XP': 87, 'Cumulative XP': 87,
+                          'Nb Junior': 2, 'Nb Advanced': 0, 'Nb Senior': 0})
+        self.assertEqual(len(self.get('/experience?start=2015-02-01&end=2015-12-31')), 11)
+        self.assertEqual(self.get('/categories?date=2014-01-01'),
+                         {'date': '2014-01-01', 'junior': 0, 'advanced': 0, 'senior': 0})
+        developers = self.get('/developers?email=JANE')
+        self.assertEqual([x['Name'] for x in developers], ['Jane'])
+        self.assertEqual(self.get('/developers?uuid=' + developers[0]['UUID']), developers)
+        for query, code in (('/unknown', 404), ('/experience?date=2015-13-01', 400)):
+            with self.assertRaises(urllib.error.HTTPError) as context:
+                self.get(query)
+            self.assertEqual(context.exception.code, code)
+
+    def test_internal_error(self):
+        # Any failure of a query is answered, not only the invalid parameters
+        self.service.refresh = lambda force=False: None
+        with self.assertRaises(urllib.error.HTTPError) as context:
+            self.get('/status')
+        self.assertEqual(context.exception.code, 500)
+        self.assertIn('AttributeError',
+                      json.loads(context.exception.read().decode('utf-8'))['error'])
+
+    def test_refresh(self):
+        head = self.get('/status')['head']
+        self.commit_idx(2, '2016-01-01T10:00:00+0000')
+        status = self.get('/status')
+        self.assertNotEqual(status['head'], head)
+        self.assertEqual(self.get('/developers?name=joe')[0]['Last Commit'], '2016-01-01')
+
+
+if __name__ == '__main__':
+    unittest.main()
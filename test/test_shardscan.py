@@ -0,0 +1,67 @@
+import unittest
+import os
+import shutil
+import tempfile
+
+import sys
+from os import path
+sys.path.append(path.join(path.dirname(path.dirname(path.abspath(__file__))), 'devxp'))
+sys.path.append(path.dirname(path.abspath(__file__)))
+import gitrepo
+import shardscan
+import vcsmanager
+
+
+class TestShardedScan(gitrepo.GitRepoTestCase):
+
+    AUTHORS = [('Joe', 'joe@happy.com'), ('Jane', 'jane@happy.com'), ('Joe', 'joe@sad.com')]
+
+    def setUp(self):
+        super().setUp()
+        self.cache_dir = tempfile.mkdtemp()
+        for idx in range(10):
+            self.commit_idx(idx)
+
+    def tearDown(self):
+        super().tearDown()
+        shutil.rmtree(self.cache_dir)
+
+    def commit_idx(self, idx):
+        name, email = self.AUTHORS[idx % len(self.AUTHORS)]
+        self.commit(name, email, '2015-{0:02d}-01T10:00:00+0000'.format(idx + 1))
+
+    def get_table(self, shard_size=None):
+        vcs_mgr = vcsmanager.VCSManager(self.repo)
+        if shard_size is not None:
+            vcs_mgr.set_sharding(shard_size, 2, self.cache_dir)
+        vcs_mgr.build_author_dict()
+        return vcs_mgr.get_author_table()
+
+    def test_sharded_scan(self):
+        expected = self.get_table()
+        self.assertEqual(self.get_table(3), expected)
+        self.assertEqual(len(os.listdir(self.cache_dir)), 4)
+        # Only the last shard changes when HEAD moves
+        cached = set(os.listdir(self.cache_dir))
+        self.commit_idx(10)
+        self.assertEqual(self.get_table(3), self.get_table())
+        self.assertEqual(len(cached.intersection(os.listdir(self.cache_dir))), 3)
+
+    def test_merge(self):
+        tables = [{'a': ['A', 'a@1', '2015-02-01', '2015-03-01', ['a@1']]},
+                  {'a': ['A', 'a@2', '2015-01-01', '2015-03-01', ['a@2']],
+                   'b': ['B', 'b@1', '2015-01-01', '2015-01-01', ['b@1']]},
+                  {'a': ['A', 'a@3', '2015-01-15', '2015-02-01', ['a@3']]}]
+        left = shardscan.ShardedScan.merge(shardscan.ShardedScan.merge({}, tables[0]),
+                                           shardscan.ShardedScan.merge({}, tables[1]))
+        left = shardscan.ShardedScan.merge(left, tables[2])
+        right = shardscan.ShardedScan.merge(shardscan.ShardedScan.merge({}, tables[1]),
+                                            tables[2])
+        right = shardscan.ShardedScan.merge(shardscan.ShardedScan.merge({}, tables[0]), right)
+        self.assertEqual(left, right)
+        self.assertEqual(left['a'], ['A', 'a@2', '2015-01-01', '2015-03-01',
+                                     ['a@1', 'a@2', 'a@3']])
+
+
+if __name__ == '__main__':
+    unittest.main()
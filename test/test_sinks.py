@@ -0,0 +1,106 @@
+import unittest
+import csv
+import datetime
+import os
+import random
+import shutil
+import tempfile
+
+import sys
+from os import path
+sys.path.append(path.join(path.dirname(path.dirname(path.abspath(__file__))), 'devxp'))
+import developer
+import experience
+import periods
+import sinks
+import xpanalyser
+
+
+class TestSinks(unittest.TestCase):
+
+    NB_DEVELOPERS = 30
+
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir)
+
+    def build_analyser(self):
+        rand = random.Random(7)
+        analyser = xpanalyser.XPAnalyser(self.work_dir, self.work_dir)
+        for idx in range(self.NB_DEVELOPERS):
+            dev = developer.Developer('Dev{0}'.format(idx), 'dev{0}@happy.com'.format(idx))
+            dev.first_commit_date = datetime.date(2016, 1, 1) + \
+                datetime.timedelta(rand.randint(0, 2000))
+            dev.last_commit_date = dev.first_commit_date + datetime.timedelta(rand.randint(0, 900))
+            dev.has_left = rand.random() < 0.5
+            dev.exclude = rand.random() < 0.1
+            analyser.vcs_mgr.author_dict[dev.uuid] = dev
+        analyser.vcs_mgr.first_commit_repo = min(x.first_commit_date
+                                                 for x in analyser.vcs_mgr.author_dict.values())
+        return analyser
+
+    def get_baseline_rows(self, analyser, dates):
+        # Month by developer loop of the original analysis
+        rows = [experience.Experience.get_field_names()]
+        for curr_date in dates:
+            curr_xp = experience.Experience(curr_date)
+            for dev in analyser.vcs_mgr.author_dict.values():
+                if not dev.exclude:
+                    curr_xp.process_dev(dev)
+            rows.append([str(x) for x in curr_xp.get_dict_values().values()])
+        return rows
+
+    def read_rows(self, csv_path):
+        with open(csv_path, mode='r', newline='') as csv_file:
+            return list(csv.reader(csv_file, delimiter=';'))
+
+    def test_same_as_baseline(self):
+        analyser = self.build_analyser()
+        granularities = periods.Granularity.parse_list('monthly,weekly,quarterly,10d')
+        analyser.compute_experience(granularities)
+        start_date = analyser.vcs_mgr.first_commit_repo + datetime.timedelta(1)
+        # The original analysis starts the day after the first commit, then each month
+        monthly_dates = [start_date]
+        while True:
+            next_date = datetime.date(monthly_dates[-1].year + monthly_dates[-1].month // 12,
+                                      monthly_dates[-1].month % 12 + 1, 1)
+            if next_date > datetime.date.today():
+                break
+            monthly_dates.append(next_date)
+        self.assertEqual(self.read_rows(analyser.get_csv_path('monthly')),
+                         self.get_baseline_rows(analyser, monthly_dates))
+        for granularity in granularities:
+            csv_path = analyser.get_csv_path(granularity.name)
+            dates = list(granularity.iter_dates(start_date, datetime.date.today()))
+            self.assertEqual(self.read_rows(csv_path), self.get_baseline_rows(analyser, dates))
+            # The analysis is computed again when no series has been kept
+            os.remove(csv_path)
+            analyser.save_analyse(granularity.name)
+            self.assertEqual(self.read_rows(csv_path), self.get_baseline_rows(analyser, dates))
+
+    def test_flush(self):
+        csv_path = path.join(self.work_dir, 'experience.csv')
+        csv_sink = sinks.CSVSink(csv_path)
+        series_sink = sinks.SeriesSink()
+        first = datetime.date(2016, 1, 1).toordinal()
+        try:
+            for idx in range(sinks.CSVSink.FLUSH_STEP + 1):
+                values = (first + idx, idx, 2 * idx, 1, 0, 0)
+                csv_sink.write(values)
+                series_sink.write(values)
+            # The periods are readable before the end of the analysis
+            rows = self.read_rows(csv_path)
+            self.assertEqual(len(rows), sinks.CSVSink.FLUSH_STEP + 1)
+            self.assertEqual(rows[1], ['2016-01-01', '0', '0', '1', '0', '0'])
+        finally:
+            csv_sink.close()
+            series_sink.close()
+        self.assertEqual(len(self.read_rows(csv_path)), sinks.CSVSink.FLUSH_STEP + 2)
+        self.assertEqual(csv_sink.nb_periods, sinks.CSVSink.FLUSH_STEP + 1)
+        self.assertEqual(len(list(series_sink.series.iter_values())), sinks.CSVSink.FLUSH_STEP + 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+import os
+
+import sys
+from os import path
+sys.path.append(path.join(path.dirname(path.dirname(path.abspath(__file__))), 'devxp'))
+sys.path.append(path.dirname(path.abspath(__file__)))
+import gitrepo
+import subtreescan
+
+
+class TestSubtreeScan(gitrepo.GitRepoTestCase):
+
+    CHANGES = [('Joe', '2015-01-01', ['src/core/a.py', 'src/core/b.py']),
+               ('Jane', '2015-02-01', ['src/ui/c.py']),
+               ('Joe', '2015-03-01', ['doc/index.md', 'src/ui/d.py']),
+               ('Jack', '2015-04-01', ['README.md'])]
+
+    def setUp(self):
+        super().setUp()
+        for name, date, files in self.CHANGES:
+            for file_path in files:
+                os.makedirs(path.join(self.repo, path.dirname(file_path)), exist_ok=True)
+                with open(path.join(self.repo, file_path), mode='a') as changed_file:
+                    changed_file.write(date)
+            self.git('add', '-A')
+            self.commit(name, name + '@happy.com', date + 'T10:00:00+0000')
+
+    def test_load(self):
+        owners_path = path.join(self.repo, 'CODEOWNERS')
+        with open(owners_path, mode='w') as owners_file:
+            owners_file.write('# Owners\n* @all\n/src/core/ @core\nsrc/ui/** @ui # UI\n'
+                              '*.md @doc\nREADME.md @doc\n')
+        self.assertEqual(subtreescan.SubtreeScan.load(owners_path),
+                         ['', 'src/core', 'src/ui', 'README.md'])
+
+    def test_build(self):
+        scan = subtreescan.SubtreeScan(self.repo, ['.', 'src', 'src/ui/', 'README.md', 'lib'])
+        self.assertEqual(scan.get_subtrees('src/ui/c.py'), (0, 1, 2))
+        self.assertEqual(scan.get_subtrees('README.md'), (0, 3))
+        scan.build()
+        expected = [{'Joe': ('2015-01-01', '2015-03-01'), 'Jane': ('2015-02-01', '2015-02-01'),
+                     'Jack': ('2015-04-01', '2015-04-01')},
+                    {'Joe': ('2015-01-01', '2015-03-01'), 'Jane': ('2015-02-01', '2015-02-01')},
+                    {'Joe': ('2015-03-01', '2015-03-01'), 'Jane': ('2015-02-01', '2015-02-01')},
+                    {'Jack': ('2015-04-01', '2015-04-01')}, {}]
+        for index, developers in enumerate(expected):
+            self.assertEqual({x.name: (x.first_commit_date.isoformat(),
+                                       x.last_commit_date.isoformat())
+                              for x in scan.get_developers(index)}, developers)
+        self.assertEqual(scan.get_start_date().isoformat(), '2015-01-02')
+        self.assertEqual([scan.get_dirname(x) for x in range(3)],
+                         ['.', 'src', path.join('src', 'ui')])
+
+
+if __name__ == '__main__':
+    unittest.main()
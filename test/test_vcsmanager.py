@@ -0,0 +1,65 @@
+import unittest
+
+import sys
+from os import path
+sys.path.append(path.join(path.dirname(path.dirname(path.abspath(__file__))), 'devxp'))
+sys.path.append(path.dirname(path.abspath(__file__)))
+import gitrepo
+import vcsmanager
+
+
+class TestIncremental(gitrepo.GitRepoTestCase):
+
+    AUTHORS = [('Joe', 'joe@happy.com'), ('Jane', 'jane@happy.com'), ('Joe', 'joe@sad.com')]
+
+    def setUp(self):
+        super().setUp()
+        self.state_path = path.join(self.repo, '.git', 'devxp_state.json')
+        self.commit_months(1, 6)
+
+    def commit_months(self, first, last, authors=None):
+        authors = authors or self.AUTHORS
+        for month in range(first, last + 1):
+            self.commit(*authors[month % len(authors)],
+                        '2015-{0:02d}-01T10:00:00+0000'.format(month))
+
+    def scan(self, incremental):
+        # Author table, commit days and ranges of commits read by a scan of the history
+        vcs_mgr = vcsmanager.VCSManager(self.repo)
+        vcs_mgr.keep_commit_days()
+        rev_ranges = []
+        retrieve_author = vcs_mgr.retrieve_author
+        vcs_mgr.retrieve_author = lambda rev_range='', **kwargs: \
+            rev_ranges.append(rev_range) or retrieve_author(rev_range, **kwargs)
+        vcs_mgr.build_author_dict(True, self.state_path if incremental else None)
+        vcs_mgr.save_state(self.state_path)
+        return vcs_mgr.get_author_table(), vcs_mgr.commit_days, rev_ranges
+
+    def test_incremental(self):
+        self.scan(True)
+        last_head = self.git('rev-parse', 'HEAD')
+        self.commit_months(7, 10)
+        table, commit_days, rev_ranges = self.scan(True)
+        self.assertEqual(rev_ranges, ['{0}..{1}'.format(last_head, self.git('rev-parse', 'HEAD'))])
+        expected_table, expected_days, _ = self.scan(False)
+        self.assertEqual(table, expected_table)
+        self.assertEqual(commit_days, expected_days)
+        # Nothing is read while HEAD does not move
+        self.assertEqual(self.scan(True), (expected_table, expected_days, []))
+
+    def test_rewritten_history(self):
+        self.scan(True)
+        # The last commits of Joe and Jane are replaced by the ones of Jack
+        self.git('reset', '-q', '--hard', 'HEAD~3')
+        self.commit_months(4, 5, [('Jack', 'jack@sad.com')])
+        table, commit_days, rev_ranges = self.scan(True)
+        self.assertEqual(rev_ranges, [''])
+        expected_table, expected_days, _ = self.scan(False)
+        self.assertEqual(table, expected_table)
+        self.assertEqual(commit_days, expected_days)
+        self.assertEqual(sorted(x[0] for x in table.values()), ['Jack', 'Jane', 'Joe'])
+        self.assertEqual(max(x[3] for x in table.values() if x[0] != 'Jack'), '2015-03-01')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+
+import unittest
+import datetime
+import random
+
+import sys
+from os import path
+sys.path.append(path.join(path.dirname(path.dirname(path.abspath(__file__))), 'devxp'))
+import developer
+import experience
+import periods
+import tiers
+import xpengine
+import xpindex
+
+
+class TestXPEngine(unittest.TestCase):
+
+    NB_DEVELOPERS = 60
+
+    def build_developers(self):
+        rand = random.Random(42)
+        developers = []
+        for idx in range(self.NB_DEVELOPERS):
+            dev = developer.Developer('Dev{0}'.format(idx), 'dev{0}@happy.com'.format(idx))
+            first = datetime.date(2010, 1, 1) + datetime.timedelta(rand.randint(0, 3000))
+            dev.first_commit_date = first
+            dev.last_commit_date = first + datetime.timedelta(rand.randint(-30, 2000))
+            dev.has_left = rand.random() < 0.5
+            dev.exclude = rand.random() < 0.1
+            developers.append(dev)
+        return developers
+
+    def test_same_as_month_by_developer_loop(self):
+        developers = self.build_developers()
+        dates = [datetime.date(2009, 12, 1) + datetime.timedelta(x) for x in range(0, 6000, 3)]
+        engine = xpengine.XPEngine(developers)
+        for curr_date, curr_xp in zip(dates, engine.compute(dates)):
+            expected = experience.Experience(curr_date)
+            for dev in developers:
+                if not dev.exclude:
+                    expected.process_dev(dev)
+            self.assertEqual(curr_xp.get_dict_values(), expected.get_dict_values())
+
+    def test_tiers(self):
+        tier_model = tiers.TierModel([('Newcomer', 0), ('Junior', 90), ('Advanced', 365),
+                                      ('Senior', 730), ('Staff', 1095), ('Veteran', 2190)])
+        self.assertEqual([tier_model.classify(x) for x in (1, 89, 90, 2189, 5000)],
+                         [0, 0, 1, 4, 5])
+        developers = self.build_developers()
+        dates = [datetime.date(2009, 12, 1) + datetime.timedelta(x) for x in range(0, 6000, 5)]
+        engine = xpengine.XPEngine(developers, tier_model)
+        index = xpindex.XPIndex(engine)
+        for curr_date, curr_xp in zip(dates, engine.compute(dates)):
+            expected = experience.Experience(curr_date, tier_model)
+            for dev in developers:
+                if not dev.exclude:
+                    expected.process_dev(dev)
+            self.assertEqual(curr_xp.get_dict_values(), expected.get_dict_values())
+            self.assertEqual(index.experience_at(curr_date).get_values(), expected.get_values())
+        self.assertEqual(list(engine.compute_series(dates).iter_dict_values())[-1],
+                         expected.get_dict_values())
+        for definitions in ([], [('Junior', 1)], [('Junior', 0), ('Senior', 0)],
+                            [('Junior', 0), ('junior', 10)]):
+            with self.assertRaises(ValueError):
+                tiers.TierModel(definitions)
+
+    def test_series(self):
+        developers = self.build_developers()
+        dates = list(periods.Granularity('daily').iter_dates(datetime.date(2010, 1, 1),
+                                                             datetime.date(2020, 1, 1)))
+        engine = xpengine.XPEngine(developers)
+        series = engine.compute_series(dates)
+        self.assertEqual(len(series), len(dates))
+        expected = [x.get_dict_values() for x in engine.compute(dates)]
+        self.assertEqual(list(series.iter_dict_values()), expected)
+        self.assertEqual(series[100].get_dict_values(), expected[100])
+        self.assertEqual([x.get_dict_values() for x in series[10:20]], expected[10:20])
+        self.assertEqual(series.get_buffer('date').tolist()[:2], [dates[0].toordinal(), dates[1].toordinal()])
+        monthly = periods.Granularity('monthly')
+        monthly_dates = list(monthly.iter_dates(dates[0], dates[-1]))
+        self.assertEqual(list(series.resample(monthly).iter_dict_values()),
+                         [x.get_dict_values() for x in engine.compute(monthly_dates)])
+
+    def test_index(self):
+        developers = self.build_developers()
+        engine = xpengine.XPEngine(developers)
+        index = xpindex.XPIndex(engine)
+        dates = [datetime.date(2009, 12, 1) + datetime.timedelta(x) for x in range(0, 6000, 7)]
+        for curr_date, values in zip(dates, engine.iter_values(dates)):
+            self.assertEqual(index.values_at(curr_date.toordinal()), values)
+            self.assertEqual(index.experience_at(curr_date).get_values(),
+                             next(engine.compute([curr_date])).get_values())
+        monthly = periods.Granularity('monthly')
+        start, end = datetime.date(2012, 3, 15), datetime.date(2016, 1, 1)
+        self.assertEqual(list(index.experience_between(start, end, monthly).iter_values()),
+                         list(engine.iter_values(monthly.iter_dates(start, end))))
+
+    def test_no_developer(self):
+        dates = [datetime.date(2020, 1, 1)]
+        curr_xp = list(xpengine.XPEngine([]).compute(dates))[0]
+        self.assertEqual(curr_xp.get_dict_values(), experience.Experience(dates[0]).get_dict_values())
+
+
+if __name__ == '__main__':
+    unittest.main()